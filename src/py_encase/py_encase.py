@@ -4,35 +4,22 @@
 import sys
 import _io
 import os
-import datetime
 import pathlib
 import argparse
 import shutil
-import platform
-import asyncio
-import threading
 import subprocess
-import inspect
-import filecmp
-import textwrap
 import re
 import typing
 import io
 import itertools
-import getpass
-import socket
 import collections
-import urllib.parse
 import json
-if sys.version_info >= (3, 11):
-    import tomllib
-import configparser
-import glob
-import ast
-import importlib.metadata
-import importlib.util
 import keyword
-import pkgutil
+import time
+
+# Heavier modules (asyncio, threading, ast, tomllib, configparser, getpass,
+# socket, urllib.parse, importlib.metadata, ...) are imported where they are
+# used, so that the launcher path and simple subcommands start quickly.
 
 __version__ = '0.0.35'
 
@@ -40,7 +27,7 @@ class PyEncase(object):
 
     VERSION          = __version__
     PIP_MODULE_NAME  = 'py-encase'
-    ENTITY_FILE      = pathlib.Path(inspect.getsourcefile(inspect.currentframe()))
+    ENTITY_FILE      = pathlib.Path(sys._getframe().f_code.co_filename)
     ENTITY_PATH      = ENTITY_FILE.resolve()
     ENTITY_FILE_NAME = ENTITY_PATH.name
     #    ENTITY_FILE_NAME = pathlib.Path(__file__).resolve().name
@@ -76,6 +63,211 @@ class PyEncase(object):
     
     SHEBANG_DEFAULT = '#!/usr/bin/env python3'
 
+    PROBE_CACHE_FILE        = 'python_probe.json'
+    PROBE_CACHE_MAX_ENTRIES = 16
+
+    LAUNCHER_MODES        = ('symlink', 'stub')
+    LAUNCHER_MODE_DEFAULT = 'symlink'
+    LAUNCHER_STUB_MARKER  = '# ____PY_ENCASE_LAUNCHER_STUB____'
+    SCRIPT_PYTHON_SUFFIX  = '.python' # lib/python/<script>.python : interpreter of the script
+
+    STDLIB_INDEX_CACHE_FILE   = 'stdlib_index.json'
+    STDLIB_INDEX_PROBE_SCRIPT = ('import sys, json\n'
+                                 'names = set(sys.builtin_module_names)\n'
+                                 'if hasattr(sys, "stdlib_module_names"):\n'
+                                 '    names.update(sys.stdlib_module_names)\n'
+                                 'else:\n'
+                                 '    import os, pkgutil, sysconfig\n'
+                                 '    paths = set([ sysconfig.get_paths()[k] for k in ("stdlib", "platstdlib") ])\n'
+                                 '    paths.update([ os.path.join(p, "lib-dynload") for p in list(paths) ])\n'
+                                 '    names.update([ m[1] for m in pkgutil.iter_modules(sorted(paths)) ])\n'
+                                 'json.dump(sorted(names), sys.stdout)\n')
+
+    SHARED_STORE_SUBDIR     = 'store'
+    SHARED_STORE_TMP_PREFIX = '.tmp-'
+    SHARED_STORE_REFS_DIR   = '.refs' # <store>/.refs/<entry>/<digest of site-packages>
+    SHARED_STORE_TMP_EXPIRE = 3600 # sec.: leftover of interrupted store population
+
+    FLEET_MAX_WORKERS       = 8
+
+    SITE_GENERATION_SEP     = '@'
+    SITE_GENERATION_KEEP    = 3
+
+    PIP_WORKER_SUBCMDS       = ('install', 'download', 'wheel', 'list', 'inspect', 'freeze')
+    PIP_WORKER_IDLE_TIMEOUT  = 300 # sec.
+    PIP_WORKER_START_TIMEOUT = 30  # sec.
+    # Fork server: pip is imported once, then each request runs 'pip main' in a forked child
+    # with stdin/stdout/stderr, cwd and environment of the client (fds are passed by SCM_RIGHTS)
+    PIP_WORKER_SCRIPT = ('import sys, os, json, time, socket, select, signal, importlib, traceback\n'
+                         'sock_path, idle_timeout, pip_version = sys.argv[1], float(sys.argv[2]), sys.argv[3]\n'
+                         'def ready(msg):\n'
+                         '    sys.stdout.write(msg+"\\n")\n'
+                         '    sys.stdout.flush()\n'
+                         '    fd = os.open(os.devnull, os.O_RDWR)\n'
+                         '    for i in (0, 1, 2):\n'
+                         '        os.dup2(fd, i)\n'
+                         'try:\n'
+                         '    import pip\n'
+                         '    from pip._internal.cli.main import main as pip_main\n'
+                         '    for cmd in ("install", "download", "wheel", "list", "inspect", "freeze"):\n'
+                         '        try:\n'
+                         '            importlib.import_module("pip._internal.commands."+cmd)\n'
+                         '        except ImportError:\n'
+                         '            pass\n'
+                         'except Exception as exc:\n'
+                         '    ready("error %s" % (exc, ))\n'
+                         '    sys.exit(1)\n'
+                         'if pip.__version__ != pip_version:\n'
+                         '    ready("error pip version mismatch: %s != %s" % (pip.__version__, pip_version))\n'
+                         '    sys.exit(1)\n'
+                         'srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)\n'
+                         'try:\n'
+                         '    srv.bind(sock_path)\n'
+                         'except OSError:\n'
+                         '    try:\n'
+                         '        socket.socket(socket.AF_UNIX, socket.SOCK_STREAM).connect(sock_path)\n'
+                         '        ready("ready %d" % (os.getpid(), ))\n'
+                         '        sys.exit(0)\n'
+                         '    except OSError:\n'
+                         '        os.unlink(sock_path)\n'
+                         '        srv.bind(sock_path)\n'
+                         'os.chmod(sock_path, 0o600)\n'
+                         'srv.listen(16)\n'
+                         'signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))\n'
+                         'ready("ready %d" % (os.getpid(), ))\n'
+                         'children = set()\n'
+                         'n_served = 0\n'
+                         't_start  = t_last = time.time()\n'
+                         'def recv_request(conn):\n'
+                         '    data, fds, flags, addr = socket.recv_fds(conn, 65536, 3)\n'
+                         '    while len(data)<8 or len(data)<8+int.from_bytes(data[:8], "big"):\n'
+                         '        chunk = conn.recv(65536)\n'
+                         '        if not chunk:\n'
+                         '            raise EOFError("Incomplete request")\n'
+                         '        data += chunk\n'
+                         '    return json.loads(data[8:].decode("utf-8")), fds\n'
+                         'def reply(conn, obj):\n'
+                         '    conn.sendall(json.dumps(obj).encode("utf-8")+b"\\n")\n'
+                         'def serve(conn, req, fds):\n'
+                         '    rc = 1\n'
+                         '    try:\n'
+                         '        srv.close()\n'
+                         '        signal.signal(signal.SIGTERM, signal.SIG_DFL)\n'
+                         '        for i, fd in enumerate(fds):\n'
+                         '            os.dup2(fd, i)\n'
+                         '            os.close(fd)\n'
+                         '        os.chdir(req["cwd"])\n'
+                         '        os.environ.clear()\n'
+                         '        os.environ.update(req["env"])\n'
+                         '        sys.argv = ["pip"]+req["args"]\n'
+                         '        rc = pip_main(req["args"])\n'
+                         '    except SystemExit as exc:\n'
+                         '        rc = exc.code if isinstance(exc.code, int) else ( 0 if exc.code is None else 1 )\n'
+                         '    except BaseException:\n'
+                         '        traceback.print_exc()\n'
+                         '    try:\n'
+                         '        sys.stdout.flush()\n'
+                         '        sys.stderr.flush()\n'
+                         '        reply(conn, {"returncode": rc})\n'
+                         '    finally:\n'
+                         '        os._exit(rc & 0xff if isinstance(rc, int) else 1)\n'
+                         'try:\n'
+                         '    while True:\n'
+                         '        readable, w, x = select.select([srv], [], [], 1.0)\n'
+                         '        while children:\n'
+                         '            pid, status = os.waitpid(-1, os.WNOHANG)\n'
+                         '            if pid == 0:\n'
+                         '                break\n'
+                         '            children.discard(pid)\n'
+                         '            t_last = time.time()\n'
+                         '        if not readable:\n'
+                         '            if ( not children ) and time.time()-t_last > idle_timeout:\n'
+                         '                break\n'
+                         '            continue\n'
+                         '        conn, addr = srv.accept()\n'
+                         '        t_last = time.time()\n'
+                         '        try:\n'
+                         '            req, fds = recv_request(conn)\n'
+                         '        except (OSError, EOFError, ValueError):\n'
+                         '            conn.close()\n'
+                         '            continue\n'
+                         '        if req.get("op") == "pip" and len(fds) == 3:\n'
+                         '            pid = os.fork()\n'
+                         '            if pid == 0:\n'
+                         '                serve(conn, req, fds)\n'
+                         '            children.add(pid)\n'
+                         '            n_served += 1\n'
+                         '        elif req.get("op") in ("ping", "stop"):\n'
+                         '            reply(conn, {"pid": os.getpid(), "python": sys.executable, "pip_version": pip.__version__,\n'
+                         '                         "served": n_served, "running": len(children), "uptime": time.time()-t_start,\n'
+                         '                         "idle": time.time()-t_last, "idle_timeout": idle_timeout})\n'
+                         '        for fd in fds:\n'
+                         '            os.close(fd)\n'
+                         '        conn.close()\n'
+                         '        if req.get("op") == "stop":\n'
+                         '            break\n'
+                         'finally:\n'
+                         '    try:\n'
+                         '        os.unlink(sock_path)\n'
+                         '    except OSError:\n'
+                         '        pass\n')
+
+    LOCK_FILE_NAME          = 'py-encase-lock.json'
+    LOCK_FORMAT_VERSION     = 1
+    WHEEL_INSTALLER_NAME    = 'py-encase'
+    INSTALLERS              = ('pip', 'native')
+    INSTALLER_DEFAULT       = 'pip'
+    WHEEL_TAGS_CACHE_FILE   = 'wheel_tags.json'
+    WHEEL_TAGS_PROBE_SCRIPT = ('import sys, json\n'
+                               'try:\n'
+                               '    from pip._vendor.packaging import tags\n'
+                               'except ImportError:\n'
+                               '    from packaging import tags\n'
+                               'json.dump([ str(t) for t in tags.sys_tags() ], sys.stdout)\n')
+    CONSOLE_SCRIPT_TEMPLATE = ('#!%(python)s\n'
+                               '# -*- coding: utf-8 -*-\n'
+                               'import re\n'
+                               'import sys\n'
+                               'from %(module)s import %(import_name)s\n'
+                               'if __name__ == "__main__":\n'
+                               '    sys.argv[0] = re.sub(r"(-script\\.pyw|\\.exe)?$", "", sys.argv[0])\n'
+                               '    sys.exit(%(func)s())\n')
+
+    DIST_INDEX_CACHE_FILE  = 'dist_index.json'
+    PIP_REINSTALL_OPTIONS  = ('-U', '--upgrade', '-I', '--ignore-installed', '--force-reinstall')
+    REQUIREMENT_PATTERN    = (r'\s*(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[[^\]]*\])?'
+                              r'\s*(?P<specs>\(?[^;@()]*\)?)\s*(?:;\s*(?P<marker>.*))?$')
+    VERSION_PATTERN        = (r'v?(?:(?P<epoch>[0-9]+)!)?(?P<release>[0-9]+(?:\.[0-9]+)*)'
+                              r'(?:[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>[0-9]+)?)?'
+                              r'(?:-(?P<post_n2>[0-9]+)|[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n1>[0-9]+)?)?'
+                              r'(?:[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?'
+                              r'(?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?$')
+
+    IMPORT_SCAN_CACHE_FILE = 'import_scan.json'
+    IMPORT_SCAN_POOL_MIN   = 8
+
+    IMPORT_SCANNERS         = ('ast', 'tokenize')
+    IMPORT_SCANNER_DEFAULT  = 'ast'
+    IMPORT_FLAGS            = ('conditional', 'optional', 'type_only')
+    IMPORT_GUARD_EXCEPTIONS = ('ImportError', 'ModuleNotFoundError', 'Exception', 'BaseException')
+
+    # Patterns for 'tokenize' import scanner (compiled at use)
+    IMPORT_SCAN_CANDIDATE_PATTERN = r'(?:^|[:;])[ \t]*(?:import|from)\b'
+    IMPORT_SCAN_TOKEN_PATTERN     = (r'(?P<str>\'\'\'[^\'\\]*(?:(?:\\.|\'(?!\'\'))[^\'\\]*)*\'\'\''
+                                     r'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""'
+                                     r'|\'[^\'\\\n]*(?:\\.[^\'\\\n]*)*\''
+                                     r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*")'
+                                     r'|(?P<com>#[^\n]*)|(?P<cont>\\\n)|(?P<nl>\n)'
+                                     r'|(?P<open>[(\[{])|(?P<close>[)\]}])'
+                                     r'|(?P<walrus>:=)|(?P<colon>:)|(?P<semi>;)')
+    IMPORT_SCAN_LINE_PATTERN      = r'([ \t\f]*)(?:(async[ \t]+)?([A-Za-z_]\w*))?'
+    IMPORT_SCAN_STMT_PATTERN      = r'[ \t]*(import|from)\b'
+    IMPORT_SCAN_BODY_PATTERN      = r'[ \t]*(?:#[^\n]*|\\\n)?(?:\n|\Z)'
+    IMPORT_SCAN_TYPECHK_PATTERN   = r'\s*(?:[A-Za-z_]\w*\s*\.\s*)*TYPE_CHECKING\s*$'
+
+    COMPILE_INVALIDATION_MODES        = ('timestamp', 'checked-hash', 'unchecked-hash')
+    COMPILE_INVALIDATION_MODE_DEFAULT = 'timestamp'
+
     GIT_REMOTE_DEFAULT = { 'LOCATION'      : os.path.join('~', 'git_repositories'),
                            'REMOTE_GITCMD' : 'git',
                            'SSH_COMMAND'   : 'ssh',
@@ -184,6 +376,8 @@ class PyEncase(object):
                  prefix_cmd:str=None, git_cmd:str=None, 
                  verbose:bool=False, dry_run:bool=False, encoding='utf-8'):
 
+        self.__class__.Tracer.start_tracing(os.environ.get('PY_ENCASE_TRACE'))
+
         self.streams = self.__class__.StreamExtd(stdin=sys.stdin,
                                                  stdout=sys.stdout,
                                                  stderr=sys.stderr)
@@ -197,6 +391,15 @@ class PyEncase(object):
         self.set_git_path(git_cmd=git_cmd)
         self.verbose      = verbose
         self.dry_run      = dry_run
+        self.pip_offline  = bool(os.environ.get('PY_ENCASE_OFFLINE'))
+        self.shared_store = bool(os.environ.get('PY_ENCASE_SHARED_STORE'))
+        self.pip_worker   = bool(os.environ.get('PY_ENCASE_PIP_WORKER'))
+        self.site_generation_active = False
+        try:
+            self.__class__.StreamExtd.configure(level=(os.environ.get('PY_ENCASE_LOG_LEVEL') or None),
+                                                prefix_mode=(os.environ.get('PY_ENCASE_LOG_PREFIX') or None))
+        except ValueError as exc:
+            self.stderr.write("Warning: %s (ignored)" % (exc, ))
 
         self.__class__.SCRIPT_STD_LIB['pkg_cache'] = {'creator'     : self.python_pkg_cache_template_save,
                                                       'description' : 'Module for cache file under package directory',
@@ -237,19 +440,10 @@ class PyEncase(object):
                                                                         os.environ.get('PYTHON3',
                                                                                        shutil.which('python3') or shutil.which('python')))))
 
-        self.pip_use = pathlib.Path(shutil.which(pip_cmd) if isinstance(pip_cmd,str) and pip_cmd 
+        self.pip_use = pathlib.Path(shutil.which(pip_cmd) if isinstance(pip_cmd,str) and pip_cmd
                                     else shutil.which(os.environ.get('PIP',
                                                                      os.environ.get('PIP3',
                                                                                     shutil.which('pip3') or shutil.which('pip')))))
-        
-        if sys.executable == self.python_use.absolute():
-            self.python_vertion_str = '.'.join(sys.version_info[:2])
-        else:
-            py_version_fetch = subprocess.run([str(self.python_use), '--version'], encoding=self.encoding, stdout=subprocess.PIPE)
-            self.python_vertion_str = py_version_fetch.stdout.split()[1]
-
-        pip_version_fetch = subprocess.run([str(self.pip_use), '--version'], encoding=self.encoding, stdout=subprocess.PIPE)
-        self.pip_vertion_str = pip_version_fetch.stdout.split()[1]
 
         if isinstance(prefix_cmd,str) and prefix_cmd:
             self.prefix = os.path.expandvars(os.path.expanduser(prefix_cmd))
@@ -266,7 +460,32 @@ class PyEncase(object):
         self.srcdir  = os.path.join(self.prefix, 'src')   if flg_substructure else self.prefix
         self.datadir = os.path.join(self.prefix, 'share') if flg_substructure else self.prefix
 
-        self.tmpdir            = os.path.join(self.vardir, 'tmp', 'python', 'packages', self.python_vertion_str)
+        self.probe_cache_path = os.path.join(self.vardir, 'cache', self.__class__.PIP_MODULE_NAME,
+                                             self.__class__.PROBE_CACHE_FILE)
+        probe_key = self.__class__.probe_cache_key(self.python_use, self.pip_use)
+        probed    = self.__class__.probe_cache_lookup(self.probe_cache_path, probe_key)
+        self.probe_cache_hit = probed is not None
+
+        if probed is None:
+            with self.__class__.Tracer.span('python/pip probe', python=str(self.python_use), pip=str(self.pip_use)):
+                py_version_fetch = subprocess.run([str(self.python_use), '--version'], encoding=self.encoding, stdout=subprocess.PIPE)
+                pip_version_fetch = subprocess.run([str(self.pip_use), '--version'], encoding=self.encoding, stdout=subprocess.PIPE)
+            probed = {'python_version': py_version_fetch.stdout.split()[1],
+                      'pip_version':    pip_version_fetch.stdout.split()[1]}
+            self.__class__.probe_cache_store(self.probe_cache_path, probe_key, probed)
+
+        self.python_vertion_str = probed['python_version']
+        self.pip_vertion_str    = probed['pip_version']
+
+        # Classification index of module names: built on demand by stdlib_module_index()
+        self.stdlib_index     = None
+        self.stdlib_spec_memo = {}
+        # Index of distributions in site-packages: built on demand by dist_index()
+        self.dist_index_memo  = None
+        # Wheel tags of target python: built on demand by supported_wheel_tags()
+        self.wheel_tags_memo  = None
+
+        self.tmpdir           = os.path.join(self.vardir, 'tmp', 'python', 'packages', self.python_vertion_str)
         self.logdir            = os.path.join(self.vardir, 'log')
 
         self.python_path         = os.path.join(self.libdir, 'python')
@@ -275,6 +494,8 @@ class PyEncase(object):
         self.python_pip_src      = os.path.join(self.srcdir, 'python', 'packages', self.python_vertion_str)
         self.python_pip_logdir   = os.path.join(self.logdir, 'pip', self.pip_vertion_str)
         self.python_pip_log_path = os.path.join(self.python_pip_logdir, 'pip-log.txt')
+        # Local wheelhouse for offline installation (populated by 'wheelhouse' subcommand)
+        self.python_pip_wheelhouse = os.path.join(self.vardir, 'wheelhouse', 'python', self.python_vertion_str)
         self.git_keepdirs = [os.path.dirname(self.python_pip_path),
                              os.path.dirname(self.python_pip_cache),
                              os.path.dirname(self.python_pip_src),
@@ -286,6 +507,167 @@ class PyEncase(object):
     def set_git_path(self, git_cmd:str=None):
         self.git_path = shutil.which(git_cmd if isinstance(git_cmd,str) and git_cmd else os.environ.get('GIT', 'git'))
 
+    @classmethod
+    def pip_for_python(cls, python_cmd:str, pip_default=None):
+        """
+        pip installed next to the interpreter (e.g. /usr/local/bin/python3.12 -> /usr/local/bin/pip3.12),
+        otherwise pip_default (pip >= 23.1 can work for other interpreters with --python)
+        """
+        python_path = shutil.which(python_cmd)
+        if python_path is None:
+            return pip_default
+        py_dir, py_name = os.path.split(python_path)
+        for cand in ( [ 'pip'+py_name.removeprefix('python') ] if py_name.startswith('python') else [] ) + ['pip3', 'pip']:
+            pip_path = os.path.join(py_dir, cand)
+            if os.path.isfile(pip_path) and os.access(pip_path, os.X_OK):
+                return pip_path
+        return pip_default
+
+    def python_for(self, python_cmd:str):
+        """
+        PyEncase of the same prefix for another interpreter (site-packages etc. of its version)
+        """
+        pycan = self.__class__(argv=self.argv, python_cmd=python_cmd,
+                               pip_cmd=self.__class__.pip_for_python(python_cmd, str(self.pip_use)),
+                               prefix_cmd=self.prefix, git_cmd=self.git_path,
+                               verbose=self.verbose, dry_run=self.dry_run, encoding=self.encoding)
+        pycan.pip_offline  = self.pip_offline
+        pycan.shared_store = self.shared_store
+        pycan.pip_worker   = self.pip_worker
+        return pycan
+
+    @classmethod
+    def script_python_cmd(cls, python_path:str, script:str):
+        """
+        Interpreter of the script given by lib/python/<script>.python (first line except comments), or None
+        """
+        try:
+            with open(os.path.join(python_path, script.removesuffix('.py')+cls.SCRIPT_PYTHON_SUFFIX),
+                      encoding='utf-8') as fin:
+                for line in fin:
+                    line = line.split('#', 1)[0].strip()
+                    if line:
+                        return os.path.expandvars(os.path.expanduser(line))
+        except OSError:
+            pass
+        return None
+
+    @classmethod
+    def probe_cache_key(cls, *cmd_paths):
+        """
+        Key of the python/pip probe cache: resolved path, inode, mtime and size of each binary
+        """
+        buf = []
+        for cmd_path in cmd_paths:
+            real_path = os.path.realpath(str(cmd_path))
+            try:
+                st = os.stat(real_path)
+            except OSError:
+                return None
+            buf.append("%s:%d:%d:%d" % (real_path, st.st_ino, st.st_mtime_ns, st.st_size))
+        return '|'.join(buf)
+
+    @classmethod
+    def probe_cache_lookup(cls, cache_path, key):
+        if key is None:
+            return None
+        ent = cls.json_cache_read(cache_path).get(key)
+        if ( (not isinstance(ent, dict))
+             or (not ent.get('python_version')) or (not ent.get('pip_version')) ):
+            return None
+        return ent
+
+    @classmethod
+    def probe_cache_store(cls, cache_path, key, probed:dict):
+        if key is None:
+            return
+        entries = cls.json_cache_read(cache_path)
+        entries.pop(key, None)
+        entries[key] = dict(probed)
+        while len(entries) > cls.PROBE_CACHE_MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        cls.json_cache_write(cache_path, entries)
+
+    @classmethod
+    def json_cache_read(cls, cache_path):
+        try:
+            with open(cache_path, encoding='utf-8') as fp:
+                entries = json.load(fp).get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    @classmethod
+    def json_cache_write(cls, cache_path, entries:dict, indent=1):
+        # Only cache under an existing 'var/cache' (i.e. initialized environment)
+        cache_dir = os.path.dirname(cache_path)
+        if not os.path.isdir(os.path.dirname(cache_dir)):
+            return
+        try:
+            os.makedirs(cache_dir, mode=0o755, exist_ok=True)
+            tmp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+            with open(tmp_path, 'w', encoding='utf-8') as fp:
+                json.dump({'entries': entries}, fp, indent=indent)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    @classmethod
+    def fast_exec(cls, argv:list=sys.argv):
+        """
+        Exec the script directly when invoked via a script symlink under bin/
+        (no argparse, no stream setup). Returns only if the fast path is not
+        applicable (manage mode, cold probe cache, unknown script, etc.) so that
+        the caller can fall back to the full PyEncase(argv).main().
+        """
+        path_invoked = argv[0] if argv else ''
+        scriptname   = os.path.basename(path_invoked)
+        if ( (not scriptname) or scriptname in (cls.MNG_SCRIPT, cls.MNG_SCRIPT+'.py')
+             or (not os.path.islink(path_invoked)) ):
+            return None
+
+        bindir = os.path.dirname(os.path.abspath(path_invoked))
+        if os.path.basename(bindir) == 'bin':
+            prefix = os.path.dirname(bindir)
+            libdir = os.path.join(prefix, 'lib')
+            vardir = os.path.join(prefix, 'var')
+        else:
+            prefix = libdir = vardir = bindir
+
+        python_use = shutil.which(os.environ.get('PYTHON',
+                                                 os.environ.get('PYTHON3',
+                                                                shutil.which('python3') or shutil.which('python'))))
+        pip_use    = shutil.which(os.environ.get('PIP',
+                                                 os.environ.get('PIP3',
+                                                                shutil.which('pip3') or shutil.which('pip'))))
+        if python_use is None or pip_use is None:
+            return None
+
+        probed = cls.probe_cache_lookup(os.path.join(vardir, 'cache', cls.PIP_MODULE_NAME, cls.PROBE_CACHE_FILE),
+                                        cls.probe_cache_key(python_use, pip_use))
+        if probed is None:
+            return None
+
+        python_path     = os.path.join(libdir, 'python')
+        python_pip_path = os.path.join(libdir, 'python', 'site-packages', probed['python_version'])
+
+        if os.path.exists(os.path.join(python_path, scriptname.removesuffix('.py')+cls.SCRIPT_PYTHON_SUFFIX)):
+            # Interpreter of the script is selected by the full path
+            return None
+
+        script_path = os.path.join(python_path, scriptname if scriptname.endswith('.py') else scriptname+'.py')
+        if not os.path.isfile(script_path):
+            script_path = os.path.join(python_pip_path, 'bin', scriptname.removesuffix('.py'))
+            if not os.path.isfile(script_path):
+                return None
+
+        os.environ['PYTHONPATH'] = "%s:%s:%s" % (python_path, os.path.realpath(python_pip_path),
+                                                 os.environ.get('PYTHONPATH',''))
+        cmd_args = [python_use, script_path] + list(argv[1:])
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execvpe(cmd_args[0], cmd_args, os.environ)
+
     class CustomHelpFormatter(argparse.HelpFormatter):
             def __init__(self, prog, indent_increment=4,
                          max_help_position=int(shutil.get_terminal_size()[0]/3),
@@ -370,6 +752,7 @@ class PyEncase(object):
             config_opts = argc # argparse.Namespace()
             flg_config_type = False
             
+            span_config = self.__class__.Tracer.span('load config', files=', '.join(conf_path)).start()
             for fpath in conf_path:
                 fmt_type=os.path.splitext(fpath)[1][1:]
                 
@@ -380,7 +763,7 @@ class PyEncase(object):
                     if sys.version_info < (3, 11):
                         raise ValueError(f'TOML is not supported in this python version ({sys.version_info}) : {fpath}')
                     else:
-                        # import tomllib
+                        import tomllib
                         with open(fpath, "rb") as fp:
                             data = tomllib.load(fp)
                             if argc.verbose:
@@ -403,7 +786,7 @@ class PyEncase(object):
                                         v_key = str(k).removeprefix('--').removeprefix('-').replace('-', '_')
                                         config_opts.__dict__[v_key] = v
                 elif fmt_type == 'ini':
-                    #import configparser
+                    import configparser
                     cnfgpsr = configparser.ConfigParser()
                     cnfgpsr.read(fpath, encoding=self.encoding)
                     if argc.verbose:
@@ -447,6 +830,7 @@ class PyEncase(object):
                                         continue
                                     v_key = str(k).removeprefix('--').removeprefix('-').replace('-', '_')
                                     config_opts.__dict__[v_key] = v
+            span_config.stop()
                     
             if (isinstance(argc.config_type,str)
                 and argc.config_type and ( not flg_config_type) ):
@@ -458,6 +842,7 @@ class PyEncase(object):
                 for k, v in config_opts.__dict__.items():
                     self.stderr.write("Loaded config parameter: %-25s : %s" % (str(k), str(v)))
                 
+            span_args = self.__class__.Tracer.span('parse arguments').start()
             argprsrm = argparse.ArgumentParser(prog=prog, formatter_class=self.__class__.CustomHelpFormatter,
                                                add_help=False, exit_on_error=False)
 
@@ -473,11 +858,30 @@ class PyEncase(object):
 
             argprsrm.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
             argprsrm.add_argument('-n', '--dry-run', action='store_true', help='Dry Run Mode')
+            argprsrm.add_argument('--offline', action='store_true',
+                                  help='Offline mode: pip installs only from the local wheelhouse (--no-index --find-links)')
+            argprsrm.add_argument('--shared-store', action='store_true',
+                                  help='Hard-link installed distributions into the shared store across prefixes')
+            argprsrm.add_argument('--pip-worker', action='store_true',
+                                  help='Run pip commands in a persistent worker process (started on demand)')
+            argprsrm.add_argument('--trace', default=None, metavar='FILE',
+                                  help=('Write the spans (wall/CPU time) of phases and subprocesses as Chrome '
+                                        'trace-event JSON to FILE and show a summary (also by PY_ENCASE_TRACE)'))
             argprsrm.add_argument('--manage-help', action='help', help='Help for manage options')
 
             argpre,restpre = argprsrm.parse_known_args(restc, namespace=config_opts)
+            if getattr(argpre, 'trace', None):
+                self.__class__.Tracer.start_tracing(argpre.trace)
+            # Subcommand part of the command line and config options, to re-run it for other interpreters
+            self.manage_subcmd_argv = list(restpre)
+            self.manage_config_argv = ( ( ['--no-config-read'] if argc.no_config_read else [] )
+                                        + ( ['--config-file', argc.config_file] if argc.config_file else [] )
+                                        + ( ['--config-type', argc.config_type] if argc.config_type else [] ) )
             self.verbose = argpre.verbose
             self.dry_run = argpre.dry_run
+            self.pip_offline = bool(argpre.offline) or self.pip_offline
+            self.shared_store = bool(argpre.shared_store) or self.shared_store
+            self.pip_worker = bool(argpre.pip_worker) or self.pip_worker
 
             self.set_python_path(python_cmd=argpre.python, pip_cmd=argpre.pip, 
                                  prefix_cmd=(argpre.prefix if hasattr(argpre, 'prefix') else None))
@@ -565,10 +969,25 @@ class PyEncase(object):
             
             parser_init.add_argument('-M', '--move', action='store_true', help='moving this script body into instead of copying')
 
+            parser_init.add_argument('--launcher-mode', choices=self.__class__.LAUNCHER_MODES, default=None,
+                                     help=('Type of bin/ launcher of scripts: symbolic link to %s, or generated shell stub'
+                                           ' (Default: same as existing launchers, otherwise %s)'
+                                           % (self.__class__.ENTITY_FILE_NAME, self.__class__.LAUNCHER_MODE_DEFAULT)))
+            parser_init.add_argument('--relink', action='store_true',
+                                     help='Regenerate all launchers in bin/ (e.g. after the interpreter or prefix is changed)')
+
             parser_init.add_argument('-P', '--python', default=None, help='Python path / command')
+            parser_init.add_argument('--python-matrix', default=argparse.SUPPRESS, metavar='PYTHON[,PYTHON...]',
+                                     help='Comma-separated interpreters to install for concurrently (e.g. python3.11,python3.12)')
             parser_init.add_argument('-I', '--pip',  default=None, help='PIP path / command')
             parser_init.add_argument('-G', '--git-command', default=self.git_path, help='git path / command')
 
+            parser_init.add_argument('--no-compile', action='store_true', default=argparse.SUPPRESS,
+                                     help='Do not byte-compile scripts/modules after installation')
+            parser_init.add_argument('--invalidation-mode', choices=self.__class__.COMPILE_INVALIDATION_MODES, default=argparse.SUPPRESS,
+                                     help=('Invalidation mode of byte-compiled files (Default: %s)'
+                                           % (self.__class__.COMPILE_INVALIDATION_MODE_DEFAULT, )))
+
             parser_init.add_argument('--conv-table',  type=self.__class__.argparse_path_chk,
                                      default=None, help='Table file of conversion from import name to module name')
             parser_init.add_argument('--dependency-file', type=self.__class__.argparse_path_chk,
@@ -615,9 +1034,20 @@ class PyEncase(object):
                                                                                                        in self.__class__.SCRIPT_STD_LIB.keys() ])
                                                                                              +')"'))
 
+            parser_add.add_argument('--launcher-mode', choices=self.__class__.LAUNCHER_MODES, default=None,
+                                    help=('Type of bin/ launcher of scripts: symbolic link to %s, or generated shell stub'
+                                          ' (Default: same as existing launchers, otherwise %s)'
+                                          % (self.__class__.ENTITY_FILE_NAME, self.__class__.LAUNCHER_MODE_DEFAULT)))
+
             parser_add.add_argument('-P', '--python', default=None, help='Python path / command')
             parser_add.add_argument('-I', '--pip',  default=None, help='PIP path / command')
             parser_add.add_argument('-G', '--git-command', default=self.git_path, help='git path / command')
+            parser_add.add_argument('--no-compile', action='store_true', default=argparse.SUPPRESS,
+                                    help='Do not byte-compile scripts/modules after installation')
+            parser_add.add_argument('--invalidation-mode', choices=self.__class__.COMPILE_INVALIDATION_MODES, default=argparse.SUPPRESS,
+                                    help=('Invalidation mode of byte-compiled files (Default: %s)'
+                                          % (self.__class__.COMPILE_INVALIDATION_MODE_DEFAULT, )))
+
             parser_add.add_argument('-T', '--conv-table',  type=self.__class__.argparse_path_chk,
                                     default=None, help='Table file of conversion from import name to module name')
             parser_add.add_argument('-R', '--dependency-file', type=self.__class__.argparse_path_chk,
@@ -659,6 +1089,12 @@ class PyEncase(object):
             parser_addlib.add_argument('-I', '--pip',  default=None, help='PIP path / command')
             parser_addlib.add_argument('-G', '--git-command', default=self.git_path, help='git path / command')
 
+            parser_addlib.add_argument('--no-compile', action='store_true', default=argparse.SUPPRESS,
+                                       help='Do not byte-compile scripts/modules after installation')
+            parser_addlib.add_argument('--invalidation-mode', choices=self.__class__.COMPILE_INVALIDATION_MODES, default=argparse.SUPPRESS,
+                                       help=('Invalidation mode of byte-compiled files (Default: %s)'
+                                             % (self.__class__.COMPILE_INVALIDATION_MODE_DEFAULT, )))
+
             parser_addlib.add_argument('-T', '--conv-table',  type=self.__class__.argparse_path_chk,
                                        default=None, help='Table file of conversion from import name to module name')
             parser_addlib.add_argument('-R', '--dependency-file', type=self.__class__.argparse_path_chk,
@@ -778,6 +1214,18 @@ class PyEncase(object):
             parser_distclean.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
             parser_distclean.set_defaults(handler=self.clean_env)
 
+            parser_compile = def_subcmd('compile', help='Byte-compile scripts and modules')
+            parser_compile.add_argument('-l', '--lib-script',    action='store_true', help='Compile lib scripts (%s)' % (self.python_path, ))
+            parser_compile.add_argument('-s', '--site-packages', action='store_true', help='Compile modules installed by pip (%s)' % (self.python_pip_path, ))
+            parser_compile.add_argument('-j', '--jobs', type=int, default=0, help='Number of parallel workers (Default: 0 = number of CPUs)')
+            parser_compile.add_argument('--invalidation-mode', choices=self.__class__.COMPILE_INVALIDATION_MODES, default=argparse.SUPPRESS,
+                                        help=('Invalidation mode of byte-compiled files (Default: %s)'
+                                              % (self.__class__.COMPILE_INVALIDATION_MODE_DEFAULT, )))
+            parser_compile.add_argument('-f', '--force', action='store_true', help='Force rebuild even if timestamps are up-to-date')
+            parser_compile.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_compile.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
+            parser_compile.set_defaults(handler=self.compile_env)
+
             #parser_selfupdate = def_subcmd('selfupdate', help='Self update of '+os.path.basename(__file__))
             parser_selfupdate = def_subcmd('selfupdate', 
                                                    help='Self update of '
@@ -795,6 +1243,15 @@ class PyEncase(object):
                 _prsr_add = def_subcmd(_scmd, 
                                                help=('PIP command : %s' % (c,)))
                 _prsr_add.add_argument('pip_subcommand_args', nargs='*', help='Arguments for pip subcommands')
+                if c == 'install':
+                    _prsr_add.add_argument('--installer', choices=self.__class__.INSTALLERS, default=argparse.SUPPRESS,
+                                           help=('Installer engine: pip, or native parallel unpacker of local wheels (Default: %s)'
+                                                 % (self.__class__.INSTALLER_DEFAULT, )))
+                    _prsr_add.add_argument('--python-matrix', default=argparse.SUPPRESS, metavar='PYTHON[,PYTHON...]',
+                                           help='Comma-separated interpreters to install for concurrently (e.g. python3.11,python3.12)')
+                    _prsr_add.add_argument('--from-lock', nargs='?', const='', default=None, metavar='LOCK_FILE',
+                                           help=('Install exactly the packages of the lockfile (Default: lib/python/%s)'
+                                                 % (self.__class__.LOCK_FILE_NAME, )))
                 _prsr_add.set_defaults(handler=self.invoke_pip, pip_subcommand=c)
             #
             parser_showdeps = def_subcmd('show_deps', help='Show dependency')
@@ -804,6 +1261,11 @@ class PyEncase(object):
             parser_showdeps.add_argument('-l', '--lib-script',  action='store_true', help='Show lib scripts')
             parser_showdeps.add_argument('-m', '--module-src',  action='store_true', help='Show module sources')
             parser_showdeps.add_argument('-D', '--no-dump',     action='store_false', dest='dump', default=True, help='Suppress stdout output')
+            parser_showdeps.add_argument('-j', '--jobs',        type=int, default=0, help='Number of processes to scan imports (Default: 0 = number of CPUs)')
+            parser_showdeps.add_argument('--no-cache',          action='store_true', help='Do not use/update the cache of import scan')
+            parser_showdeps.add_argument('--import-scanner',    choices=self.__class__.IMPORT_SCANNERS, default=argparse.SUPPRESS,
+                                         help=('Import scanner: full AST or light-weight tokenizer (Default: %s)'
+                                               % (self.__class__.IMPORT_SCANNER_DEFAULT, )))
             parser_showdeps.add_argument('-T', '--conv-table',  type=self.__class__.argparse_path_chk,
                                          default=None, help='Table file of conversion from import name to module name')
             parser_showdeps.add_argument('-R', '--dependency-file', type=self.__class__.argparse_path_chk,
@@ -818,22 +1280,132 @@ class PyEncase(object):
             parser_installdeps.add_argument('-l', '--lib-script',  action='store_true', help='Show lib scripts')
             parser_installdeps.add_argument('-m', '--module-src',  action='store_true', help='Show module sources')
             parser_installdeps.add_argument('-D', '--dump',        action='store_true', default=False, help='Show to stdout')
+            parser_installdeps.add_argument('-j', '--jobs',        type=int, default=0, help='Number of processes to scan imports (Default: 0 = number of CPUs)')
+            parser_installdeps.add_argument('--no-cache',          action='store_true', help='Do not use/update the cache of import scan')
+            parser_installdeps.add_argument('--import-scanner',    choices=self.__class__.IMPORT_SCANNERS, default=argparse.SUPPRESS,
+                                            help=('Import scanner: full AST or light-weight tokenizer (Default: %s)'
+                                                  % (self.__class__.IMPORT_SCANNER_DEFAULT, )))
             parser_installdeps.add_argument('-T', '--conv-table',  type=self.__class__.argparse_path_chk,
                                             default=None, help='Table file of conversion from import name to module name')
             parser_installdeps.add_argument('-R', '--dependency-file', type=self.__class__.argparse_path_chk,
                                             default=None, help='Module requirement file')
+            parser_installdeps.add_argument('--no-compile', action='store_true', default=argparse.SUPPRESS,
+                                            help='Do not byte-compile scripts/modules after installation')
+            parser_installdeps.add_argument('--invalidation-mode', choices=self.__class__.COMPILE_INVALIDATION_MODES, default=argparse.SUPPRESS,
+                                            help=('Invalidation mode of byte-compiled files (Default: %s)'
+                                                  % (self.__class__.COMPILE_INVALIDATION_MODE_DEFAULT, )))
+            parser_installdeps.add_argument('--installer', choices=self.__class__.INSTALLERS, default=argparse.SUPPRESS,
+                                            help=('Installer engine: pip, or native parallel unpacker of local wheels (Default: %s)'
+                                                  % (self.__class__.INSTALLER_DEFAULT, )))
+            parser_installdeps.add_argument('--python-matrix', default=argparse.SUPPRESS, metavar='PYTHON[,PYTHON...]',
+                                            help='Comma-separated interpreters to install for concurrently (e.g. python3.11,python3.12)')
+            parser_installdeps.add_argument('-C', '--check-only',  action='store_true',
+                                            help=('Only compare requirements with installed modules without pip '
+                                                  '(exit status 1 if something is missing or mismatched)'))
             parser_installdeps.add_argument('pip_subcommand_args', nargs='*', help='Arguments for pip subcommands')
             parser_installdeps.set_defaults(handler=self.install_dependency)
 
+            parser_wheelhouse = def_subcmd('wheelhouse', help='Populate local wheelhouse for offline installation')
+            parser_wheelhouse.add_argument('-v', '--verbose',     action='store_true', default=self.verbose, help='Show verbose information')
+            parser_wheelhouse.add_argument('-n', '--dry-run',     action='store_true', default=self.dry_run, help='Dry run mode')
+            parser_wheelhouse.add_argument('-a', '--all',         action='store_true', help='Show all list')
+            parser_wheelhouse.add_argument('-b', '--bin-script',  action='store_true', help='Show bin scripts')
+            parser_wheelhouse.add_argument('-l', '--lib-script',  action='store_true', help='Show lib scripts')
+            parser_wheelhouse.add_argument('-m', '--module-src',  action='store_true', help='Show module sources')
+            parser_wheelhouse.add_argument('-D', '--dump',        action='store_true', default=False, help='Show to stdout')
+            parser_wheelhouse.add_argument('-j', '--jobs',        type=int, default=0, help='Number of processes to scan imports (Default: 0 = number of CPUs)')
+            parser_wheelhouse.add_argument('--no-cache',          action='store_true', help='Do not use/update the cache of import scan')
+            parser_wheelhouse.add_argument('--import-scanner',    choices=self.__class__.IMPORT_SCANNERS, default=argparse.SUPPRESS,
+                                           help=('Import scanner: full AST or light-weight tokenizer (Default: %s)'
+                                                 % (self.__class__.IMPORT_SCANNER_DEFAULT, )))
+            parser_wheelhouse.add_argument('-T', '--conv-table',  type=self.__class__.argparse_path_chk,
+                                           default=None, help='Table file of conversion from import name to module name')
+            parser_wheelhouse.add_argument('-R', '--dependency-file', type=self.__class__.argparse_path_chk,
+                                           default=None, help='Module requirement file')
+            parser_wheelhouse.add_argument('-c', '--clean',       action='store_true', help='Remove the contents of wheelhouse before populating')
+            parser_wheelhouse.add_argument('-L', '--list',        action='store_true', help='List the contents of wheelhouse only')
+            parser_wheelhouse.add_argument('pip_subcommand_args', nargs='*', help='Additional requirements / arguments for pip wheel')
+            parser_wheelhouse.set_defaults(handler=self.populate_wheelhouse)
+
+            parser_lock = def_subcmd('lock', help='Write lockfile of installed packages')
+            parser_lock.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_lock.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
+            parser_lock.add_argument('-F', '--lock-file', default=None,
+                                     help='Lockfile path (Default: lib/python/%s)' % (self.__class__.LOCK_FILE_NAME, ))
+            parser_lock.add_argument('-w', '--fetch-wheels', action='store_true',
+                                     help='Fetch/build the wheels not found locally into wheelhouse by pip')
+            parser_lock.add_argument('-C', '--check', action='store_true',
+                                     help='Compare lockfile with installed packages (exit status 1 if different)')
+            parser_lock.add_argument('pip_subcommand_args', nargs='*', help='Arguments for pip wheel (with -w)')
+            parser_lock.set_defaults(handler=self.make_lock)
+
+            parser_store = def_subcmd('store', help='Manage the shared package store')
+            parser_store.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_store.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
+            parser_store.add_argument('store_command', nargs='?', choices=('list', 'link', 'gc', 'path'), default='list',
+                                      help=('list: show entries, link: hard-link site-packages of this prefix into the store, '
+                                            'gc: remove entries not linked from any prefix, path: show the store directory '
+                                            '(Default: list)'))
+            parser_store.set_defaults(handler=self.manage_store)
+
+            parser_pip_worker = def_subcmd('pip_worker', help='Control the persistent pip worker (--pip-worker)')
+            parser_pip_worker.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_pip_worker.add_argument('worker_command', nargs='?', choices=('status', 'start', 'stop', 'path'),
+                                           default='status',
+                                           help=('status: show the running worker, start/stop: start/stop the worker, '
+                                                 'path: show the socket path (Default: status)'))
+            parser_pip_worker.set_defaults(handler=self.manage_pip_worker)
+
+            parser_generations = def_subcmd('generations', help='Manage generations of site-packages')
+            parser_generations.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_generations.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
+            parser_generations.add_argument('-k', '--keep', type=int, default=None,
+                                            help=('Number of newest generations kept by gc (Default: %d)'
+                                                  % (self.__class__.SITE_GENERATION_KEEP, )))
+            parser_generations.add_argument('generations_command', nargs='?', choices=('list', 'enable', 'disable', 'gc'),
+                                            default='list',
+                                            help=('list: show generations, enable/disable: start/stop installing into new '
+                                                  'generations, gc: remove old generations (Default: list)'))
+            parser_generations.set_defaults(handler=self.manage_generations)
+
+            parser_rollback = def_subcmd('rollback', help='Activate previous (or given) generation of site-packages')
+            parser_rollback.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_rollback.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
+            parser_rollback.add_argument('generation', nargs='?', type=int, default=None,
+                                         help='Generation to be activated (Default: previous one)')
+            parser_rollback.set_defaults(handler=self.rollback_generation)
+
+            parser_fleet = def_subcmd('fleet', help='Run a manage subcommand over many prefixes concurrently')
+            parser_fleet.add_argument('-v', '--verbose', action='store_true', default=self.verbose, help='Verbose output')
+            parser_fleet.add_argument('-n', '--dry-run', action='store_true', default=self.dry_run, help='Dry Run Mode')
+            parser_fleet.add_argument('-f', '--prefix-file', action='append', type=self.__class__.argparse_path_chk,
+                                      help='File listing prefixes (path or glob pattern per line)')
+            parser_fleet.add_argument('-g', '--glob', action='append', help='Glob pattern of prefixes')
+            parser_fleet.add_argument('-j', '--jobs', type=int, default=0,
+                                      help=('Number of prefixes processed concurrently (Default: 0 = number of CPUs, at most %d)'
+                                            % (self.__class__.FLEET_MAX_WORKERS, )))
+            parser_fleet.add_argument('-t', '--timeout', type=float, default=None, help='Timeout for each prefix (sec.)')
+            parser_fleet.add_argument('-L', '--log-dir', default=None,
+                                      help='Directory of the per-prefix logs (Default: var/log/fleet/<date-time>)')
+            parser_fleet.add_argument('-E', '--use-current', action='store_true',
+                                      help='Use this %s for all prefixes instead of bin/%s of each prefix'
+                                      % (self.__class__.ENTITY_FILE_NAME, self.__class__.MNG_SCRIPT))
+            parser_fleet.add_argument('fleet_command', nargs=argparse.REMAINDER,
+                                      help="Subcommand and its arguments after '--' (e.g. -- install_deps -v)")
+            parser_fleet.set_defaults(handler=self.run_fleet)
+
             parser_help = def_subcmd('help', help="Show help for a subcommand")
             parser_help.add_argument("command", nargs="?")
             
             #argps= argprsrm.parse_args()
             argps,restps = argprsrm.parse_known_args(restpre, namespace=argpre) # namespace=config_opts
+            span_args.stop()
             #self.set_python_path(python_cmd=argps.python, pip_cmd=argps.pip, 
             #                     prefix_cmd=(argps.prefix if hasattr(argps, 'prefix') else None))
             if hasattr(argps, 'handler'):
-                argps.handler(argps, restps)
+                with self.__class__.Tracer.span('subcommand '+str(argps.subcommand)):
+                    ret = argps.handler(argps, restps)
+                return ret if isinstance(ret, int) and not isinstance(ret, bool) else 0
             elif argps.subcommand == "help":
                 if not argps.command:
                     argprsrm.print_help()
@@ -853,9 +1425,35 @@ class PyEncase(object):
         flg_verbose = args.verbose if hasattr(args, 'verbose') else False
         flg_dry_run  = args.dry_run  if hasattr(args, 'dry_run') else False
         subcmd = args.pip_subcommand if hasattr(args, 'pip_subcommand') else args.subcommand
-        return self.run_pip(subcmd=subcmd,
-                            args=args.pip_subcommand_args+rest,
-                            verbose=flg_verbose, dry_run=flg_dry_run)
+        if subcmd == 'install' and self.python_matrix_of(args):
+            return self.run_python_matrix(self.python_matrix_of(args), self.manage_subcmd_argv,
+                                          verbose=flg_verbose, dry_run=flg_dry_run)
+        if subcmd == 'install' and getattr(args, 'from_lock', None) is not None:
+            ret = self.run_in_site_generation(lambda: self.install_from_lock(self.lock_file_path(args.from_lock),
+                                                                             pip_args=args.pip_subcommand_args+rest,
+                                                                             opts=args, verbose=flg_verbose, dry_run=flg_dry_run),
+                                              verbose=flg_verbose, dry_run=flg_dry_run)
+        elif subcmd == 'install':
+            ret = self.run_pip_install(args.pip_subcommand_args+rest, opts=args,
+                                       verbose=flg_verbose, dry_run=flg_dry_run)
+        else:
+            ret = self.run_pip(subcmd=subcmd,
+                               args=args.pip_subcommand_args+rest,
+                               verbose=flg_verbose, dry_run=flg_dry_run)
+        return self.__class__.exit_status(ret, dry_run=flg_dry_run)
+
+    @classmethod
+    def exit_status(cls, ret, dry_run=False):
+        """
+        Exit status of a handler result: subprocess.CompletedProcess (pip), int, or None
+        (nothing run: 0 in dry-run mode, otherwise a failure)
+        """
+        if isinstance(ret, int) and not isinstance(ret, bool):
+            return ret
+        if hasattr(ret, 'returncode'):
+            return ret.returncode
+        return 0 if dry_run else 1
+
     @classmethod
     def version_compare(cls, v1:str, v2:str):
         """
@@ -950,7 +1548,10 @@ class PyEncase(object):
             argprsrx.add_argument('-t', '--target', default=self.python_pip_path)
             argprsrx.add_argument('-s', '--src',    default=self.python_pip_src)
         elif subcmd == 'download':
-            argprsrx.add_argument('-d', '--dest',   default=self.python_pip_path)
+            argprsrx.add_argument('-d', '--dest',   default=self.python_pip_wheelhouse)
+            argprsrx.add_argument('-s', '--src',    default=self.python_pip_src)
+        elif subcmd == 'wheel':
+            argprsrx.add_argument('-w', '--wheel-dir', default=self.python_pip_wheelhouse)
             argprsrx.add_argument('-s', '--src',    default=self.python_pip_src)
         elif subcmd in ('freeze', 'inspect', 'list'):
             argprsrx.add_argument('--path', default=self.python_pip_path)
@@ -970,22 +1571,317 @@ class PyEncase(object):
 
         cmdargs.append(subcmd)
 
-        for opt in ['cache-dir', 'log', 'target', 'src', 'dest', 'path']:
+        for opt in ['cache-dir', 'log', 'target', 'src', 'dest', 'wheel-dir', 'path']:
             if not hasattr(argsx, opt.replace('-', '_')):
                 continue
             cmdargs.extend(['--'+opt.replace('_', '-'), getattr(argsx,opt.replace('-', '_')) ] )
 
+        if self.pip_offline and subcmd in ('install', 'download', 'wheel') and '--no-index' not in restx:
+            # Resolve everything from the local wheelhouse without touching the package index
+            if not os.path.isdir(self.python_pip_wheelhouse):
+                self.stderr.write("Warning: Offline mode but wheelhouse does not exist: %s" % (self.python_pip_wheelhouse, ))
+            cmdargs.extend(['--no-index', '--find-links', self.python_pip_wheelhouse,
+                            '--disable-pip-version-check'])
+
         cmdargs.extend(restx)
 
         if verbose or dry_run:
             self.stderr.write("Exec: '%s'" % (" ".join(cmdargs),))
         if not dry_run:
-            return subprocess.run(cmdargs, shell=False,
-                                  encoding=self.encoding, **popen_kwargs)
+            if subcmd in ('install', 'uninstall'):
+                self.dist_index_memo = None
+            with self.__class__.Tracer.span('pip '+subcmd, cat='subprocess', argv=' '.join(cmdargs)) as span:
+                if self.pip_worker and subcmd in self.__class__.PIP_WORKER_SUBCMDS:
+                    ret = self.run_pip_in_worker(cmdargs, verbose=verbose, **popen_kwargs)
+                    if ret is not None:
+                        span.set(returncode=ret.returncode, worker=True)
+                        return ret
+                ret = subprocess.run(cmdargs, shell=False,
+                                     encoding=self.encoding, **popen_kwargs)
+                span.set(returncode=ret.returncode)
+                return ret
+
+    def pip_worker_socket_path(self):
+        """
+        Unix socket of the pip worker for the current python/pip (None if no private directory is available)
+        """
+        import hashlib
+        import tempfile
+        base = ( os.path.join(os.environ['XDG_RUNTIME_DIR'], 'py-encase') if os.environ.get('XDG_RUNTIME_DIR')
+                 else os.path.join(tempfile.gettempdir(), 'py-encase-%d' % (os.getuid(), )) )
+        try:
+            os.makedirs(base, mode=0o700, exist_ok=True)
+            st = os.stat(base)
+        except OSError:
+            return None
+        if st.st_uid != os.getuid() or ( st.st_mode & 0o077 ):
+            return None
+        key = hashlib.sha256(("%s\0%s" % (self.python_use.absolute(), self.pip_vertion_str)).encode('utf-8')).hexdigest()
+        return os.path.join(base, 'pip-%s.sock' % (key[:16], ))
+
+    def pip_worker_request(self, request:dict, fds:list=[], timeout=5.0):
+        """
+        Send a request to the pip worker and return its reply. Raises OSError if the worker
+        is not available, EOFError if no proper reply comes after the request is sent.
+        """
+        import socket
+        sock_path = self.pip_worker_socket_path()
+        if sock_path is None:
+            raise FileNotFoundError("No private directory for pip worker socket")
+        payload = json.dumps(request).encode('utf-8')
+        msg     = len(payload).to_bytes(8, 'big') + payload
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(sock_path)
+            n_sent = socket.send_fds(sock, [msg], fds) if fds else sock.send(msg)
+            if n_sent < len(msg):
+                sock.sendall(msg[n_sent:])
+            sock.settimeout(None)
+            data = b''
+            try:
+                while not data.endswith(b"\n"):
+                    chunk = sock.recv(4096)
+                    if not chunk:
+                        raise EOFError("pip worker closed connection")
+                    data += chunk
+                return json.loads(data.decode('utf-8'))
+            except (OSError, ValueError) as exc:
+                raise EOFError(str(exc))
+
+    def pip_worker_start(self, verbose=False):
+        """
+        Start the pip worker in background (detached); True if it is ready
+        """
+        import select
+        sock_path = self.pip_worker_socket_path()
+        if sock_path is None:
+            return False
+        try:
+            idle = float(os.environ.get('PY_ENCASE_PIP_WORKER_IDLE', self.__class__.PIP_WORKER_IDLE_TIMEOUT))
+        except ValueError:
+            idle = self.__class__.PIP_WORKER_IDLE_TIMEOUT
+        cmdargs = [str(self.python_use.absolute()), '-c', self.__class__.PIP_WORKER_SCRIPT,
+                   sock_path, str(idle), self.pip_vertion_str]
+        if verbose:
+            self.stderr.write("Start pip worker : %s (idle timeout: %g sec.)" % (sock_path, idle))
+        try:
+            proc = subprocess.Popen(cmdargs, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, start_new_session=True)
+        except OSError as exc:
+            self.stderr.write("Warning: Failed to start pip worker : %s" % (exc, ))
+            return False
+        with proc.stdout:
+            readable, w, x = select.select([proc.stdout], [], [], self.__class__.PIP_WORKER_START_TIMEOUT)
+            status = proc.stdout.readline().decode('utf-8', errors='replace').strip() if readable else 'error timeout'
+        if not status.startswith('ready'):
+            self.stderr.write("Warning: pip worker is not available : %s" % (status.removeprefix('error ') or 'exited', ))
+            if proc.poll() is None:
+                proc.kill()
+            return False
+        return True
+
+    def run_pip_in_worker(self, cmdargs:list, verbose=False, **popen_kwargs):
+        """
+        Run pip command line (as made by run_pip) in the pip worker. Returns CompletedProcess
+        or None if the worker cannot be used (the caller falls back to a pip subprocess)
+        """
+        import tempfile
+        if set(popen_kwargs.keys()) - set(['capture_output', 'stdout', 'stderr', 'check']):
+            return None
+        pip_args = list(cmdargs[1:])
+        if ( len(pip_args)>1 and pip_args[0] == '--python'
+             and pip_args[1] == str(self.python_use.absolute()) ):
+            # The worker runs in the target python itself
+            pip_args = pip_args[2:]
+
+        captured = {}
+        fds      = [0, 1, 2]
+        opened   = []
+        for i, key in ((1, 'stdout'), (2, 'stderr')):
+            dest = subprocess.PIPE if popen_kwargs.get('capture_output') else popen_kwargs.get(key)
+            if dest == subprocess.PIPE:
+                captured[key] = tempfile.TemporaryFile()
+                opened.append(captured[key])
+                fds[i] = captured[key].fileno()
+            elif dest == subprocess.DEVNULL:
+                opened.append(open(os.devnull, 'wb'))
+                fds[i] = opened[-1].fileno()
+            elif dest == subprocess.STDOUT:
+                fds[i] = fds[1]
+            elif isinstance(dest, int):
+                fds[i] = dest
+            elif dest is not None:
+                fds[i] = dest.fileno()
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            request = {'op': 'pip', 'args': pip_args, 'cwd': os.getcwd(), 'env': dict(os.environ)}
+            try:
+                try:
+                    reply = self.pip_worker_request(request, fds=fds)
+                except OSError:
+                    if not self.pip_worker_start(verbose=verbose):
+                        self.pip_worker = False # not to try again in this invocation
+                        return None
+                    try:
+                        reply = self.pip_worker_request(request, fds=fds)
+                    except OSError as exc:
+                        self.stderr.write("Warning: pip worker is not available : %s" % (exc, ))
+                        self.pip_worker = False
+                        return None
+            except EOFError as exc:
+                # The request may have been (partly) processed: no fallback to avoid running pip twice
+                self.stderr.write("Error: pip worker died while running : '%s' (%s)" % (' '.join(pip_args), exc))
+                reply = {'returncode': 1}
+            if verbose:
+                self.stderr.write("pip worker : returncode=%s" % (reply.get('returncode'), ))
+            outputs = {}
+            for key, fobj in captured.items():
+                fobj.seek(0)
+                outputs[key] = fobj.read().decode(self.encoding, errors='replace')
+        finally:
+            for fobj in opened:
+                fobj.close()
+
+        ret = subprocess.CompletedProcess(cmdargs, reply.get('returncode', 1),
+                                          stdout=outputs.get('stdout'), stderr=outputs.get('stderr'))
+        if popen_kwargs.get('check'):
+            ret.check_returncode()
+        return ret
+
+    def manage_pip_worker(self, args:argparse.Namespace, rest:list=[]):
+        flg_verbose = args.verbose if hasattr(args, 'verbose') else self.verbose
+        worker_cmd  = args.worker_command if hasattr(args, 'worker_command') and args.worker_command else 'status'
+
+        if worker_cmd == 'path':
+            print(self.pip_worker_socket_path())
+            return 0
+        if worker_cmd == 'start':
+            return 0 if self.pip_worker_start(verbose=flg_verbose) else 1
+        try:
+            info = self.pip_worker_request({'op': 'stop' if worker_cmd == 'stop' else 'ping'})
+        except (OSError, EOFError):
+            self.stderr.write("pip worker is not running : %s" % (self.pip_worker_socket_path(), ))
+            return 0 if worker_cmd == 'stop' else 1
+        if worker_cmd == 'stop':
+            self.stderr.write("Stop pip worker (pid=%s, served %s requests)" % (info.get('pid'), info.get('served')))
+            return 0
+        for key in ('pid', 'python', 'pip_version', 'served', 'running', 'uptime', 'idle', 'idle_timeout'):
+            val = info.get(key)
+            print("%-13s: %s" % (key, ( "%.1f sec." % (val, ) ) if isinstance(val, float) else val))
+        return 0
+
+    def run_pip_install(self, pip_args:list, opts:argparse.Namespace=None, verbose=False, dry_run=False, **popen_kwargs):
+        """
+        'pip install' followed by byte-compiling of site-packages in parallel
+        (pip itself compiles serially, so it is asked not to, unless --compile is given)
+        """
+        flg_compile = self.auto_compile_enabled(opts=opts, pip_args=pip_args)
+        if flg_compile and ( '--compile' not in pip_args ):
+            pip_args = ['--no-compile'] + list(pip_args)
+
+        def install():
+            ret = None
+            if self.installer_of(opts) == 'native':
+                ret = self.install_wheels_native(pip_args, verbose=verbose, dry_run=dry_run, **popen_kwargs)
+            if ret is None:
+                ret = self.run_pip(subcmd='install', args=pip_args, verbose=verbose, dry_run=dry_run, **popen_kwargs)
+
+            if self.shared_store and ( not dry_run ) and ret is not None and ret.returncode == 0:
+                self.store_link_site_packages(verbose=verbose)
+
+            if flg_compile and ( dry_run or (ret is not None and ret.returncode == 0) ):
+                self.compile_bytecode(lib_script=False, site_packages=True,
+                                      invalidation_mode=(opts.invalidation_mode
+                                                         if hasattr(opts, 'invalidation_mode') else None),
+                                      report=verbose, verbose=verbose, dry_run=dry_run)
+            return ret
+
+        return self.run_in_site_generation(install, verbose=verbose, dry_run=dry_run)
+
+    def auto_compile_enabled(self, opts:argparse.Namespace=None, pip_args:list=[]):
+        if hasattr(opts, 'no_compile') and opts.no_compile:
+            return False
+        if '--no-compile' in pip_args:
+            return False
+        return not os.environ.get('PY_ENCASE_NO_COMPILE')
+
+    def compile_bytecode(self, lib_script=True, site_packages=True, jobs:int=0,
+                         invalidation_mode:str=None, force=False, report=True, verbose=False, dry_run=False):
+        """
+        Byte-compile lib/python (top level only) and site-packages (recursively) with
+        'compileall' of the target interpreter, using 'jobs' worker processes (0: all CPUs).
+        Returns the number of trees failed.
+        """
+        mode = ( invalidation_mode if invalidation_mode else 
+                 os.environ.get('PY_ENCASE_INVALIDATION_MODE', self.__class__.COMPILE_INVALIDATION_MODE_DEFAULT))
+        if mode not in self.__class__.COMPILE_INVALIDATION_MODES:
+            self.stderr.write("Error: Unknown invalidation mode: '%s' (Choose from %s)"
+                              % (mode, ', '.join(self.__class__.COMPILE_INVALIDATION_MODES)))
+            return 1
+
+        trees = []
+        if lib_script:
+            trees.append((self.python_path, ['-l']))
+        if site_packages:
+            trees.append((self.python_pip_path, []))
+
+        n_failed = 0
+        for tree,tree_opts in trees:
+            if not os.path.isdir(tree):
+                if verbose:
+                    self.stderr.write("Skip compile (directory not found): '%s'" % (tree, ))
+                continue
+            cmdargs = ( [ str(self.python_use), '-m', 'compileall', '-q', '-j', str(int(jobs)),
+                          '--invalidation-mode', mode ]
+                        + (['-f'] if force else []) + tree_opts + [ tree ] )
+            if verbose or dry_run:
+                self.stderr.write("Exec: '%s'" % (" ".join(cmdargs),))
+            if dry_run:
+                continue
+            t_start = time.perf_counter()
+            ret = self.__class__.Tracer.run(cmdargs, shell=False, encoding=self.encoding)
+            t_elapsed = time.perf_counter() - t_start
+            if ret.returncode != 0:
+                n_failed += 1
+            if report:
+                print("Compiled : %-50s : %8.3f sec (%s%s)"
+                      % (tree, t_elapsed, mode, '' if ret.returncode == 0 else ', failed'))
+        return n_failed
+
+    def compile_env(self, args:argparse.Namespace, rest:list=[]):
+        flg_verbose = args.verbose       if hasattr(args, 'verbose')       else self.verbose
+        flg_dry_run = args.dry_run       if hasattr(args, 'dry_run')       else self.dry_run
+        flg_lib     = args.lib_script    if hasattr(args, 'lib_script')    else False
+        flg_site    = args.site_packages if hasattr(args, 'site_packages') else False
+        flg_force   = args.force         if hasattr(args, 'force')         else False
+        n_jobs      = args.jobs          if hasattr(args, 'jobs')          else 0
+        mode        = args.invalidation_mode if hasattr(args, 'invalidation_mode') else None
+
+        if not ( flg_lib or flg_site ):
+            flg_lib  = True
+            flg_site = True
+
+        return self.compile_bytecode(lib_script=flg_lib, site_packages=flg_site, jobs=n_jobs,
+                                     invalidation_mode=mode, force=flg_force, report=True,
+                                     verbose=flg_verbose, dry_run=flg_dry_run)
 
     def run_script(self, script:str, args:list=[]):
+        if isinstance(script, str) and script and not os.path.isfile(script):
+            python_cmd = self.__class__.script_python_cmd(self.python_path, script)
+            if python_cmd is not None:
+                if shutil.which(python_cmd) is None:
+                    self.stderr.write("Error: Python for '%s' is not found : '%s' (%s)"
+                                      % (script, python_cmd, os.path.join(self.python_path, script.removesuffix('.py')
+                                                                          + self.__class__.SCRIPT_PYTHON_SUFFIX)))
+                    raise FileNotFoundError()
+                self.set_python_path(python_cmd=python_cmd,
+                                     pip_cmd=self.__class__.pip_for_python(python_cmd, str(self.pip_use)),
+                                     prefix_cmd=self.prefix)
+
+        # Pin the active generation of site-packages (if generational) for the whole run
         os.environ['PYTHONPATH'] = "%s:%s:%s" % (self.python_path,
-                                                 self.python_pip_path,
+                                                 os.path.realpath(self.python_pip_path),
                                                  os.environ.get('PYTHONPATH',''))
 
         if script is None:
@@ -1023,6 +1919,7 @@ class PyEncase(object):
                                           pathlib.Path(__file__).resolve())
 
     def get_module_template_dirs(self):
+        import importlib.util
         pkg_name = self.__class__.PIP_MODULE_NAME.replace('-', '_')
         subdirs = [ 'share', self.__class__.PIP_MODULE_NAME, 'template']
         cand = [ self.prefix, os.path.join(self.datadir, 'template') ]
@@ -1094,6 +1991,7 @@ class PyEncase(object):
         print("PIP src directory      : ", self.python_pip_src)
         print("PIP log directory      : ", self.python_pip_logdir)
         print("PIP log path           : ", self.python_pip_log_path)
+        print("Python/PIP probe cache : ", ("hit" if self.probe_cache_hit else "miss"), "(", self.probe_cache_path, ")")
         print("Python shebang         : ", self.python_shebang)
         print("KIVY_HOME              : ", self.kivy_home)
 
@@ -1114,7 +2012,11 @@ class PyEncase(object):
                 if flg_verbose:
                     print('Bin Scripts: ----------------------------------------')
                 for scr in bin_scr:
-                    print(scr)
+                    if ( flg_verbose and
+                         self.__class__.is_launcher_stub(os.path.join(self.bindir, scr.removesuffix('.py'))) ):
+                        print("%s (launcher stub)" % (scr, ))
+                    else:
+                        print(scr)
             if flg_lib or flg_all:
                 if flg_verbose:
                     print('Lib Scripts: ----------------------------------------')
@@ -1136,6 +2038,7 @@ class PyEncase(object):
                 print("%-*s : %-*s (%s)" % (l_name, name, l_version, version, path))
 
     def list_all_pkg_scripts(self):
+        import glob
         return [os.path.basename(x) for x in 
                 glob.glob(os.path.join(self.python_path, '*.py'))]
 
@@ -1145,7 +2048,8 @@ class PyEncase(object):
         for x in self.list_all_pkg_scripts():
             b_path = os.path.join(self.bindir, x.removesuffix('.py'))
             if ( os.path.exists(b_path) 
-                 and os.path.islink(b_path) ) : 
+                 and ( os.path.islink(b_path)
+                       or self.__class__.is_launcher_stub(b_path) ) ) : 
                 buf_bin.append(x)
             else:
                 buf_lib.append(x)
@@ -1153,183 +2057,1892 @@ class PyEncase(object):
 
     def list_pip_modules(self):
         location = pathlib.Path(self.python_pip_path)
-        buf = []
-        for pttrn in ("*.dist-info", "*.egg-info"):
-            for info_dir in (location.glob(pttrn)):
-                try:
-                    dist = importlib.metadata.PathDistribution(info_dir)
-                    buf.append((dist.metadata.get("Name"), dist.version, dist.locate_file("")))
-                except Exception as e:
-                    print(e)
-                    pass
+        buf = [ (ent['name'], ent['version'], location) for ent in self.dist_index().values() ]
         return sorted(buf, key=lambda x: x[0].lower())
 
-    def list_module_source(self):
-        buf = []
-        for x in glob.glob(os.path.join(self.srcdir, '*', 'pyproject.toml')):
-            buf.append(os.path.dirname(x))
-        return buf
+    @classmethod
+    def normalize_dist_name(cls, name:str):
+        return re.sub(r'[-_.]+', '-', name).lower()
 
-    def pkg_dir_list(self):
-        return [self.prefix, self.bindir, self.vardir, 
-                self.srcdir, self.tmpdir, self.logdir, self.python_path]
+    def dist_index(self, verbose=False):
+        """
+        Index of the distributions installed in site-packages (python_pip_path):
+        {normalized name: {'name', 'version', 'info_dir', 'top_level', 'requires', 'mtime'}}.
+        Kept in var/cache/py-encase/dist_index.json and refreshed incrementally:
+        only *.dist-info/*.egg-info whose mtime changed are read again.
+        """
+        if self.dist_index_memo is not None:
+            return self.dist_index_memo
 
-    def pip_dir_list(self):
-        return [self.python_pip_path, self.python_pip_cache,
-                self.python_pip_src, self.python_pip_logdir]
+        site_path = self.python_pip_path
+        try:
+            site_mtime = os.stat(site_path).st_mtime_ns
+        except OSError:
+            self.dist_index_memo = {}
+            return self.dist_index_memo
+
+        cache_path = os.path.join(self.vardir, 'cache', self.__class__.PIP_MODULE_NAME,
+                                  self.__class__.DIST_INDEX_CACHE_FILE)
+        entries = self.__class__.json_cache_read(cache_path)
+        cached  = entries.get(site_path) if isinstance(entries.get(site_path), dict) else {}
+        cached_dists = cached.get('dists') if isinstance(cached.get('dists'), dict) else {}
+
+        if cached.get('mtime') == site_mtime:
+            info_names = list(cached_dists.keys())
+        else:
+            info_names = sorted([ x for x in os.listdir(site_path)
+                                  if x.endswith('.dist-info') or x.endswith('.egg-info') ])
+        dists    = {}
+        n_parsed = 0
+        for info_name in info_names:
+            info_path = os.path.join(site_path, info_name)
+            try:
+                info_mtime = os.stat(info_path).st_mtime_ns
+            except OSError:
+                continue
+            ent = cached_dists.get(info_name)
+            if not ( isinstance(ent, dict) and ent.get('mtime') == info_mtime ):
+                ent = self.__class__.read_dist_info(info_path)
+                if ent is None:
+                    continue
+                ent['mtime'] = info_mtime
+                n_parsed += 1
+            dists[info_name] = ent
+
+        if verbose:
+            self.stderr.write("Distribution index: %d installed (read: %d) : %s" % (len(dists), n_parsed, site_path))
+        if n_parsed > 0 or len(dists) != len(cached_dists) or cached.get('mtime') != site_mtime:
+            entries.pop(site_path, None)
+            entries[site_path] = {'mtime': site_mtime, 'dists': dists}
+            while len(entries) > self.__class__.PROBE_CACHE_MAX_ENTRIES:
+                entries.pop(next(iter(entries)))
+            self.__class__.json_cache_write(cache_path, entries, indent=None)
+
+        self.dist_index_memo = { self.__class__.normalize_dist_name(ent['name']): ent for ent in dists.values() }
+        return self.dist_index_memo
 
-    def all_dir_list(self):
-        return self.pkg_dir_list() + self.pip_dir_list()
+    @classmethod
+    def read_dist_info(cls, info_path:str):
+        """
+        Name, version, top-level import names and requirements of *.dist-info/*.egg-info
+        (METADATA/PKG-INFO headers, top_level.txt or RECORD, requires.txt)
+        """
+        def read_text(*path_elems):
+            try:
+                with open(os.path.join(*path_elems), encoding='utf-8', errors='replace') as fin:
+                    return fin.read()
+            except OSError:
+                return None
 
+        flg_dist = info_path.endswith('.dist-info')
+        if os.path.isdir(info_path):
+            meta_text = read_text(info_path, 'METADATA' if flg_dist else 'PKG-INFO')
+        else:
+            meta_text = read_text(info_path)
+        if meta_text is None:
+            return None
 
-    def read_dict(self, path):
-        pathobj = path if isinstance(path, pathlib.Path) else pathlib.Path(path)
-        buf = {}
+        headers = {}
+        for line in meta_text.splitlines():
+            if not line:
+                break
+            if line[0] in ' \t' or ':' not in line:
+                continue
+            hdr, val = line.split(':', 1)
+            headers.setdefault(hdr.strip().lower(), []).append(val.strip())
+        if not headers.get('name'):
+            return None
 
-        if pathobj.suffix == '.json':
-            with open(pathobj, "rb") as fp:
-                data = json.load(fp)
-                if isinstance(data, dict):
-                    buf.update(data)
-                elif isinstance(data, (list, set)):
-                    for x in data:
-                        if not x:
-                            continue
-                        chunk = self.__class__.NON_PYIDF_PATTERN.split(str(x))
-                        if not chunk[0]:
-                            continue
-                        if ( len(chunk)>1 ) :
-                            buf.update({ chunk[0]: chunk[1] })
-                        else:
-                            buf.update({ chunk[0]: chunk[0] })
-                else:
-                    buf.update({ str(data): str(data) })
-        elif pathobj.suffix == '.toml':
-            if sys.version_info < (3, 11):
-                raise ValueError(f'TOML is not supported in this python version ({sys.version_info}) : {path}')
-            else:
-                with open(pathobj, "rb") as fp:
-                    data = tomllib.load(fp)
-                    for secsion in ['DEFAULT', 'requirements', 'modules', 'packages']:
-                        buf.update( { k: v for k,v in data.get(secsion,{}).items() if k } )
-        elif pathobj.suffix == '.ini':
-            cnfgpsr = configparser.ConfigParser()
-            cnfgpsr.read(pathobj, encoding=self.encoding)
-            for k,v in cnfgpsr.defaults().items():
-                if not k:
-                    continue                
-                buf.update( { k: v } )
-        else: # assume text file 
-            chunks = []
-            with open(pathobj, "r") as fp:
-                chunks.extend(self.__class__.SPACENL_PATTERN.split(fp.read()))
-            for x in chunks:
-                if not x:
-                    continue                
-                chunk = self.__class__.NON_PYIDF_PATTERN.split(str(x))
-                if ( len(chunk)>1 ) :
-                    buf.update({ chunk[0]: chunk[1] })
+        requires = headers.get('requires-dist', [])
+        if not flg_dist:
+            req_text = read_text(info_path, 'requires.txt') if os.path.isdir(info_path) else None
+            for line in (req_text.splitlines() if req_text else []):
+                if line.startswith('['):
+                    break
+                if line.strip():
+                    requires.append(line.strip())
+
+        top_level = []
+        tl_text   = read_text(info_path, 'top_level.txt') if os.path.isdir(info_path) else None
+        if tl_text is not None:
+            top_level = [ x.strip().replace('/', '.') for x in tl_text.splitlines() if x.strip() ]
+        elif flg_dist:
+            rec_text = read_text(info_path, 'RECORD')
+            for line in (rec_text.splitlines() if rec_text else []):
+                top = line.split(',', 1)[0].split('/', 1)
+                if len(top) > 1:
+                    name = top[0]
+                    if name.endswith('.dist-info') or name.endswith('.data') or name in ('..', '__pycache__'):
+                        continue
                 else:
-                    buf.update({ chunk[0]: chunk[0] })
-        return buf
-    
-    def show_dependency(self, args:argparse.Namespace, rest:list=[]):
-        flg_verbose = args.verbose       if hasattr(args, 'verbose')       else self.verbose
-        flg_all     = args.all           if hasattr(args, 'all')           else False
-        flg_bin     = args.bin_script    if hasattr(args, 'bin_script')    else False
-        flg_lib     = args.lib_script    if hasattr(args, 'lib_script')    else False
-        flg_mod     = args.module_src    if hasattr(args, 'module_src')    else False
-        flg_dump    = args.dump          if hasattr(args, 'dump')          else True
+                    if not ( top[0].endswith('.py') or top[0].endswith('.so') or top[0].endswith('.pyd') ):
+                        continue
+                    name = top[0].split('.', 1)[0]
+                if name.isidentifier() and name not in top_level:
+                    top_level.append(name)
 
-        cnv_tble_file   = args.conv_table      if hasattr(args, 'conv_table')      else None
-        dependency_file = args.dependency_file if hasattr(args, 'dependency_file') else None
+        return {'name':      headers['name'][0],
+                'version':   headers.get('version', [''])[0],
+                'info_dir':  os.path.basename(info_path),
+                'top_level': top_level,
+                'requires':  requires }
 
-        cnv_tbl     = {}
-        req_modules = {}
+    def lock_file_path(self, path=None):
+        return str(path) if path else os.path.join(self.python_path, self.__class__.LOCK_FILE_NAME)
 
-        cnv_tbl.update( self.__class__.KNOWN_IMPORT_NAME_TO_MODULE_NAME )
-        
-        if sys.version_info < (3, 11):
-            suffixes = [ '.json',         '.ini', '.txt', '' ]
-        else:            
-            suffixes = [ '.json', '.toml', '.ini', '.txt', '']
-        
-        if cnv_tble_file is not None:
-            cnv_tbl.update(self.read_dict(cnv_tble_file))
-        else:
-            for subdir in [ os.path.join(self.datadir, 'python'),
-                            self.datadir, self.python_pip_path, self.python_path ]:
-                for suffix in suffixes:
-                    fpth = os.path.join(subdir, self.__class__.FILENAME_DEFAULT['____MODULE_TABLE_BASE____']+suffix)
-                    fpthobj = pathlib.Path(fpth)
-                    if ( ( not fpthobj.exists() ) or
-                         ( not fpthobj.is_file() ) or
-                         ( not os.access(fpthobj, os.R_OK)) ):
+    @classmethod
+    def parse_wheel_filename(cls, fname:str):
+        """
+        (normalized name, version, [tags]) of '<name>-<ver>[-<build>]-<py>-<abi>-<plat>.whl' or None
+        """
+        if not fname.endswith('.whl'):
+            return None
+        flds = fname.removesuffix('.whl').split('-')
+        if len(flds) not in (5, 6):
+            return None
+        pys, abis, plats = [ x.split('.') for x in flds[-3:] ]
+        return (cls.normalize_dist_name(flds[0]), flds[1],
+                [ '-'.join((p, a, t)) for p in pys for a in abis for t in plats ])
+
+    @classmethod
+    def wheel_filename_of(cls, site_path:str, info_dir:str, version:str):
+        """
+        Wheel file name of an installed *.dist-info rebuilt from the tags in its WHEEL file
+        """
+        pys, abis, plats = [], [], []
+        try:
+            with open(os.path.join(site_path, info_dir, 'WHEEL'), encoding='utf-8') as fin:
+                for line in fin:
+                    if not line.startswith('Tag:'):
                         continue
-                    cnv_tbl.update(self.read_dict(fpthobj))
+                    tag = line.split(':', 1)[1].strip().split('-')
+                    if len(tag) != 3:
+                        continue
+                    for buf, x in zip((pys, abis, plats), tag):
+                        if x not in buf:
+                            buf.append(x)
+        except OSError:
+            return None
+        if not ( pys and abis and plats ):
+            return None
+        return '%s-%s-%s-%s-%s.whl' % (info_dir.removesuffix('.dist-info').rsplit('-', 1)[0], version,
+                                       '.'.join(pys), '.'.join(abis), '.'.join(plats))
 
-        if dependency_file is not None:
-            req_modules.update(self.read_dict(dependency_file))
-        else:
-            for subdir in [ os.path.join(self.datadir, 'python'),
-                            self.datadir, self.python_pip_path, self.python_path ]:
-                for suffix in suffixes:
-                    fpth = os.path.join(subdir, self.__class__.FILENAME_DEFAULT['____MODULE_REQUIRED_BASE__']+suffix)
-                    fpthobj = pathlib.Path(fpth)
-                    if ( ( not fpthobj.exists() ) or
-                         ( not fpthobj.is_file() ) or
-                         ( not os.access(fpthobj, os.R_OK)) ):
+    @classmethod
+    def file_sha256(cls, path:str):
+        import hashlib
+        hobj = hashlib.sha256()
+        with open(path, 'rb') as fin:
+            for chunk in iter(lambda: fin.read(1<<20), b''):
+                hobj.update(chunk)
+        return hobj.hexdigest()
+
+    def local_wheel_index(self):
+        """
+        Wheel files in the wheelhouse and in the wheel cache of pip (built from sdists):
+        {(normalized name, version): [path, ...]} (wheelhouse first)
+        """
+        buf = {}
+        for topdir in [ self.python_pip_wheelhouse, os.path.join(self.python_pip_cache, 'wheels') ]:
+            for dirpath, dirnames, filenames in os.walk(topdir):
+                dirnames.sort()
+                for fname in sorted(filenames):
+                    whl = self.__class__.parse_wheel_filename(fname)
+                    if whl is None:
                         continue
-                    req_modules.update(self.read_dict(fpthobj))
-        cnv_tbl.update(req_modules)
+                    buf.setdefault((whl[0], whl[1]), []).append(os.path.join(dirpath, fname))
+        return buf
+
+    def find_local_wheel(self, pkg:dict, wheels:dict):
+        """
+        Local wheel file of a lock entry: only wheels with a tag supported by the python in use,
+        same file name preferred (then the most specific tag), and sha256 checked if locked
+        """
+        tag_rank = { t: i for i, t in enumerate(self.supported_wheel_tags()) }
+        cands = []
+        for path in wheels.get((self.__class__.normalize_dist_name(pkg['name']), pkg['version']), []):
+            ranks = [ tag_rank[t] for t in self.__class__.parse_wheel_filename(os.path.basename(path))[2] if t in tag_rank ]
+            if ranks:
+                cands.append((os.path.basename(path) != pkg.get('wheel'), min(ranks), path))
+        for _flg, _rank, path in sorted(cands):
+            if pkg.get('sha256') and self.__class__.file_sha256(path) != pkg['sha256']:
+                continue
+            return path
+        return None
+
+    def make_lock(self, args:argparse.Namespace, rest:list=[]):
+        """
+        Write the lockfile of site-packages: name, version, wheel file name and its sha256 of
+        every installed distribution (or compare it with site-packages by -C/--check)
+        """
+        flg_verbose = args.verbose     if hasattr(args, 'verbose')     else self.verbose
+        flg_dry_run = args.dry_run     if hasattr(args, 'dry_run')     else self.dry_run
+        flg_fetch   = args.fetch_wheels if hasattr(args, 'fetch_wheels') else False
+        flg_check   = args.check       if hasattr(args, 'check')       else False
+        lock_path   = self.lock_file_path(args.lock_file if hasattr(args, 'lock_file') else None)
+        pip_args    = args.pip_subcommand_args if hasattr(args, 'pip_subcommand_args') else []
+
+        installed = self.dist_index(verbose=flg_verbose)
+
+        if flg_check:
+            try:
+                with open(lock_path, encoding='utf-8') as fin:
+                    locked = { self.__class__.normalize_dist_name(x['name']): x for x in json.load(fin).get('packages', []) }
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                self.stderr.write("Error: Can not read lockfile : %s : %s" % (lock_path, str(e)))
+                return 1
+            n_diff = 0
+            for key in sorted(set(locked.keys())|set(installed.keys())):
+                v_lock = locked[key]['version'] if key in locked else None
+                v_inst = installed[key]['version'] if key in installed else None
+                if v_lock == v_inst:
+                    continue
+                n_diff += 1
+                print("%-9s : %s (locked: %s, installed: %s)"
+                      % ('Missing' if v_inst is None else ( 'Extra' if v_lock is None else 'Mismatch' ),
+                         key, v_lock or '-', v_inst or '-'))
+            return 1 if n_diff > 0 else 0
+
+        pkgs = []
+        for key, ent in sorted(installed.items()):
+            if not ent['info_dir'].endswith('.dist-info'):
+                self.stderr.write("Warning: Not locked (not installed from wheel) : %s %s" % (ent['name'], ent['version']))
+                continue
+            pkgs.append({'name':    ent['name'],
+                         'version': ent['version'],
+                         'wheel':   self.__class__.wheel_filename_of(self.python_pip_path, ent['info_dir'], ent['version']),
+                         'sha256':  None})
+
+        wheels  = self.local_wheel_index()
+        missing = [ x for x in pkgs if self.find_local_wheel(x, wheels) is None ]
+        if flg_fetch and missing:
+            ret = self.run_pip(subcmd='wheel', args=['--no-deps'] + pip_args + rest + [ '%s==%s' % (x['name'], x['version']) for x in missing ],
+                               verbose=flg_verbose, dry_run=flg_dry_run)
+            if ret is not None and ret.returncode != 0:
+                self.stderr.write("Warning: Some wheels could not be fetched")
+            wheels = self.local_wheel_index()
+
+        for pkg in pkgs:
+            path = self.find_local_wheel(pkg, wheels)
+            if path is None:
+                if flg_verbose:
+                    self.stderr.write("No local wheel (locked without sha256) : %s %s" % (pkg['name'], pkg['version']))
+                continue
+            pkg['wheel']  = os.path.basename(path)
+            pkg['sha256'] = self.__class__.file_sha256(path)
+
+        lock_data = {'lock_version': self.__class__.LOCK_FORMAT_VERSION,
+                     'python':       self.python_vertion_str,
+                     'packages':     pkgs}
+        if flg_verbose or flg_dry_run:
+            self.stderr.write("Write lockfile (%d packages, %d with sha256) : %s"
+                              % (len(pkgs), len([ x for x in pkgs if x['sha256'] ]), lock_path))
+        if not flg_dry_run:
+            with open(lock_path, 'w', encoding='utf-8') as fout:
+                json.dump(lock_data, fout, indent=1)
+                fout.write("\n")
+        return 0
+
+    def install_from_lock(self, lock_path:str, pip_args:list=[], opts:argparse.Namespace=None,
+                          jobs:int=0, verbose=False, dry_run=False):
+        """
+        Install exactly the versions of the lockfile. Wheels found in the wheelhouse or in the
+        wheel cache of pip are verified by sha256 and unpacked in parallel without the resolver
+        of pip; the others are installed by 'pip install --no-deps' (with hashes if all are locked).
+        """
+        import tempfile
+        try:
+            with open(lock_path, encoding='utf-8') as fin:
+                lock_data = json.load(fin)
+            pkgs = [ x for x in lock_data.get('packages', []) if x.get('name') and x.get('version') ]
+        except (OSError, ValueError, AttributeError) as e:
+            self.stderr.write("Error: Can not read lockfile : %s : %s" % (lock_path, str(e)))
+            return 1
+
+        locked_pyver = str(lock_data.get('python', ''))
+        if locked_pyver.split('.')[:2] != self.python_vertion_str.split('.')[:2]:
+            self.stderr.write("Warning: Lockfile is made for python %s (using %s)" % (locked_pyver, self.python_vertion_str))
+
+        installed = self.dist_index(verbose=verbose)
+        flg_force = bool(set(pip_args) & set(self.__class__.PIP_REINSTALL_OPTIONS))
+        todo      = [ x for x in pkgs
+                      if flg_force or installed.get(self.__class__.normalize_dist_name(x['name']), {}).get('version') != x['version'] ]
+        locked    = set([ self.__class__.normalize_dist_name(x['name']) for x in pkgs ])
+        for key, ent in sorted(installed.items()):
+            if key not in locked:
+                self.stderr.write("Warning: Installed but not in lockfile : %s %s" % (ent['name'], ent['version']))
+
+        if len(todo)<1:
+            self.stderr.write("All locked packages are already installed : %s" % (lock_path, ))
+            return 0
+
+        wheels   = self.local_wheel_index()
+        native   = []
+        fallback = []
+        for pkg in todo:
+            path = self.find_local_wheel(pkg, wheels)
+            if path is None:
+                fallback.append(pkg)
+            else:
+                native.append((pkg, path))
+
+        if verbose or dry_run:
+            for pkg, path in native:
+                self.stderr.write("Unpack : %s %s : %s" % (pkg['name'], pkg['version'], path))
+            for pkg in fallback:
+                self.stderr.write("pip    : %s %s" % (pkg['name'], pkg['version']))
+
+        n_failed = 0
+        if native and not dry_run:
+            n_failed += self.install_wheels([ (path, installed.get(self.__class__.normalize_dist_name(pkg['name']), {}).get('info_dir'))
+                                              for pkg, path in native ], jobs=jobs, verbose=verbose)
+            if verbose:
+                self.stderr.write("Unpacked %d wheels into %s" % (len(native)-n_failed, self.python_pip_path))
+
+        if fallback:
+            req_lines = [ '%s==%s' % (x['name'], x['version']) for x in fallback ]
+            with tempfile.TemporaryDirectory() as tmpdir:
+                if all([ x.get('sha256') for x in fallback ]):
+                    req_path = os.path.join(tmpdir, 'requirements.txt')
+                    with open(req_path, 'w', encoding='utf-8') as fout:
+                        for line, pkg in zip(req_lines, fallback):
+                            fout.write("%s --hash=sha256:%s\n" % (line, pkg['sha256']))
+                    req_args = ['--require-hashes', '-r', req_path]
+                else:
+                    req_args = req_lines
+                ret = self.run_pip_install(['--no-deps', '--upgrade'] + [ x for x in pip_args if x not in self.__class__.PIP_REINSTALL_OPTIONS ]
+                                           + req_args, opts=opts, verbose=verbose, dry_run=dry_run)
+            if ret is not None and ret.returncode != 0:
+                n_failed += 1
+        elif native and not dry_run:
+            if self.auto_compile_enabled(opts=opts, pip_args=pip_args):
+                self.compile_bytecode(lib_script=False, site_packages=True,
+                                      invalidation_mode=(opts.invalidation_mode
+                                                         if hasattr(opts, 'invalidation_mode') else None),
+                                      report=verbose, verbose=verbose)
+            if self.shared_store:
+                self.store_link_site_packages(verbose=verbose)
+        return 1 if n_failed > 0 else 0
+
+    def installer_of(self, opts:argparse.Namespace=None):
+        installer = ( opts.installer if hasattr(opts, 'installer') else
+                      os.environ.get('PY_ENCASE_INSTALLER', self.__class__.INSTALLER_DEFAULT) )
+        if installer not in self.__class__.INSTALLERS:
+            self.stderr.write("Warning: Unknown installer: '%s' (Choose from %s) : use '%s'"
+                              % (installer, ', '.join(self.__class__.INSTALLERS), self.__class__.INSTALLER_DEFAULT))
+            installer = self.__class__.INSTALLER_DEFAULT
+        return installer
+
+    def supported_wheel_tags(self, verbose=False):
+        """
+        Wheel tags supported by the target python in the order of preference (packaging.tags
+        of pip in the target python), cached in var/cache/py-encase/wheel_tags.json keyed by its binary.
+        Only pure-python tags if they can not be fetched.
+        """
+        if self.wheel_tags_memo is not None:
+            return self.wheel_tags_memo
+
+        cache_path = os.path.join(self.vardir, 'cache', self.__class__.PIP_MODULE_NAME,
+                                  self.__class__.WHEEL_TAGS_CACHE_FILE)
+        key     = self.__class__.probe_cache_key(self.python_use)
+        entries = self.__class__.json_cache_read(cache_path)
+        tags    = entries.get(key) if key is not None else None
+        if not isinstance(tags, list):
+            if verbose:
+                self.stderr.write("Fetch the supported wheel tags from : %s" % (str(self.python_use), ))
+            try:
+                fetched = self.__class__.Tracer.run([str(self.python_use), '-c', self.__class__.WHEEL_TAGS_PROBE_SCRIPT],
+                                                    encoding=self.encoding, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                tags = json.loads(fetched.stdout) if fetched.returncode == 0 else None
+            except (OSError, ValueError):
+                tags = None
+            if isinstance(tags, list) and key is not None:
+                entries.pop(key, None)
+                entries[key] = tags
+                while len(entries) > self.__class__.PROBE_CACHE_MAX_ENTRIES:
+                    entries.pop(next(iter(entries)))
+                self.__class__.json_cache_write(cache_path, entries, indent=None)
+        if not isinstance(tags, list):
+            py_ver = self.python_vertion_str.split('.')
+            tags = [ '%s-none-any' % (x, ) for x in ( 'py%s%s' % (py_ver[0], py_ver[1]), 'py%s' % (py_ver[0], ) ) ]
+        self.wheel_tags_memo = tags
+        return self.wheel_tags_memo
+
+    @classmethod
+    def wheel_requires(cls, wheel_path:str):
+        """
+        Requires-Dist of a wheel file (METADATA in *.dist-info)
+        """
+        import zipfile
+        with zipfile.ZipFile(wheel_path) as zfile:
+            meta_name = [ x for x in zfile.namelist()
+                          if x.count('/') == 1 and x.endswith('.dist-info/METADATA') ][0]
+            meta_text = zfile.read(meta_name).decode('utf-8', errors='replace')
+        buf = []
+        for line in meta_text.splitlines():
+            if not line:
+                break
+            if line.lower().startswith('requires-dist:'):
+                buf.append(line.split(':', 1)[1].strip())
+        return buf
+
+    def install_wheels_native(self, pip_args:list, verbose=False, dry_run=False, **popen_kwargs):
+        """
+        'pip install' by the native installer: requirements (and their dependencies) resolved
+        to the local wheels of the wheelhouse or the wheel cache of pip are unpacked in parallel
+        (unpack_wheels()); the others (sdists, not found locally, extras) are passed to pip.
+        Returns subprocess.CompletedProcess, or None if the arguments need pip as a whole.
+        """
+        import zipfile
+        reqs        = []
+        pip_opts    = []
+        flg_nodeps  = False
+        flg_upgrade = False
+        flg_force   = False
+        args_iter   = iter(pip_args)
+        for x in args_iter:
+            if x == '--no-deps':
+                flg_nodeps = True
+            elif x in ('-U', '--upgrade'):
+                flg_upgrade = True
+            elif x == '--force-reinstall':
+                flg_force = True
+            elif x in ('--no-compile', '--compile'):
+                pass
+            elif x in ('-r', '--requirement'):
+                try:
+                    with open(next(args_iter), encoding=self.encoding) as fin:
+                        lines = [ l.split(' #', 1)[0].strip() for l in fin ]
+                except (StopIteration, OSError):
+                    return None
+                if [ l for l in lines if l.startswith('-') ]:
+                    return None
+                reqs.extend([ l for l in lines if l and not l.startswith('#') ])
+                continue
+            elif x.startswith('-'):
+                if verbose:
+                    self.stderr.write("Native installer: pip is used for option : %s" % (x, ))
+                return None
+            else:
+                reqs.append(x)
+                continue
+            pip_opts.append(x)
+
+        installed = self.dist_index(verbose=verbose)
+        wheels    = self.local_wheel_index()
+        tag_rank  = { t: i for i, t in enumerate(self.supported_wheel_tags(verbose=verbose)) }
+
+        def pick(name, specs):
+            best = None
+            for (n, v), paths in wheels.items():
+                if n != name or self.__class__.version_key(v) is None or not self.__class__.version_satisfies(v, specs):
+                    continue
+                for path in paths:
+                    ranks = [ tag_rank[t] for t in self.__class__.parse_wheel_filename(os.path.basename(path))[2] if t in tag_rank ]
+                    if not ranks:
+                        continue
+                    cand = (self.__class__.version_key(v), -min(ranks), v, path)
+                    if best is None or cand[:2] > best[:2]:
+                        best = cand
+            return None if best is None else (best[2], best[3])
+
+        plan = {} # normalized name -> (name, version, wheel path)
+
+        def resolve(req_text, is_root):
+            if os.path.isfile(req_text) and req_text.endswith('.whl'):
+                whl = self.__class__.parse_wheel_filename(os.path.basename(req_text))
+                if whl is None:
+                    return False
+                key, req = whl[0], {'name': whl[0], 'specs': [('==', whl[1])], 'marker': None}
+                found = (whl[1], os.path.abspath(req_text))
+            else:
+                req = self.__class__.parse_requirement(req_text)
+                if req is None or '[' in req_text.split(';', 1)[0]:
+                    return False
+                if req['marker'] and not self.marker_satisfied(req['marker']):
+                    return True
+                key   = self.__class__.normalize_dist_name(req['name'])
+                found = None
+            if key in plan:
+                return self.__class__.version_satisfies(plan[key][1], req['specs'])
+            inst = installed.get(key)
+            if ( inst is not None and self.__class__.version_satisfies(inst['version'], req['specs'])
+                 and not ( is_root and ( flg_upgrade or flg_force ) ) and found is None ):
+                return True
+            found = found if found is not None else pick(key, req['specs'])
+            if found is None:
+                return False
+            if inst is not None and inst['version'] == found[0] and not flg_force:
+                return True
+            plan[key] = (req['name'], found[0], found[1])
+            if flg_nodeps:
+                return True
+            try:
+                deps = self.__class__.wheel_requires(found[1])
+            except (OSError, IndexError, ValueError, zipfile.BadZipFile):
+                return False
+            return all([ resolve(x, False) for x in deps ])
+
+        pip_reqs = []
+        for req_text in reqs:
+            saved = dict(plan)
+            if not resolve(req_text, True):
+                plan.clear()
+                plan.update(saved)
+                pip_reqs.append(req_text)
+
+        if verbose or dry_run:
+            for key, (name, version, path) in sorted(plan.items()):
+                self.stderr.write("Native install : %s %s : %s" % (name, version, path))
+            if pip_reqs:
+                self.stderr.write("Native installer: pip is used for : %s" % (', '.join(pip_reqs), ))
+
+        n_failed = 0
+        if plan and not dry_run:
+            n_failed += self.install_wheels([ (x[2], installed.get(key, {}).get('info_dir')) for key, x in plan.items() ],
+                                            verbose=verbose)
+            if verbose:
+                self.stderr.write("Native installer: %d wheels unpacked into %s" % (len(plan)-n_failed, self.python_pip_path))
+        elif len(plan)<1 and len(pip_reqs)<1:
+            self.stderr.write("Requirement already satisfied : %s" % (', '.join(reqs), ))
+
+        ret = None
+        if pip_reqs:
+            ret = self.run_pip(subcmd='install', args=pip_opts + pip_reqs,
+                               verbose=verbose, dry_run=dry_run, **popen_kwargs)
+        returncode = max(1 if n_failed > 0 else 0, ret.returncode if ret is not None else 0)
+        return subprocess.CompletedProcess(args=['native-install'] + list(pip_args), returncode=returncode)
+
+    def remove_installed_dist(self, info_dir:str, verbose=False, dry_run=False):
+        """
+        Uninstall a distribution from site-packages by the files listed in its RECORD
+        """
+        import csv
+        site_path = self.python_pip_path
+        info_path = os.path.join(site_path, info_dir)
+        if verbose or dry_run:
+            self.stderr.write("Remove installed : %s" % (info_path, ))
+        if dry_run:
+            return
+        dirs = set()
+        try:
+            with open(os.path.join(info_path, 'RECORD'), encoding='utf-8', newline='') as fin:
+                rows = list(csv.reader(fin))
+        except OSError:
+            rows = []
+        for row in rows:
+            relpath = os.path.normpath(row[0]) if row and row[0] else ''
+            if ( not relpath ) or os.path.isabs(relpath) or relpath.split(os.sep)[0] == '..':
+                continue
+            path = os.path.join(site_path, relpath)
+            try:
+                os.unlink(path)
+                if path.endswith('.py'):
+                    cdir = os.path.join(os.path.dirname(path), '__pycache__')
+                    for pyc in ( os.listdir(cdir) if os.path.isdir(cdir) else [] ):
+                        if pyc.startswith(os.path.basename(path)[:-3]+'.'):
+                            os.unlink(os.path.join(cdir, pyc))
+                    dirs.add(cdir)
+            except OSError:
+                pass
+            dirs.add(os.path.dirname(path))
+        shutil.rmtree(info_path, ignore_errors=True)
+        for dpath in sorted(dirs, key=len, reverse=True):
+            while dpath.startswith(site_path+os.sep):
+                try:
+                    os.rmdir(dpath)
+                except OSError:
+                    break
+                dpath = os.path.dirname(dpath)
+
+    def install_wheels(self, wheels:list, jobs:int=0, verbose=False):
+        """
+        Install wheels of [(wheel path, *.dist-info name of the installed version or None)] into
+        site-packages: they are unpacked into a staging directory first, and the installed
+        version is removed only after its replacement is unpacked successfully, then the
+        staged files are moved into place. Returns the number of failed wheels.
+        """
+        import tempfile
+        import csv
+        site_path = self.python_pip_path
+        os.makedirs(site_path, exist_ok=True)
+        # Staging directory in site-packages itself to move the files by os.replace() (same file system)
+        stage_path = tempfile.mkdtemp(prefix='.py-encase-stage-', dir=site_path)
+        n_failed   = 0
+        try:
+            results = self.__class__.unpack_wheels([ path for path, old in wheels ], stage_path,
+                                                   jobs=jobs, python_exec=str(self.python_use.absolute()))
+            for path, old in wheels:
+                res = results.get(path)
+                if isinstance(res, Exception) or res is None:
+                    n_failed += 1
+                    self.stderr.write("Error: Failed to unpack : %s : %s" % (path, str(res)))
+                    continue
+                if old is not None:
+                    self.remove_installed_dist(old, verbose=verbose)
+                with open(os.path.join(stage_path, res, 'RECORD'), encoding='utf-8', newline='') as fin:
+                    relpaths = [ os.path.normpath(row[0]) for row in csv.reader(fin) if row and row[0] ]
+                for relpath in relpaths:
+                    dst = os.path.join(site_path, relpath)
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    if os.path.isdir(dst) and not os.path.islink(dst):
+                        shutil.rmtree(dst)
+                    os.replace(os.path.join(stage_path, relpath), dst)
+        finally:
+            shutil.rmtree(stage_path, ignore_errors=True)
+            self.dist_index_memo = None
+        return n_failed
+
+    @classmethod
+    def unpack_wheels(cls, wheel_paths:list, site_path:str, jobs:int=0, python_exec:str=None):
+        """
+        Unpack wheels concurrently by unpack_wheel(): {wheel path: *.dist-info name or exception}
+        (zlib and file I/O release GIL, so threads are enough)
+        """
+        import concurrent.futures
+        results = {}
+        if len(wheel_paths)<1:
+            return results
+        n_jobs = jobs if jobs > 0 else min(len(wheel_paths), os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            futures = { executor.submit(cls.unpack_wheel, path, site_path, python_exec=python_exec): path
+                        for path in wheel_paths }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+        return results
+
+    @classmethod
+    def unpack_wheel(cls, wheel_path:str, site_path:str, python_exec:str=None, installer:str=None):
+        """
+        Unpack a wheel into a --target style site-packages: *.data/{purelib,platlib,data} to
+        the top, scripts to bin/, headers to include/<name>/. RECORD is rewritten for the
+        installed paths and INSTALLER is written. With python_exec, console scripts of
+        entry_points.txt are generated into bin/ (looked up by run_script()).
+        Returns *.dist-info directory name.
+        """
+        import zipfile
+        import hashlib
+        import base64
+        import csv
+        import configparser
+
+        def record_hash(digest):
+            return 'sha256='+base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+
+        with zipfile.ZipFile(wheel_path) as zfile:
+            names    = zfile.namelist()
+            info_dir = [ x.split('/')[0] for x in names
+                         if x.count('/') == 1 and x.endswith('/WHEEL') and x.split('/')[0].endswith('.dist-info') ][0]
+            data_dir = info_dir.removesuffix('.dist-info')+'.data'
+            records  = []
+            made_dirs = set()
+            for zinfo in zfile.infolist():
+                if zinfo.is_dir():
+                    continue
+                parts = zinfo.filename.split('/')
+                flg_script = False
+                if parts[0] == data_dir:
+                    if len(parts) < 3:
+                        continue
+                    if parts[1] in ('purelib', 'platlib', 'data'):
+                        parts = parts[2:]
+                    elif parts[1] == 'scripts':
+                        parts = ['bin'] + parts[2:]
+                        flg_script = True
+                    elif parts[1] == 'headers':
+                        parts = ['include', info_dir.removesuffix('.dist-info').rsplit('-', 1)[0]] + parts[2:]
+                    else:
+                        continue
+                relpath = os.path.normpath(os.path.join(*parts))
+                if os.path.isabs(relpath) or relpath.split(os.sep)[0] == '..':
+                    raise ValueError("Invalid path in wheel: %s" % (zinfo.filename, ))
+                if relpath == os.path.join(info_dir, 'RECORD'):
+                    continue
+                dst = os.path.join(site_path, relpath)
+                if os.path.dirname(dst) not in made_dirs:
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    made_dirs.add(os.path.dirname(dst))
+                try:
+                    fout = open(dst, 'xb')
+                except FileExistsError:
+                    # Never write into existing inode (it may be hard-linked to the shared store)
+                    os.unlink(dst)
+                    fout = open(dst, 'xb')
+                hobj = hashlib.sha256()
+                size = 0
+                with zfile.open(zinfo) as fin, fout:
+                    head = True
+                    for chunk in iter(lambda: fin.read(1<<20), b''):
+                        if head and flg_script and python_exec and re.match(rb'#!python(\s|$)', chunk):
+                            chunk = b'#!'+python_exec.encode('utf-8')+chunk[len(b'#!python'):]
+                        head = False
+                        hobj.update(chunk)
+                        size += len(chunk)
+                        fout.write(chunk)
+                mode = (zinfo.external_attr >> 16) & 0o777
+                if flg_script or ( mode & 0o111 ):
+                    os.chmod(dst, 0o755)
+                records.append((relpath, record_hash(hobj.digest()), size))
+
+        def write_file(relpath, content, mode=None):
+            dst = os.path.join(site_path, relpath)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            with open(dst, 'wb') as fout:
+                fout.write(content)
+            if mode is not None:
+                os.chmod(dst, mode)
+            records[:] = [ x for x in records if x[0] != relpath ]
+            records.append((relpath, record_hash(hashlib.sha256(content).digest()), len(content)))
+
+        entry_points = os.path.join(site_path, info_dir, 'entry_points.txt')
+        if python_exec and os.path.isfile(entry_points):
+            cnfgpsr = configparser.ConfigParser(delimiters=('=',), interpolation=None)
+            cnfgpsr.optionxform = str
+            cnfgpsr.read(entry_points, encoding='utf-8')
+            for section in ('console_scripts', 'gui_scripts'):
+                if not cnfgpsr.has_section(section):
+                    continue
+                for script_name, ref in cnfgpsr.items(section):
+                    module, _, attr = ref.split('[', 1)[0].strip().partition(':')
+                    if not ( module and attr ) or '/' in script_name:
+                        continue
+                    write_file(os.path.join('bin', script_name.strip()),
+                               (cls.CONSOLE_SCRIPT_TEMPLATE % {'python':      python_exec,
+                                                               'module':      module.strip(),
+                                                               'import_name': attr.strip().split('.')[0],
+                                                               'func':        attr.strip()}).encode('utf-8'), mode=0o755)
+
+        write_file(os.path.join(info_dir, 'INSTALLER'),
+                   ((installer if installer else cls.WHEEL_INSTALLER_NAME)+"\n").encode('utf-8'))
+        with open(os.path.join(site_path, info_dir, 'RECORD'), 'w', encoding='utf-8', newline='') as fout:
+            wrtr = csv.writer(fout, lineterminator="\n")
+            for relpath, digest, size in records:
+                wrtr.writerow((relpath.replace(os.sep, '/'), digest, size))
+            wrtr.writerow((os.path.join(info_dir, 'RECORD').replace(os.sep, '/'), '', ''))
+        return info_dir
+
+    def site_generation_dirs(self):
+        """
+        Generations of site-packages for the python version: [(generation, path)] sorted
+        by generation ('<version>@<generation>' next to python_pip_path)
+        """
+        base = os.path.basename(self.python_pip_path)+self.__class__.SITE_GENERATION_SEP
+        pdir = os.path.dirname(self.python_pip_path)
+        buf  = []
+        for x in ( os.listdir(pdir) if os.path.isdir(pdir) else [] ):
+            if x.startswith(base) and x[len(base):].isdigit() and os.path.isdir(os.path.join(pdir, x)):
+                buf.append((int(x[len(base):]), os.path.join(pdir, x)))
+        return sorted(buf)
+
+    def site_generation_current(self):
+        """
+        Active generation (python_pip_path is a symbolic link to it), or None if not generational
+        """
+        if not os.path.islink(self.python_pip_path):
+            return None
+        target = os.readlink(self.python_pip_path)
+        gen    = target.rsplit(self.__class__.SITE_GENERATION_SEP, 1)[-1]
+        return int(gen) if gen.isdigit() else None
+
+    def site_generation_switch(self, gen:int, verbose=False, dry_run=False):
+        """
+        Point python_pip_path to a generation by replacing the symbolic link atomically
+        """
+        target = os.path.basename(self.python_pip_path)+self.__class__.SITE_GENERATION_SEP+str(gen)
+        if verbose or dry_run:
+            self.stderr.write("Activate generation %d : %s -> %s" % (gen, self.python_pip_path, target))
+        if dry_run:
+            return
+        tmp_link = "%s.%d.tmp" % (self.python_pip_path, os.getpid())
+        os.symlink(target, tmp_link)
+        os.replace(tmp_link, self.python_pip_path)
+        self.dist_index_memo = None
+
+    def site_generation_create(self, verbose=False):
+        """
+        New generation directory cloned from the active one by hard links (unchanged packages
+        cost no copying; installers replace files, never write into them). Returns (generation, path).
+        """
+        src_path = os.path.realpath(self.python_pip_path)
+        gens     = self.site_generation_dirs()
+        gen      = gens[-1][0]+1 if gens else 1
+        while True:
+            new_path = os.path.join(os.path.dirname(self.python_pip_path),
+                                    os.path.basename(self.python_pip_path)+self.__class__.SITE_GENERATION_SEP+str(gen))
+            try:
+                os.mkdir(new_path)
+                break
+            except FileExistsError:
+                gen += 1
+        for dirpath, dirnames, filenames in os.walk(src_path):
+            dst_dir = os.path.join(new_path, os.path.relpath(dirpath, src_path))
+            for x in list(dirnames):
+                if os.path.islink(os.path.join(dirpath, x)):
+                    dirnames.remove(x)
+                    filenames.append(x)
+                else:
+                    os.mkdir(os.path.join(dst_dir, x))
+            for x in filenames:
+                src = os.path.join(dirpath, x)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), os.path.join(dst_dir, x))
+                else:
+                    os.link(src, os.path.join(dst_dir, x))
+        if verbose:
+            self.stderr.write("New generation %d (cloned from %s) : %s" % (gen, os.path.basename(src_path), new_path))
+        return gen, new_path
+
+    def run_in_site_generation(self, func, verbose=False, dry_run=False):
+        """
+        Run an installation (func() returning subprocess.CompletedProcess, int or None) into a
+        new generation of site-packages, and activate it only if it succeeded. Scripts running
+        meanwhile keep importing from the previous generation. Nothing special if site-packages
+        is not generational (see 'generations enable') or in a generation already.
+        """
+        if dry_run or self.site_generation_active or self.site_generation_current() is None:
+            return func()
+        cur_path = self.python_pip_path
+        gen, new_path = self.site_generation_create(verbose=verbose)
+        self.python_pip_path      = new_path
+        self.dist_index_memo      = None
+        self.site_generation_active = True
+        try:
+            ret = func()
+        except BaseException:
+            self.stderr.write("Discard generation %d : %s" % (gen, new_path))
+            shutil.rmtree(new_path, ignore_errors=True)
+            raise
+        finally:
+            self.python_pip_path      = cur_path
+            self.dist_index_memo      = None
+            self.site_generation_active = False
+
+        if self.__class__.exit_status(ret) == 0:
+            self.site_generation_switch(gen, verbose=verbose)
+        else:
+            self.stderr.write("Discard generation %d (installation failed) : %s" % (gen, new_path))
+            shutil.rmtree(new_path, ignore_errors=True)
+        return ret
+
+    def manage_generations(self, args:argparse.Namespace, rest:list=[]):
+        flg_verbose = args.verbose if hasattr(args, 'verbose') else self.verbose
+        flg_dry_run = args.dry_run if hasattr(args, 'dry_run') else self.dry_run
+        gen_cmd     = args.generations_command if hasattr(args, 'generations_command') and args.generations_command else 'list'
+        n_keep      = args.keep if hasattr(args, 'keep') and args.keep is not None else self.__class__.SITE_GENERATION_KEEP
+
+        current = self.site_generation_current()
+        gens    = self.site_generation_dirs()
+
+        if gen_cmd == 'list':
+            if current is None:
+                self.stderr.write("site-packages is not generational ('generations enable' to start) : %s" % (self.python_pip_path, ))
+            for gen, path in gens:
+                n_dists = len([ x for x in os.listdir(path) if x.endswith('.dist-info') or x.endswith('.egg-info') ])
+                print("%s %4d  %s  %4d packages  %s" % ('*' if gen == current else ' ', gen,
+                                                         time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.stat(path).st_mtime)),
+                                                         n_dists, path))
+            return 0
+
+        if gen_cmd == 'enable':
+            if current is not None:
+                self.stderr.write("Already generational (generation %d) : %s" % (current, self.python_pip_path))
+                return 0
+            gen      = gens[-1][0]+1 if gens else 1
+            new_path = self.python_pip_path+self.__class__.SITE_GENERATION_SEP+str(gen)
+            if flg_verbose or flg_dry_run:
+                self.stderr.write("Move to generation %d : %s -> %s" % (gen, self.python_pip_path, new_path))
+            if not flg_dry_run:
+                if os.path.isdir(self.python_pip_path):
+                    os.rename(self.python_pip_path, new_path)
+                else:
+                    os.makedirs(new_path)
+            self.site_generation_switch(gen, verbose=flg_verbose, dry_run=flg_dry_run)
+            return 0
+
+        if gen_cmd == 'disable':
+            if current is None:
+                self.stderr.write("Not generational : %s" % (self.python_pip_path, ))
+                return 0
+            cur_path = os.path.realpath(self.python_pip_path)
+            if flg_verbose or flg_dry_run:
+                self.stderr.write("Move generation %d back : %s -> %s" % (current, cur_path, self.python_pip_path))
+            if not flg_dry_run:
+                os.unlink(self.python_pip_path)
+                os.rename(cur_path, self.python_pip_path)
+            return 0
+
+        # gc: keep the active one and the newest n_keep generations
+        keep = set([ x for x,p in gens[-n_keep:] ] if n_keep > 0 else []) | set([current])
+        for gen, path in gens:
+            if gen in keep:
+                continue
+            if flg_verbose or flg_dry_run:
+                self.stderr.write("Remove generation %d : %s" % (gen, path))
+            if not flg_dry_run:
+                shutil.rmtree(path, ignore_errors=True)
+        return 0
+
+    def rollback_generation(self, args:argparse.Namespace, rest:list=[]):
+        flg_verbose = args.verbose    if hasattr(args, 'verbose')    else self.verbose
+        flg_dry_run = args.dry_run    if hasattr(args, 'dry_run')    else self.dry_run
+        gen         = args.generation if hasattr(args, 'generation') else None
+
+        current = self.site_generation_current()
+        if current is None:
+            self.stderr.write("Error: site-packages is not generational : %s" % (self.python_pip_path, ))
+            return 1
+        gens = [ x for x,p in self.site_generation_dirs() ]
+        if gen is None:
+            older = [ x for x in gens if x < current ]
+            if len(older)<1:
+                self.stderr.write("Error: No generation older than %d" % (current, ))
+                return 1
+            gen = older[-1]
+        elif gen not in gens:
+            self.stderr.write("Error: Generation not found : %d (Existing: %s)" % (gen, ', '.join([ str(x) for x in gens ])))
+            return 1
+        self.site_generation_switch(gen, verbose=flg_verbose, dry_run=flg_dry_run)
+        return 0
+
+    def fleet_prefix_list(self, prefix_files:list=[], globs:list=[]):
+        """
+        Prefixes given by files (one path or glob pattern per line, '#' for comments)
+        and glob patterns, in the given order without duplicates
+        """
+        import glob
+        patterns = []
+        for fpath in prefix_files:
+            with open(fpath, encoding=self.encoding) as fin:
+                patterns.extend([ x.split('#', 1)[0].strip() for x in fin ])
+        patterns.extend(globs)
+
+        buf = []
+        for pat in [ os.path.expanduser(x) for x in patterns if x ]:
+            matched = sorted(glob.glob(pat)) if glob.has_magic(pat) else [ pat ]
+            for x in matched:
+                x = os.path.realpath(x)
+                if x not in buf:
+                    buf.append(x)
+        return buf
+
+    def fleet_command_args(self, prefix:str, fleet_cmd:list, use_current=False):
+        """
+        Command to run a manage subcommand for a prefix: bin/mng_encase of the prefix itself,
+        or the entity file running now (with --manage --prefix) if it has none or use_current is True
+        """
+        mng_path = os.path.join(prefix, 'bin', self.__class__.MNG_SCRIPT)
+        if ( not use_current ) and os.path.isfile(mng_path) and os.access(mng_path, os.X_OK):
+            return [ mng_path ] + fleet_cmd
+        return ( [ str(self.python_use), str(self.__class__.ENTITY_PATH),
+                   self.__class__.MNG_OPT, '--prefix', prefix ] + fleet_cmd )
+
+    def run_logged_commands(self, jobs:list, n_workers:int, columns:list, timeout:float=None):
+        """
+        Run command lines concurrently by a bounded thread pool (each in its own process, with
+        stdout/stderr into its own log file), show the progress and a summary table.
+        jobs: [(name for the progress, [cells of columns], command line, log path, cwd)].
+        A job whose cwd does not exist is reported as 'missing'. Returns the number of failures.
+        """
+        import concurrent.futures
+
+        def run_one(cmd_args, log_path, cwd):
+            t_start = time.perf_counter()
+            if cwd is not None and not os.path.isdir(cwd):
+                return ('missing', None, 0.0, None)
+            try:
+                with open(log_path, 'w', encoding=self.encoding) as fout:
+                    fout.write("# %s\n" % (" ".join(cmd_args), ))
+                    fout.flush()
+                    proc = self.__class__.Tracer.run(cmd_args, stdin=subprocess.DEVNULL, stdout=fout,
+                                                     stderr=subprocess.STDOUT, timeout=timeout, cwd=cwd)
+                status = 'ok' if proc.returncode == 0 else 'failed'
+                return (status, proc.returncode, time.perf_counter()-t_start, log_path)
+            except subprocess.TimeoutExpired:
+                return ('timeout', None, time.perf_counter()-t_start, log_path)
+            except OSError as e:
+                return ('error: '+str(e), None, time.perf_counter()-t_start, log_path)
+
+        results = [None] * len(jobs)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(n_workers, 1)) as executor:
+            futures = { executor.submit(run_one, *job[2:]): i for i, job in enumerate(jobs) }
+            for i_done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                i_job = futures[future]
+                results[i_job] = future.result()
+                self.stderr.write("[%d/%d] %-8s %8.2f sec : %s"
+                                  % (i_done, len(jobs), results[i_job][0], results[i_job][2], jobs[i_job][0]))
+
+        n_failed = 0
+        widths   = [ max([ len(str(job[1][i])) for job in jobs ] + [len(x)]) for i, x in enumerate(columns) ]
+        print("  ".join([ "%-*s" % (w, x) for w, x in zip(widths, columns) ])
+              + "  %-8s %6s %10s  %s" % ('STATUS', 'RC', 'TIME[s]', 'LOG'))
+        for job, (status, retcode, elapsed, log_path) in zip(jobs, results):
+            if status != 'ok':
+                n_failed += 1
+            print("  ".join([ "%-*s" % (w, x) for w, x in zip(widths, job[1]) ])
+                  + "  %-8s %6s %10.2f  %s" % (status, '-' if retcode is None else retcode,
+                                               elapsed, log_path if log_path else '-'))
+        print("Total: %d, OK: %d, Failed: %d" % (len(jobs), len(jobs)-n_failed, n_failed))
+        return n_failed
+
+    def run_fleet(self, args:argparse.Namespace, rest:list=[]):
+        """
+        Run a manage subcommand over many prefixes with a bounded worker pool. Each prefix runs
+        in its own process, so the python/pip/prefix state of one is never seen by the others.
+        """
+        import hashlib
+        import datetime
+        flg_verbose  = args.verbose      if hasattr(args, 'verbose')      else self.verbose
+        flg_dry_run  = args.dry_run      if hasattr(args, 'dry_run')      else self.dry_run
+        prefix_files = args.prefix_file  if hasattr(args, 'prefix_file') and args.prefix_file else []
+        globs        = args.glob         if hasattr(args, 'glob')        and args.glob        else []
+        n_jobs       = args.jobs         if hasattr(args, 'jobs')         else 0
+        timeout      = args.timeout      if hasattr(args, 'timeout')      else None
+        log_dir      = args.log_dir      if hasattr(args, 'log_dir')      else None
+        use_current  = args.use_current  if hasattr(args, 'use_current')  else False
+        fleet_cmd    = list(args.fleet_command) if hasattr(args, 'fleet_command') else []
+
+        if fleet_cmd and fleet_cmd[0] == '--':
+            fleet_cmd = fleet_cmd[1:]
+        fleet_cmd.extend(rest)
+        if len(fleet_cmd)<1:
+            self.stderr.write("fleet: No subcommand is given (e.g. fleet -g '/srv/*' -- install_deps)")
+            return 1
+        if fleet_cmd[0] == 'fleet':
+            self.stderr.write("fleet: Nested fleet is not supported")
+            return 1
+
+        prefixes = self.fleet_prefix_list(prefix_files=prefix_files, globs=globs)
+        if len(prefixes)<1:
+            self.stderr.write("fleet: No prefix is given (use -f/--prefix-file or -g/--glob)")
+            return 1
+
+        if n_jobs is None or n_jobs <= 0:
+            n_jobs = min(len(prefixes), os.cpu_count() or 1, self.__class__.FLEET_MAX_WORKERS)
+
+        if log_dir is None:
+            log_dir = os.path.join(self.logdir, 'fleet', datetime.datetime.now().strftime('%Y%m%d-%H%M%S'))
+
+        def log_path_of(prefix):
+            # Digest of the path keeps the names of e.g. /srv/a_b and /srv/a/b apart
+            return os.path.join(log_dir, '%s-%s.log' % (re.sub(r'[^A-Za-z0-9._-]+', '_', prefix.strip(os.sep)),
+                                                        hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:8]))
+
+        if flg_dry_run:
+            for prefix in prefixes:
+                self.stderr.write("Exec: '%s' > %s" % (" ".join(self.fleet_command_args(prefix, fleet_cmd, use_current)),
+                                                       log_path_of(prefix)))
+            return 0
+
+        os.makedirs(log_dir, exist_ok=True)
+
+        if flg_verbose:
+            self.stderr.write("fleet: '%s' on %d prefixes (workers: %d, log: %s)"
+                              % (" ".join(fleet_cmd), len(prefixes), n_jobs, log_dir))
+
+        n_failed = self.run_logged_commands([ (x, [x], self.fleet_command_args(x, fleet_cmd, use_current),
+                                               log_path_of(x), x) for x in prefixes ],
+                                            n_workers=n_jobs, columns=['PREFIX'], timeout=timeout)
+        return 1 if n_failed > 0 else 0
+
+    def python_matrix_of(self, opts:argparse.Namespace=None):
+        """
+        Interpreters of --python-matrix (or PY_ENCASE_PYTHON_MATRIX): comma-separated string or list
+        """
+        matrix = ( opts.python_matrix if hasattr(opts, 'python_matrix') else
+                   os.environ.get('PY_ENCASE_PYTHON_MATRIX', '') )
+        if isinstance(matrix, str):
+            matrix = matrix.split(',')
+        return [ x.strip() for x in matrix if isinstance(x, str) and x.strip() ]
+
+    @classmethod
+    def strip_cli_option(cls, argv:list, option:str):
+        """
+        Command line without the occurrences of an option with a value ('--opt VAL', '--opt=VAL'),
+        arguments after '--' are kept as is
+        """
+        buf = []
+        i   = 0
+        while i < len(argv):
+            if argv[i] == '--':
+                buf.extend(argv[i:])
+                break
+            if argv[i] == option:
+                i += 2
+                continue
+            if not argv[i].startswith(option+'='):
+                buf.append(argv[i])
+            i += 1
+        return buf
+
+    def run_python_matrix(self, pythons:list, subcmd_argv:list, verbose=False, dry_run=False):
+        """
+        Run a manage subcommand for each interpreter concurrently (one worker per interpreter), each
+        in its own process with --python/--pip of the interpreter, so that site-packages/<version>
+        of the versions are populated at the same time. Per-version logs and a summary are shown.
+        """
+        import datetime
+
+        targets = [] # (python command, PyEncase for it)
+        for python_cmd in pythons:
+            if shutil.which(python_cmd) is None:
+                self.stderr.write("Error: Python is not found : '%s'" % (python_cmd, ))
+                return 1
+            pycan = self.python_for(python_cmd)
+            dup   = [ x for x,p in targets if p.python_vertion_str == pycan.python_vertion_str ]
+            if dup:
+                # Same site-packages/<version> must not be populated by two processes
+                self.stderr.write("Warning: Skip '%s' : same version (%s) as '%s'"
+                                  % (python_cmd, pycan.python_vertion_str, dup[0]))
+                continue
+            targets.append((python_cmd, pycan))
+
+        subcmd_argv = self.__class__.strip_cli_option(subcmd_argv, '--python-matrix')
+        # Explicit empty matrix for the children not to take it again from config/environment
+        subcmd_argv = subcmd_argv[:1] + ['--python-matrix='] + subcmd_argv[1:]
+        global_argv = ( getattr(self, 'manage_config_argv', [])
+                        + ( ['--verbose'] if verbose else [] )
+                        + ( ['--offline'] if self.pip_offline else [] )
+                        + ( ['--shared-store'] if self.shared_store else [] )
+                        + ( ['--pip-worker'] if self.pip_worker else [] ) )
+        log_dir = os.path.join(self.logdir, 'matrix', datetime.datetime.now().strftime('%Y%m%d-%H%M%S'))
+
+        def command_args(python_cmd, pycan, extra_argv=[]):
+            return ( [ str(pycan.python_use), str(self.__class__.ENTITY_PATH), self.__class__.MNG_OPT,
+                       '--prefix', self.prefix, '--python', str(pycan.python_use), '--pip', str(pycan.pip_use) ]
+                     + global_argv + extra_argv + subcmd_argv )
+
+        def log_path_of(pycan):
+            return os.path.join(log_dir, 'python%s.log' % (pycan.python_vertion_str, ))
+
+        if dry_run:
+            for python_cmd, pycan in targets:
+                self.stderr.write("Exec: '%s' > %s" % (" ".join(command_args(python_cmd, pycan, ['--dry-run'])),
+                                                       log_path_of(pycan)))
+            return 0
+
+        os.makedirs(log_dir, exist_ok=True)
+
+        if verbose:
+            self.stderr.write("python matrix: '%s' for %s (log: %s)"
+                              % (" ".join(subcmd_argv), ', '.join([ p.python_vertion_str for x,p in targets ]), log_dir))
+
+        n_failed = self.run_logged_commands([ ('python '+p.python_vertion_str, [x, p.python_vertion_str],
+                                               command_args(x, p), log_path_of(p), None) for x,p in targets ],
+                                            n_workers=len(targets), columns=['PYTHON', 'VERSION'])
+        return 1 if n_failed > 0 else 0
+
+    def shared_store_path(self):
+        """
+        Directory of the content-addressed package store shared by the prefixes on the host:
+        $PY_ENCASE_STORE_DIR or $XDG_DATA_HOME/py-encase/store (~/.local/share/py-encase/store)
+        """
+        if os.environ.get('PY_ENCASE_STORE_DIR'):
+            return os.path.abspath(os.path.expanduser(os.environ['PY_ENCASE_STORE_DIR']))
+        data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        return os.path.join(data_home, self.__class__.PIP_MODULE_NAME, self.__class__.SHARED_STORE_SUBDIR)
+
+    @classmethod
+    def store_entry_key(cls, site_path:str, info_dir:str):
+        """
+        Store entry name '<dist>-<version>-<hash>' of an installed *.dist-info and its files
+        (relative to site-packages). The hash is taken from RECORD, which holds the sha256 of
+        every file, so that equal keys mean equal contents.
+        """
+        import hashlib
+        try:
+            with open(os.path.join(site_path, info_dir, 'RECORD'), encoding='utf-8') as fin:
+                rec_lines = fin.read().splitlines()
+        except OSError:
+            return None, []
+        files   = []
+        hashsrc = []
+        for line in rec_lines:
+            relpath = os.path.normpath(line.split(',', 1)[0]) if line else ''
+            if ( ( not relpath ) or os.path.isabs(relpath) or relpath.split(os.sep)[0] == '..'
+                 or relpath.endswith('.pyc') ):
+                continue
+            files.append(relpath)
+            if relpath != os.path.join(info_dir, 'RECORD'):
+                hashsrc.append(line)
+        if len(files)<1:
+            return None, []
+        digest = hashlib.sha256("\n".join(sorted(hashsrc)).encode('utf-8')).hexdigest()[:16]
+        name, version = info_dir.removesuffix('.dist-info').rsplit('-', 1) if '-' in info_dir else (info_dir, '')
+        return '%s-%s-%s' % (cls.normalize_dist_name(name).replace('-', '_'), version, digest), files
+
+    def store_site_identity(self, site_path:str):
+        """
+        site-packages a store reference belongs to: the generations of a prefix
+        ('<version>@<generation>') count as its site-packages '<version>'
+        """
+        site_path = os.path.abspath(site_path)
+        base, sep, gen = os.path.basename(site_path).rpartition(self.__class__.SITE_GENERATION_SEP)
+        return os.path.join(os.path.dirname(site_path), base) if sep and gen.isdigit() else site_path
+
+    @classmethod
+    def store_ref_path(cls, store_path:str, key:str, identity:str):
+        import hashlib
+        return os.path.join(store_path, cls.SHARED_STORE_REFS_DIR, key,
+                            hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16])
+
+    @classmethod
+    def same_inode(cls, path1:str, path2:str):
+        try:
+            st1 = os.stat(path1)
+            st2 = os.stat(path2)
+        except OSError:
+            return False
+        return st1.st_ino == st2.st_ino and st1.st_dev == st2.st_dev
+
+    def store_register_ref(self, store_path:str, key:str, site_path:str):
+        """ Record that site_path (by its identity) links to the store entry key """
+        identity = self.store_site_identity(site_path)
+        ref_path = self.__class__.store_ref_path(store_path, key, identity)
+        try:
+            if os.path.isfile(ref_path):
+                return
+            os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+            with open(ref_path, 'w', encoding='utf-8') as fout:
+                fout.write(identity+"\n")
+        except OSError as e:
+            self.stderr.write("Warning: Failed to record the reference to store entry : %s : %s" % (key, str(e)))
+
+    def store_entry_refs(self, entry:str):
+        """
+        References of a store entry: ([live ref files], [stale ref files]). A reference is
+        live while its site-packages (or one of its generations) still has the RECORD of
+        the entry, i.e. the same inode: membership is never guessed from link counts,
+        which also count the hard-linked clones of generations and unrelated links.
+        """
+        store_path = os.path.dirname(entry)
+        refs_dir   = os.path.join(store_path, self.__class__.SHARED_STORE_REFS_DIR, os.path.basename(entry))
+        info_dirs  = [ x for x in os.listdir(entry) if x.endswith('.dist-info') ] if os.path.isdir(entry) else []
+        live  = []
+        stale = []
+        for x in ( sorted(os.listdir(refs_dir)) if os.path.isdir(refs_dir) else [] ):
+            ref_path = os.path.join(refs_dir, x)
+            try:
+                with open(ref_path, encoding='utf-8') as fin:
+                    identity = fin.read().strip()
+            except OSError:
+                continue
+            sites = [identity]
+            pdir  = os.path.dirname(identity)
+            base  = os.path.basename(identity)+self.__class__.SITE_GENERATION_SEP
+            if os.path.isdir(pdir):
+                sites.extend([ os.path.join(pdir, y) for y in os.listdir(pdir)
+                               if y.startswith(base) and y[len(base):].isdigit() ])
+            if any([ self.__class__.same_inode(os.path.join(entry, info_dir, 'RECORD'),
+                                               os.path.join(site, info_dir, 'RECORD'))
+                     for info_dir in info_dirs for site in sites ]):
+                live.append(ref_path)
+            else:
+                stale.append(ref_path)
+        return live, stale
+
+    def store_link_site_packages(self, verbose=False, dry_run=False):
+        """
+        Replace the files of the distributions in site-packages with hard links into the
+        shared store. Missing store entries are populated from site-packages (by hard links
+        as well). Files are made read-only because the inode is shared across prefixes.
+        Returns the number of distributions linked.
+        """
+        import errno
+        site_path  = self.python_pip_path
+        store_path = self.shared_store_path()
+        n_linked   = 0
+        n_created  = 0
+        n_bytes    = 0
+        for ent in self.dist_index(verbose=verbose).values():
+            info_dir = ent['info_dir']
+            if not info_dir.endswith('.dist-info'):
+                continue
+            key, files = self.__class__.store_entry_key(site_path, info_dir)
+            if key is None:
+                continue
+            entry = os.path.join(store_path, key)
+            if self.__class__.same_inode(os.path.join(entry, info_dir, 'RECORD'),
+                                         os.path.join(site_path, info_dir, 'RECORD')):
+                # already linked (e.g. cloned into a new generation): only the reference
+                if not dry_run:
+                    self.store_register_ref(store_path, key, site_path)
+                continue
+            if verbose or dry_run:
+                self.stderr.write("Link to shared store : %s -> %s" % (info_dir, entry))
+            if dry_run:
+                continue
+
+            if not os.path.isdir(entry):
+                os.makedirs(store_path, exist_ok=True)
+                tmp_entry = os.path.join(store_path, '%s%s-%d' % (self.__class__.SHARED_STORE_TMP_PREFIX, key, os.getpid()))
+                try:
+                    for relpath in files:
+                        src = os.path.join(site_path, relpath)
+                        if not os.path.isfile(src) or os.path.islink(src):
+                            continue
+                        dst = os.path.join(tmp_entry, relpath)
+                        os.makedirs(os.path.dirname(dst), exist_ok=True)
+                        os.link(src, dst)
+                        os.chmod(dst, os.stat(dst).st_mode & ~0o222)
+                    os.rename(tmp_entry, entry)
+                    n_created += 1
+                except OSError as e:
+                    shutil.rmtree(tmp_entry, ignore_errors=True)
+                    if e.errno == errno.EXDEV:
+                        self.stderr.write("Warning: shared store is not on the filesystem of site-packages"
+                                          " (hard links are not available) : %s" % (store_path, ))
+                        break
+                    if not os.path.isdir(entry):
+                        self.stderr.write("Warning: Failed to populate shared store : %s : %s" % (entry, str(e)))
+                        continue
+                    # populated concurrently by another prefix: link to it below
+
+            for relpath in files:
+                src = os.path.join(entry, relpath)
+                dst = os.path.join(site_path, relpath)
+                try:
+                    st_src = os.stat(src)
+                    st_dst = os.lstat(dst)
+                    if st_src.st_ino == st_dst.st_ino and st_src.st_dev == st_dst.st_dev:
+                        continue
+                    if ( not os.path.isfile(dst) ) or st_src.st_size != st_dst.st_size:
+                        continue
+                    tmp_dst = dst+'.py-encase-link'
+                    os.link(src, tmp_dst)
+                    os.replace(tmp_dst, dst)
+                    n_bytes += st_src.st_size
+                except OSError as e:
+                    if e.errno == errno.EXDEV:
+                        self.stderr.write("Warning: shared store is not on the filesystem of site-packages"
+                                          " (hard links are not available) : %s" % (store_path, ))
+                        return n_linked
+                    continue
+            self.store_register_ref(store_path, key, site_path)
+            n_linked += 1
+
+        if verbose and n_linked > 0:
+            self.stderr.write("Shared store : %d distributions linked (new entries: %d, shared: %.1f MB) : %s"
+                              % (n_linked, n_created, n_bytes/1e6, store_path))
+        return n_linked
+
+    def store_entry_list(self):
+        """
+        Entries of the shared store: [(path, number of files, total size, number of
+        site-packages referring to it)]. An entry with no reference can be removed.
+        """
+        store_path = self.shared_store_path()
+        buf = []
+        if not os.path.isdir(store_path):
+            return buf
+        for key in sorted(os.listdir(store_path)):
+            entry = os.path.join(store_path, key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            n_files = 0
+            n_size  = 0
+            for dirpath, dirnames, filenames in os.walk(entry):
+                for fname in filenames:
+                    try:
+                        st = os.lstat(os.path.join(dirpath, fname))
+                    except OSError:
+                        continue
+                    n_files += 1
+                    n_size  += st.st_size
+            buf.append((entry, n_files, n_size, len(self.store_entry_refs(entry)[0])))
+        return buf
+
+    def manage_store(self, args:argparse.Namespace, rest:list=[]):
+        flg_verbose = args.verbose if hasattr(args, 'verbose') else self.verbose
+        flg_dry_run = args.dry_run if hasattr(args, 'dry_run') else self.dry_run
+        store_cmd   = args.store_command if hasattr(args, 'store_command') and args.store_command else 'list'
+
+        store_path = self.shared_store_path()
+        if store_cmd == 'path':
+            print(store_path)
+            return 0
+
+        if store_cmd == 'link':
+            self.store_link_site_packages(verbose=flg_verbose, dry_run=flg_dry_run)
+            return 0
+
+        if store_cmd == 'list':
+            for entry, n_files, n_size, n_refs in self.store_entry_list():
+                print("%-60s %6d files %10.1f MB  refs: %d" % (os.path.basename(entry), n_files, n_size/1e6, n_refs))
+            return 0
+
+        # gc: entries that no site-packages refers to any more
+        n_removed = 0
+        n_bytes   = 0
+        refs_path = os.path.join(store_path, self.__class__.SHARED_STORE_REFS_DIR)
+        for entry, n_files, n_size, n_refs in self.store_entry_list():
+            if n_refs > 0:
+                if not flg_dry_run:
+                    for ref_path in self.store_entry_refs(entry)[1]:
+                        os.unlink(ref_path)
+                continue
+            if flg_verbose or flg_dry_run:
+                self.stderr.write("Remove unreferenced store entry : %s" % (entry, ))
+            if not flg_dry_run:
+                shutil.rmtree(entry, ignore_errors=True)
+                shutil.rmtree(os.path.join(refs_path, os.path.basename(entry)), ignore_errors=True)
+            n_removed += 1
+            n_bytes   += n_size
+        if os.path.isdir(refs_path):
+            for key in os.listdir(refs_path):
+                if not os.path.isdir(os.path.join(store_path, key)) and not flg_dry_run:
+                    shutil.rmtree(os.path.join(refs_path, key), ignore_errors=True)
+        if os.path.isdir(store_path):
+            for key in os.listdir(store_path):
+                tmp_entry = os.path.join(store_path, key)
+                if not key.startswith(self.__class__.SHARED_STORE_TMP_PREFIX):
+                    continue
+                try:
+                    if time.time() - os.stat(tmp_entry).st_mtime < self.__class__.SHARED_STORE_TMP_EXPIRE:
+                        continue
+                except OSError:
+                    continue
+                if flg_verbose or flg_dry_run:
+                    self.stderr.write("Remove leftover : %s" % (tmp_entry, ))
+                if not flg_dry_run:
+                    shutil.rmtree(tmp_entry, ignore_errors=True)
+        self.stderr.write("Store gc : %d entries removed (%.1f MB) : %s" % (n_removed, n_bytes/1e6, store_path))
+        return 0
+
+    def list_module_source(self):
+        import glob
+        buf = []
+        for x in glob.glob(os.path.join(self.srcdir, '*', 'pyproject.toml')):
+            buf.append(os.path.dirname(x))
+        return buf
+
+    def pkg_dir_list(self):
+        return [self.prefix, self.bindir, self.vardir, 
+                self.srcdir, self.tmpdir, self.logdir, self.python_path]
+
+    def pip_dir_list(self):
+        return [self.python_pip_path, self.python_pip_cache,
+                self.python_pip_src, self.python_pip_logdir]
+
+    def all_dir_list(self):
+        return self.pkg_dir_list() + self.pip_dir_list()
+
+
+    def read_dict(self, path):
+        import configparser
+        pathobj = path if isinstance(path, pathlib.Path) else pathlib.Path(path)
+        buf = {}
+
+        def spec_name(x):
+            # Name of requirement with version specifier/marker (e.g. 'requests>=2.28')
+            req = self.__class__.parse_requirement(str(x))
+            return req['name'] if req is not None and ( req['specs'] or req['marker'] ) else None
+
+        def conv_value(k, v):
+            # Version specifier as the value (e.g. {"requests": ">=2.28"}) is not a module name
+            return k if isinstance(v, str) and re.match(r'\s*(?:[<>=!~]|;)', v) else v
+
+        if pathobj.suffix == '.json':
+            with open(pathobj, "rb") as fp:
+                data = json.load(fp)
+                if isinstance(data, dict):
+                    buf.update({ k: conv_value(k, v) for k,v in data.items() })
+                elif isinstance(data, (list, set)):
+                    for x in data:
+                        if not x:
+                            continue
+                        if spec_name(x):
+                            buf.update({ spec_name(x): spec_name(x) })
+                            continue
+                        chunk = self.__class__.NON_PYIDF_PATTERN.split(str(x))
+                        if not chunk[0]:
+                            continue
+                        if ( len(chunk)>1 ) :
+                            buf.update({ chunk[0]: chunk[1] })
+                        else:
+                            buf.update({ chunk[0]: chunk[0] })
+                else:
+                    buf.update({ str(data): str(data) })
+        elif pathobj.suffix == '.toml':
+            if sys.version_info < (3, 11):
+                raise ValueError(f'TOML is not supported in this python version ({sys.version_info}) : {path}')
+            else:
+                import tomllib
+                with open(pathobj, "rb") as fp:
+                    data = tomllib.load(fp)
+                    for secsion in ['DEFAULT', 'requirements', 'modules', 'packages']:
+                        buf.update( { k: conv_value(k, v) for k,v in data.get(secsion,{}).items() if k } )
+        elif pathobj.suffix == '.ini':
+            cnfgpsr = configparser.ConfigParser()
+            cnfgpsr.read(pathobj, encoding=self.encoding)
+            for k,v in cnfgpsr.defaults().items():
+                if not k:
+                    continue                
+                buf.update( { k: conv_value(k, v) } )
+        else: # assume text file 
+            chunks = []
+            with open(pathobj, "r") as fp:
+                for line in fp:
+                    if spec_name(line):
+                        buf.update({ spec_name(line): spec_name(line) })
+                        continue
+                    chunks.extend(self.__class__.SPACENL_PATTERN.split(line))
+            for x in chunks:
+                if not x:
+                    continue                
+                chunk = self.__class__.NON_PYIDF_PATTERN.split(str(x))
+                if ( len(chunk)>1 ) :
+                    buf.update({ chunk[0]: chunk[1] })
+                else:
+                    buf.update({ chunk[0]: chunk[0] })
+        return buf
+    
+    def table_file_list(self, base_key:str, path_given=None):
+        """
+        Conversion table / requirement files: path_given if specified, otherwise readable
+        FILENAME_DEFAULT[base_key].{json,toml,ini,txt,} under share/python, share,
+        site-packages and lib/python
+        """
+        if path_given is not None:
+            return [ path_given ]
+
+        if sys.version_info < (3, 11):
+            suffixes = [ '.json',         '.ini', '.txt', '' ]
+        else:            
+            suffixes = [ '.json', '.toml', '.ini', '.txt', '']
+
+        buf = []
+        for subdir in [ os.path.join(self.datadir, 'python'),
+                        self.datadir, self.python_pip_path, self.python_path ]:
+            for suffix in suffixes:
+                fpth = os.path.join(subdir, self.__class__.FILENAME_DEFAULT[base_key]+suffix)
+                fpthobj = pathlib.Path(fpth)
+                if ( ( not fpthobj.exists() ) or
+                     ( not fpthobj.is_file() ) or
+                     ( not os.access(fpthobj, os.R_OK)) ):
+                    continue
+                buf.append(fpthobj)
+        return buf
+
+    def read_requirement_specs(self, path):
+        """
+        Requirements with version specifiers and/or environment markers in a requirement file
+        (e.g. 'requests>=2.28', 'tomli; python_version < "3.11"'):
+        {normalized name: parse_requirement() result}
+        """
+        import configparser
+        pathobj = path if isinstance(path, pathlib.Path) else pathlib.Path(path)
+        reqs = []
+        if pathobj.suffix == '.json':
+            with open(pathobj, "rb") as fp:
+                data = json.load(fp)
+            if isinstance(data, dict):
+                reqs.extend([ str(k)+str(v) for k,v in data.items() if isinstance(v, str) ])
+            elif isinstance(data, list):
+                reqs.extend([ str(x) for x in data if x ])
+        elif pathobj.suffix == '.toml':
+            if sys.version_info >= (3, 11):
+                import tomllib
+                with open(pathobj, "rb") as fp:
+                    data = tomllib.load(fp)
+                for secsion in ['DEFAULT', 'requirements', 'modules', 'packages']:
+                    reqs.extend([ str(k)+v for k,v in data.get(secsion,{}).items() if k and isinstance(v, str) ])
+        elif pathobj.suffix == '.ini':
+            cnfgpsr = configparser.ConfigParser()
+            cnfgpsr.read(pathobj, encoding=self.encoding)
+            reqs.extend([ k+v for k,v in cnfgpsr.defaults().items() if k ])
+        else:
+            with open(pathobj, "r") as fp:
+                reqs.extend([ x.split('#', 1)[0].strip() for x in fp ])
+
+        buf = {}
+        for x in reqs:
+            req = self.__class__.parse_requirement(x)
+            if req is None or not ( req['specs'] or req['marker'] ):
+                continue
+            buf[self.__class__.normalize_dist_name(req['name'])] = req
+        return buf
+
+    @classmethod
+    def parse_requirement(cls, req_str:str):
+        """
+        Parse requirement string 'name[extras] (op version, ...) ; marker' :
+        {'name', 'specs': [(op, version)], 'marker', 'text'} or None
+        """
+        m = re.match(cls.REQUIREMENT_PATTERN, req_str)
+        if m is None:
+            return None
+        specs = []
+        for x in (m.group('specs') or '').strip().strip('()').split(','):
+            if not x.strip():
+                continue
+            ms = re.match(r'\s*(~=|===|==|!=|<=|>=|<|>)\s*(\S+)\s*$', x)
+            if ms is None:
+                return None
+            specs.append((ms.group(1), ms.group(2)))
+        marker = m.group('marker').strip() if m.group('marker') else None
+        return {'name': m.group('name'), 'specs': specs, 'marker': marker or None,
+                'text': req_str.strip()}
+
+    @classmethod
+    def version_key(cls, version:str):
+        """
+        Sort key of a PEP 440 version: (epoch, release, pre, post, dev), None if not parsable
+        """
+        m = re.match(cls.VERSION_PATTERN, version.strip().lower())
+        if m is None:
+            return None
+        release = [ int(x) for x in m.group('release').split('.') ]
+        while len(release)>1 and release[-1] == 0:
+            release.pop()
+        pre_rank = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'c': 2, 'rc': 2, 'pre': 2, 'preview': 2}
+        if m.group('pre_l'):
+            pre = (0, pre_rank[m.group('pre_l')], int(m.group('pre_n') or 0))
+        elif m.group('dev_l') and not m.group('post_l') and not m.group('post_n2'):
+            pre = (-1, )
+        else:
+            pre = (1, )
+        if m.group('post_l') or m.group('post_n2'):
+            post = (int(m.group('post_n1') or m.group('post_n2') or 0), )
+        else:
+            post = (-1, )
+        dev = (0, int(m.group('dev_n') or 0)) if m.group('dev_l') else (1, )
+        return (int(m.group('epoch') or 0), tuple(release), pre, post, dev)
+
+    @classmethod
+    def version_local(cls, version:str):
+        """
+        Local version label of a PEP 440 version as comparable segments, None if not given
+        """
+        m = re.match(cls.VERSION_PATTERN, version.strip().lower())
+        if m is None or not m.group('local'):
+            return None
+        return tuple([ (1, int(x), '') if x.isdigit() else (0, 0, x)
+                       for x in re.split(r'[-_.]', m.group('local')) ])
+
+    @classmethod
+    def version_satisfies(cls, version:str, specs:list):
+        """
+        Check version against [(op, version)] (PEP 440 comparison, incl. '==X.*' and '~=')
+        """
+        v_key = cls.version_key(version)
+        for op, spec in specs:
+            if op == '===':
+                if version.strip() != spec.strip():
+                    return False
+                continue
+            if v_key is None:
+                return False
+            if op in ('==', '!=') and spec.endswith('.*'):
+                prefix = cls.version_key(spec[:-2])
+                if prefix is None:
+                    return False
+                n_rel  = len(spec[:-2].split('!')[-1].split('.'))
+                v_rel  = (list(v_key[1]) + [0]*n_rel)[:n_rel]
+                p_rel  = (list(prefix[1]) + [0]*n_rel)[:n_rel]
+                match  = ( v_key[0] == prefix[0] and v_rel == p_rel )
+                if match != ( op == '==' ):
+                    return False
+                continue
+            s_key = cls.version_key(spec.split('+', 1)[0])
+            if s_key is None:
+                return False
+            if op == '~=':
+                n_rel = len(re.match(cls.VERSION_PATTERN, spec.strip().lower()).group('release').split('.')) - 1
+                if n_rel < 1 or v_key < s_key or v_key[0] != s_key[0]:
+                    return False
+                if ((list(v_key[1]) + [0]*n_rel)[:n_rel]) != ((list(s_key[1]) + [0]*n_rel)[:n_rel]):
+                    return False
+                continue
+            if op in ('==', '!=') and '+' in spec:
+                # Local label of the specifier must match exactly ('==1.0+x' is not satisfied by '1.0')
+                match = ( v_key == s_key and cls.version_local(version) == cls.version_local(spec) )
+                if match != ( op == '==' ):
+                    return False
+                continue
+            # (Local label of the candidate is ignored: v_key has none, so '>V' excludes V+local)
+            if not { '==': v_key == s_key, '!=': v_key != s_key,
+                     '<=': v_key <= s_key, '>=': v_key >= s_key,
+                     '<':  v_key <  s_key, '>':  v_key >  s_key }[op]:
+                return False
+            # Exclusive ordering: '<V' excludes pre-releases of V unless V is a pre-release,
+            # '>V' excludes post-releases of V unless V is a post-release (same as pip)
+            if ( op == '<' and v_key[:2] == s_key[:2] and s_key[2:] == ( (1, ), (-1, ), (1, ) )
+                 and ( v_key[2], v_key[4] ) != ( (1, ), (1, ) ) ):
+                return False
+            if ( op == '>' and v_key[:3] == s_key[:3] and s_key[3:] == ( (-1, ), (1, ) )
+                 and v_key[3] != (-1, ) ):
+                return False
+        return True
+
+    def marker_satisfied(self, marker:str):
+        """
+        Evaluate PEP 508 environment marker for the target python. Unparsable marker is
+        regarded as satisfied (pip will evaluate it).
+        """
+        import platform
+        py_ver = self.python_vertion_str
+        env = {'python_version':                 '.'.join(py_ver.split('.')[:2]),
+               'python_full_version':            py_ver,
+               'implementation_version':         py_ver,
+               'implementation_name':            sys.implementation.name,
+               'platform_python_implementation': platform.python_implementation(),
+               'os_name':                        os.name,
+               'sys_platform':                   sys.platform,
+               'platform_system':                platform.system(),
+               'platform_machine':               platform.machine(),
+               'platform_release':               platform.release(),
+               'platform_version':               platform.version(),
+               'extra':                          '' }
+        tokens = re.findall(r'\s*(\(|\)|===|==|!=|<=|>=|~=|<|>|not\s+in\b|in\b|and\b|or\b|'
+                            r'\'[^\']*\'|"[^"]*"|[A-Za-z_][A-Za-z0-9_.]*)', marker)
+        if ''.join(tokens).replace(' ', '') != re.sub(r'\s+', '', marker):
+            return True
+        pos = [0]
+
+        def peek():
+            return tokens[pos[0]] if pos[0] < len(tokens) else None
+
+        def take():
+            pos[0] += 1
+            return tokens[pos[0]-1]
+
+        def value(tok):
+            if tok[0] in '\'"':
+                return tok[1:-1], False
+            if tok not in env:
+                raise ValueError(tok)
+            return env[tok], tok in ('python_version', 'python_full_version', 'implementation_version')
+
+        def atom():
+            if peek() == '(':
+                take()
+                ret = expr()
+                if take() != ')':
+                    raise ValueError(marker)
+                return ret
+            lhs, lhs_ver = value(take())
+            op = re.sub(r'\s+', ' ', take())
+            rhs, rhs_ver = value(take())
+            if op == 'in':
+                return lhs in rhs
+            if op == 'not in':
+                return lhs not in rhs
+            rhs_key = rhs[:-2] if op in ('==', '!=') and rhs.endswith('.*') else rhs
+            if ( lhs_ver or rhs_ver ) and self.__class__.version_key(lhs) and self.__class__.version_key(rhs_key):
+                return self.__class__.version_satisfies(lhs, [(op, rhs)])
+            if op in ('==', '==='):
+                return lhs == rhs
+            if op == '!=':
+                return lhs != rhs
+            raise ValueError(marker)
+
+        def conj():
+            ret = atom()
+            while peek() == 'and':
+                take()
+                ret = atom() and ret
+            return ret
+
+        def expr():
+            ret = conj()
+            while peek() == 'or':
+                take()
+                ret = conj() or ret
+            return ret
+
+        try:
+            ret = expr()
+            return ret if pos[0] == len(tokens) else True
+        except (ValueError, IndexError, TypeError):
+            return True
+
+    def show_dependency(self, args:argparse.Namespace, rest:list=[]):
+        flg_verbose = args.verbose       if hasattr(args, 'verbose')       else self.verbose
+        flg_all     = args.all           if hasattr(args, 'all')           else False
+        flg_bin     = args.bin_script    if hasattr(args, 'bin_script')    else False
+        flg_lib     = args.lib_script    if hasattr(args, 'lib_script')    else False
+        flg_mod     = args.module_src    if hasattr(args, 'module_src')    else False
+        flg_dump    = args.dump          if hasattr(args, 'dump')          else True
+        flg_cache   = not ( args.no_cache if hasattr(args, 'no_cache') else False )
+        n_jobs      = args.jobs          if hasattr(args, 'jobs')          else 0
+        scanner     = ( args.import_scanner if hasattr(args, 'import_scanner') else
+                        os.environ.get('PY_ENCASE_IMPORT_SCANNER', self.__class__.IMPORT_SCANNER_DEFAULT) )
+        if scanner not in self.__class__.IMPORT_SCANNERS:
+            self.stderr.write("Warning: Unknown import scanner: '%s' (Choose from %s) : use '%s'"
+                              % (scanner, ', '.join(self.__class__.IMPORT_SCANNERS),
+                                 self.__class__.IMPORT_SCANNER_DEFAULT))
+            scanner = self.__class__.IMPORT_SCANNER_DEFAULT
+
+        cnv_tble_file   = args.conv_table      if hasattr(args, 'conv_table')      else None
+        dependency_file = args.dependency_file if hasattr(args, 'dependency_file') else None
+
+        cnv_tbl     = {}
+        req_modules = {}
+
+        cnv_tbl.update( self.__class__.KNOWN_IMPORT_NAME_TO_MODULE_NAME )
+        # Exact import name -> distribution name of the installed ones
+        for ent in self.dist_index(verbose=flg_verbose).values():
+            cnv_tbl.update( { x: ent['name'] for x in ent['top_level'] } )
+        
+        for fpthobj in self.table_file_list('____MODULE_TABLE_BASE____', cnv_tble_file):
+            cnv_tbl.update(self.read_dict(fpthobj))
+
+        for fpthobj in self.table_file_list('____MODULE_REQUIRED_BASE__', dependency_file):
+            req_modules.update(self.read_dict(fpthobj))
+        cnv_tbl.update(req_modules)
 
         if not ( flg_bin or flg_lib or flg_mod ) :
             flg_all = True
 
         bin_scr, lib_scr = self.list_categorized_pkg_scripts()
         mod_src = self.list_module_source()
-        localimport = [ x.removesuffix(".py") for x in bin_scr ]
-        localimport.extend( [ x.removesuffix(".py") for x in lib_scr ] )
-        localimport.extend( [ os.path.split(x)[-1]  for x in mod_src ] )
+        localimport = frozenset( [ x.removesuffix(".py") for x in bin_scr ]
+                                 + [ x.removesuffix(".py") for x in lib_scr ]
+                                 + [ os.path.split(x)[-1]  for x in mod_src ] )
         _buf = dict()
-        
-        if flg_bin or flg_lib or flg_all:
-            if flg_bin or flg_all:
-                for scr in bin_scr:
-                    if flg_verbose:
-                        self.stderr.write(("Checking import from script : %s" % (scr, )))
-                    import_list = self.collect_import_from_path(pathlib.Path(os.path.join(self.python_path, scr)))
-                    for imprtd in [ x for x in import_list if ( not self.is_stdlib_module(x.split(".")[0]) and not x.split(".")[0] in localimport ) ]:
-                        if imprtd not in _buf.keys():
-                            _buf.update({imprtd:[]})
-                        _buf[imprtd].append(scr)
-            if flg_lib or flg_all:
-                for scr in lib_scr:
-                    if flg_verbose:
-                        self.stderr.write(("Checking import from library : %s" % (scr, )))
-                    import_list = self.collect_import_from_path(pathlib.Path(os.path.join(self.python_path, scr)))
-                    for imprtd in [ x for x in import_list if ( not self.is_stdlib_module(x.split(".")[0]) and not x.split(".")[0] in localimport ) ]:
-                        if imprtd not in _buf.keys():
-                            _buf.update({imprtd:[]})
-                        _buf[imprtd].append(scr)
+
+        scan_list = [] # (file path, source label)
+        if flg_bin or flg_all:
+            for scr in bin_scr:
+                if flg_verbose:
+                    self.stderr.write(("Checking import from script : %s" % (scr, )))
+                scan_list.append((os.path.join(self.python_path, scr), scr))
+        if flg_lib or flg_all:
+            for scr in lib_scr:
+                if flg_verbose:
+                    self.stderr.write(("Checking import from library : %s" % (scr, )))
+                scan_list.append((os.path.join(self.python_path, scr), scr))
         if flg_mod or flg_all:
             for src in mod_src:
                 if flg_verbose:
                     self.stderr.write(("Checking import from module : %s" % (src, )))
-                mod_src_dir = pathlib.Path(os.path.join(src, 'src'))
-                pyfiles = [ x for x in mod_src_dir.rglob("*.py") if "__pycache__" not in x.parts ]
-                for pyfile in pyfiles:
-                    if flg_verbose:
-                        self.stderr.write(("Checking import from file : %s" % (pyfile, )))
-                    import_list = self.collect_import_from_path(pathlib.Path(pyfile))
-                    for imprtd in [ x for x in import_list if ( not self.is_stdlib_module(x.split(".")[0]) and not x.split(".")[0] in localimport ) ]:
-                        if imprtd not in _buf.keys():
-                            _buf.update({imprtd:[]})
-                        _buf[imprtd].append(src)
+                for dirpath, dirnames, filenames in os.walk(os.path.join(src, 'src')):
+                    dirnames[:] = [ d for d in dirnames if d != '__pycache__' ]
+                    scan_list.extend([ (os.path.join(dirpath, f), src) for f in sorted(filenames) if f.endswith('.py') ])
+
+        scanned = self.scan_imports([ x for x,lbl in scan_list ], jobs=n_jobs,
+                                    use_cache=flg_cache, verbose=flg_verbose, scanner=scanner)
+
+        self.stdlib_module_index(verbose=flg_verbose)
+        imp_flags = {}
+        for pyfile, label in scan_list:
+            for imprtd, flags in scanned.get(pyfile, {}).items():
+                if self.classify_import(imprtd, local_names=localimport) != 'external':
+                    continue
+                if label not in _buf.setdefault(imprtd, []):
+                    _buf[imprtd].append(label)
+                imp_flags[imprtd] = imp_flags[imprtd] & set(flags) if imprtd in imp_flags else set(flags)
 
         if flg_verbose:
             for dep,src in _buf.items():
-                self.stderr.write(("%-9s %s" % (str(dep)+" --> "+self.import_name_to_pip_name(str(dep), cnv_table=cnv_tbl)+" :", ', '.join(src))))
+                flags = [ x for x in self.__class__.IMPORT_FLAGS if x in imp_flags.get(dep, set()) ]
+                self.stderr.write(("%-9s %s%s" % (str(dep)+" --> "+self.import_name_to_pip_name(str(dep), cnv_table=cnv_tbl)+" :", ', '.join(src),
+                                                  (" (%s)" % (', '.join(flags), )) if flags else "")))
 
         req_mod_list = [ self.import_name_to_pip_name(x, cnv_table=cnv_tbl) for x in _buf.keys() ]
         if flg_dump:
@@ -1338,7 +3951,11 @@ class PyEncase(object):
         # return req_mod_list
         return list(set(req_mod_list)|set(req_modules.keys()))
 
-    def install_dependency(self, args:argparse.Namespace, rest:list=[]):
+    def install_dependency(self, args:argparse.Namespace, rest:list=[], transaction=None):
+        """
+        pip install of the dependency found by show_dependency. With transaction (PipTransaction),
+        the requirements are only added to it, to be installed by its commit() with the others
+        """
         flg_verbose = args.verbose       if hasattr(args, 'verbose')       else self.verbose
         flg_dry_run = args.dry_run       if hasattr(args, 'dry_run')       else self.dry_run
         flg_all     = args.all           if hasattr(args, 'all')           else False
@@ -1351,24 +3968,146 @@ class PyEncase(object):
         dependency_file = args.dependency_file     if hasattr(args, 'dependency_file') else None
         pip_args        = args.pip_subcommand_args if hasattr(args, 'pip_subcommand_args') else []
 
+        flg_check   = args.check_only    if hasattr(args, 'check_only')    else False
+
+        if transaction is None and self.python_matrix_of(args):
+            # Each interpreter compares the requirements with its own site-packages
+            return self.run_python_matrix(self.python_matrix_of(args), self.manage_subcmd_argv,
+                                          verbose=flg_verbose, dry_run=flg_dry_run)
+
         req_mod_list = self.show_dependency(args=args, rest=rest)
+
+        req_specs = {}
+        for fpthobj in self.table_file_list('____MODULE_REQUIRED_BASE__', dependency_file):
+            req_specs.update(self.read_requirement_specs(fpthobj))
+
+        if flg_check or not ( set(pip_args+rest) & set(self.__class__.PIP_REINSTALL_OPTIONS) ):
+            missing, mismatch, satisfied = self.resolve_requirements(req_mod_list, req_specs)
+            if flg_verbose and satisfied:
+                self.stderr.write("Already satisfied : %s" % (', '.join(satisfied), ))
+            if flg_check:
+                for req in missing:
+                    print("Missing   : %s" % (req, ))
+                for req, version in mismatch:
+                    print("Mismatch  : %s (installed: %s)" % (req, version))
+                return 1 if ( missing or mismatch ) else 0
+            req_mod_list = missing + [ x for x,v in mismatch ]
+            if len(req_mod_list)<1 and len(pip_args+rest)<1:
+                self.stderr.write("All requirements are already satisfied")
+                return 0
+            if mismatch and not ( set(pip_args+rest) & set(self.__class__.PIP_REINSTALL_OPTIONS) ):
+                # pip --target does not replace existing packages without --upgrade
+                pip_args = ['--upgrade'] + pip_args
+        else:
+            req_mod_list = [ req_specs[self.__class__.normalize_dist_name(x)]['text']
+                             if self.__class__.normalize_dist_name(x) in req_specs else x
+                             for x in req_mod_list ]
+
+        if transaction is not None:
+            transaction.add_pip_options(pip_args+rest)
+            transaction.add(req_mod_list, source='dependency')
+            return 0
+
         if flg_verbose:
             self.stderr.write("Try pip install : %s" % (', '.join(req_mod_list), ))
 
-        return self.run_pip(subcmd='install',
-                            args=pip_args+rest+req_mod_list,
-                            verbose=flg_verbose, dry_run=flg_dry_run)
+        ret = self.run_pip_install(pip_args+rest+req_mod_list, opts=args,
+                                   verbose=flg_verbose, dry_run=flg_dry_run)
+        return self.__class__.exit_status(ret, dry_run=flg_dry_run)
+
+    def populate_wheelhouse(self, args:argparse.Namespace, rest:list=[]):
+        """
+        Build/download wheels of the dependency (show_deps output with the version
+        specifiers of Requirements.*) and of their dependencies into the local wheelhouse
+        used by offline mode ('pip wheel' so that sdists are built once here, not on the offline hosts)
+        """
+        flg_verbose = args.verbose       if hasattr(args, 'verbose')       else self.verbose
+        flg_dry_run = args.dry_run       if hasattr(args, 'dry_run')       else self.dry_run
+        flg_clean   = args.clean         if hasattr(args, 'clean')         else False
+        flg_list    = args.list          if hasattr(args, 'list')          else False
+
+        dependency_file = args.dependency_file     if hasattr(args, 'dependency_file') else None
+        pip_args        = args.pip_subcommand_args if hasattr(args, 'pip_subcommand_args') else []
+
+        wheelhouse = self.python_pip_wheelhouse
+        if flg_list:
+            if os.path.isdir(wheelhouse):
+                for fname in sorted(os.listdir(wheelhouse)):
+                    print(os.path.join(wheelhouse, fname) if flg_verbose else fname)
+            return 0
+
+        if flg_clean:
+            if flg_verbose or flg_dry_run:
+                self.stderr.write("Clean wheelhouse : '%s'" % (wheelhouse, ))
+            self.__class__.remove_dircontents(path_dir=wheelhouse, dir_itself=False,
+                                              verbose=flg_verbose, dry_run=flg_dry_run)
+
+        req_specs = {}
+        for fpthobj in self.table_file_list('____MODULE_REQUIRED_BASE__', dependency_file):
+            req_specs.update(self.read_requirement_specs(fpthobj))
+
+        req_mod_list = [ req_specs[self.__class__.normalize_dist_name(x)]['text']
+                         if self.__class__.normalize_dist_name(x) in req_specs else x
+                         for x in sorted(self.show_dependency(args=args, rest=rest)) ]
+
+        if len(req_mod_list+pip_args+rest)<1:
+            self.stderr.write("Nothing to be added to wheelhouse")
+            return 0
+
+        if flg_verbose:
+            self.stderr.write("Populate wheelhouse (%s) : %s" % (wheelhouse, ', '.join(req_mod_list)))
+
+        if not flg_dry_run:
+            os.makedirs(wheelhouse, exist_ok=True)
+        ret = self.run_pip(subcmd='wheel', args=pip_args+rest+req_mod_list,
+                           verbose=flg_verbose, dry_run=flg_dry_run)
+        return self.__class__.exit_status(ret, dry_run=flg_dry_run)
+
+    def resolve_requirements(self, req_names:list, req_specs:dict={}):
+        """
+        Compare requirements with the distributions installed in site-packages without pip.
+        req_specs: {normalized name: parse_requirement() result} for version specifiers and
+        environment markers. Returns (missing, [(mismatched, installed version)], satisfied),
+        missing/mismatched are requirement strings to be passed to pip.
+        """
+        installed = self.dist_index()
+        missing   = []
+        mismatch  = []
+        satisfied = []
+        for name in req_names:
+            norm = self.__class__.normalize_dist_name(name)
+            req  = req_specs.get(norm)
+            if req is not None and req['marker'] and not self.marker_satisfied(req['marker']):
+                continue
+            ent  = installed.get(norm)
+            text = req['text'] if req is not None else name
+            if ent is None:
+                missing.append(text)
+            elif req is not None and not self.__class__.version_satisfies(ent['version'], req['specs']):
+                mismatch.append((text, ent['version']))
+            else:
+                satisfied.append(name)
+        return (missing, mismatch, satisfied)
         
                 
     def is_stdlib_module(self, import_arg):
         import_name_top = import_arg.split(".")[0]
-        if import_name_top in sys.builtin_module_names:
+        stdlib_names, flg_complete = self.stdlib_module_index()
+        if import_name_top in stdlib_names:
             return True
-    
-        if hasattr(sys, "stdlib_module_names"):
-            return ( import_name_top in sys.stdlib_module_names )
-        
-        import_spec = importlib.util.find_spec(import_name_top)
+        if flg_complete:
+            return False
+        if import_name_top not in self.stdlib_spec_memo:
+            self.stdlib_spec_memo[import_name_top] = self.__class__.is_stdlib_module_spec(import_name_top)
+        return self.stdlib_spec_memo[import_name_top]
+
+    @classmethod
+    def is_stdlib_module_spec(cls, import_name_top):
+        import importlib.util
+        try:
+            import_spec = importlib.util.find_spec(import_name_top)
+        except (ImportError, ValueError):
+            return False
         if import_spec is None or import_spec.origin is None:
             return False
     
@@ -1378,21 +4117,388 @@ class PyEncase(object):
             return False
 
         return True
+
+    def classify_import(self, import_name:str, local_names=frozenset()):
+        """
+        Classify the top-level name of import_name: 'local' (in local_names, i.e. bin/lib
+        scripts and module sources), 'stdlib' or 'external'
+        """
+        import_name_top = import_name.split(".", 1)[0]
+        if import_name_top in local_names:
+            return 'local'
+        return 'stdlib' if self.is_stdlib_module(import_name_top) else 'external'
+
+    def stdlib_module_index(self, verbose=False):
+        """
+        (frozenset of top-level standard library module names, flag of completeness) of the
+        target python. Built once per run: from sys.stdlib_module_names/builtin_module_names
+        for the running interpreter, or fetched from the target interpreter (--python) and
+        cached in var/cache/py-encase/stdlib_index.json keyed by its binary. If the list is not
+        complete (running python < 3.10), is_stdlib_module() falls back to memoized find_spec().
+        """
+        if self.stdlib_index is not None:
+            return self.stdlib_index
+
+        if os.path.realpath(str(self.python_use)) == os.path.realpath(sys.executable):
+            self.stdlib_index = (frozenset(sys.builtin_module_names) | frozenset(getattr(sys, 'stdlib_module_names', ())),
+                                 hasattr(sys, 'stdlib_module_names'))
+            return self.stdlib_index
+
+        cache_path = os.path.join(self.vardir, 'cache', self.__class__.PIP_MODULE_NAME,
+                                  self.__class__.STDLIB_INDEX_CACHE_FILE)
+        key     = self.__class__.probe_cache_key(self.python_use)
+        entries = self.__class__.json_cache_read(cache_path)
+        names   = entries.get(key) if key is not None else None
+        if not isinstance(names, list):
+            if verbose:
+                self.stderr.write("Fetch the list of standard library modules from : %s" % (str(self.python_use), ))
+            try:
+                fetched = self.__class__.Tracer.run([str(self.python_use), '-c', self.__class__.STDLIB_INDEX_PROBE_SCRIPT],
+                                                    encoding=self.encoding, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                names = json.loads(fetched.stdout) if fetched.returncode == 0 else None
+            except (OSError, ValueError):
+                names = None
+            if not isinstance(names, list):
+                self.stderr.write("Warning: Can not get the list of standard library modules from : %s"
+                                  % (str(self.python_use), ))
+                self.stdlib_index = (frozenset(sys.builtin_module_names), False)
+                return self.stdlib_index
+            if key is not None:
+                entries.pop(key, None)
+                entries[key] = names
+                while len(entries) > self.__class__.PROBE_CACHE_MAX_ENTRIES:
+                    entries.pop(next(iter(entries)))
+                self.__class__.json_cache_write(cache_path, entries, indent=None)
+
+        self.stdlib_index = (frozenset(names), True)
+        return self.stdlib_index
     
+    def scan_imports(self, paths:list, jobs:int=0, use_cache:bool=True, verbose:bool=False, scanner:str=None):
+        """
+        Import names of each file with metadata ({path: {import name: [flags]}}, see
+        collect_import_records()). Files are parsed in a process pool (jobs: number of
+        workers, 0: number of CPUs), and the results are cached in
+        var/cache/py-encase/import_scan.json keyed by path, mtime, size and scanner type.
+        """
+        scanner = scanner if scanner else self.__class__.IMPORT_SCANNER_DEFAULT
+        cache_path = os.path.join(self.vardir, 'cache', self.__class__.PIP_MODULE_NAME,
+                                  self.__class__.IMPORT_SCAN_CACHE_FILE)
+        entries = self.__class__.json_cache_read(cache_path) if use_cache else {}
+
+        results = {}
+        misses  = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = "%d:%d:%s" % (st.st_mtime_ns, st.st_size, scanner)
+            ent = entries.get(path)
+            if isinstance(ent, dict) and ent.get('key') == key and isinstance(ent.get('imports'), dict):
+                results[path] = ent['imports']
+            else:
+                misses.append((path, key))
+
+        if verbose:
+            self.stderr.write("Import scan: %d files (cached: %d, to be parsed: %d, scanner: %s)"
+                              % (len(results)+len(misses), len(results), len(misses), scanner))
+        if len(misses) < 1:
+            return results
+
+        n_jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        parsed = None
+        if n_jobs > 1 and len(misses) >= self.__class__.IMPORT_SCAN_POOL_MIN:
+            import concurrent.futures
+            import pickle
+            try:
+                n_workers = min(n_jobs, len(misses))
+                with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    parsed = list(executor.map(self.__class__.collect_import_records,
+                                               [ x for x,k in misses ],
+                                               itertools.repeat('utf-8'), itertools.repeat(scanner),
+                                               chunksize=max(1, len(misses)//(n_workers*4))))
+            except (ImportError, OSError, NotImplementedError, concurrent.futures.BrokenExecutor,
+                    pickle.PicklingError, TypeError, AttributeError) as e:
+                # No usable process pool (no fork/semaphores, worker crashed, or not picklable
+                # under the spawn method): fall back to the serial scan
+                if verbose:
+                    self.stderr.write("Import scan: process pool is not available (%s): parse serially" % (str(e), ))
+                parsed = None
+        if parsed is None:
+            parsed = [ self.__class__.collect_import_records(x, scanner=scanner) for x,k in misses ]
+
+        for (path, key), imports in zip(misses, parsed):
+            results[path] = imports
+            entries[path] = {'key': key, 'imports': imports}
+
+        if use_cache:
+            self.__class__.json_cache_write(cache_path,
+                                            { k: v for k,v in entries.items() if os.path.exists(k) },
+                                            indent=None)
+        return results
+
     def collect_import_from_path(self, pathobj, encoding="utf-8"):
-        imported_modules = set()
+        return self.__class__.collect_import_from_file(str(pathobj), encoding=encoding)
+
+    @classmethod
+    def collect_import_from_file(cls, path:str, encoding="utf-8", scanner:str=None):
+        return list(cls.collect_import_records(path, encoding=encoding, scanner=scanner).keys())
+
+    @classmethod
+    def collect_import_records(cls, path:str, encoding="utf-8", scanner:str=None):
+        """
+        Import names of the file with metadata: {import name: [flags]}, flags are the
+        subset of IMPORT_FLAGS ('conditional', 'optional', 'type_only') shared by all
+        the import statements of the name in the file.
+        scanner: 'ast' (default) or 'tokenize'
+        """
         try:
-            cntxt_tree = ast.parse(pathobj.read_text(encoding=encoding), filename=str(pathobj))
-        except SyntaxError:
-            return []
-        for cntxt_nd in ast.walk(cntxt_tree):
-            if isinstance(cntxt_nd, ast.Import):
-                for nd_alias in cntxt_nd.names:
-                    imported_modules.add(nd_alias.name)
-            elif isinstance(cntxt_nd, ast.ImportFrom):
-                if cntxt_nd.level == 0 and cntxt_nd.module:
-                    imported_modules.add(cntxt_nd.module)
-        return list(imported_modules)
+            with open(path, encoding=encoding) as fin:
+                src = fin.read()
+            if scanner == 'tokenize':
+                return cls.scan_import_records_tokenize(src)
+            return cls.scan_import_records_ast(src, path=path)
+        except (SyntaxError, ValueError, OSError):
+            return {}
+
+    @classmethod
+    def import_records_from_flags(cls, found:dict):
+        return { k: [ f for f,v in zip(cls.IMPORT_FLAGS, flg) if v ] for k,flg in sorted(found.items()) }
+
+    @classmethod
+    def scan_import_records_ast(cls, src:str, path:str='<unknown>'):
+        import ast
+        cntxt_tree = ast.parse(src, filename=path)
+        found      = {} # import name -> (conditional, optional, type_only)
+        guards     = cls.IMPORT_GUARD_EXCEPTIONS
+
+        def add_import(name, ctx):
+            found[name] = tuple( a and b for a,b in zip(found[name], ctx) ) if name in found else ctx
+
+        def is_guarded(nd_try):
+            for nd_hdlr in nd_try.handlers:
+                if nd_hdlr.type is None:
+                    return True
+                for nd in ast.walk(nd_hdlr.type):
+                    if ( ( isinstance(nd, ast.Name) and nd.id in guards ) or
+                         ( isinstance(nd, ast.Attribute) and nd.attr in guards ) ):
+                        return True
+            return False
+
+        def is_type_checking(nd):
+            if isinstance(nd, ast.Name):
+                return nd.id == 'TYPE_CHECKING'
+            if not ( isinstance(nd, ast.Attribute) and nd.attr == 'TYPE_CHECKING' ):
+                return False
+            nd = nd.value
+            while isinstance(nd, ast.Attribute):
+                nd = nd.value
+            return isinstance(nd, ast.Name)
+
+        # Only statement lists are visited: import statements cannot be in expressions.
+        def visit(stmts, ctx):
+            cond, opt, tonly = ctx
+            for nd in stmts:
+                if isinstance(nd, ast.Import):
+                    for nd_alias in nd.names:
+                        add_import(nd_alias.name, ctx)
+                elif isinstance(nd, ast.ImportFrom):
+                    if nd.level == 0 and nd.module:
+                        add_import(nd.module, ctx)
+                elif isinstance(nd, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    visit(nd.body, (True, opt, tonly))
+                elif isinstance(nd, ast.ClassDef):
+                    visit(nd.body, ctx)
+                elif isinstance(nd, ast.If):
+                    visit(nd.body, (cond, opt, True) if is_type_checking(nd.test) else (True, opt, tonly))
+                    visit(nd.orelse, (True, opt, tonly))
+                elif isinstance(nd, (ast.For, ast.AsyncFor, ast.While)):
+                    visit(nd.body,   (True, opt, tonly))
+                    visit(nd.orelse, (True, opt, tonly))
+                elif isinstance(nd, (ast.With, ast.AsyncWith)):
+                    visit(nd.body, ctx)
+                elif isinstance(nd, (ast.Try, getattr(ast, 'TryStar', ast.Try))):
+                    guarded = is_guarded(nd)
+                    visit(nd.body, (cond, opt or guarded, tonly))
+                    for nd_hdlr in nd.handlers:
+                        visit(nd_hdlr.body, (cond, True, tonly) if guarded else (True, opt, tonly))
+                    visit(nd.orelse,    ctx)
+                    visit(nd.finalbody, ctx)
+                elif hasattr(ast, 'Match') and isinstance(nd, ast.Match):
+                    for nd_case in nd.cases:
+                        visit(nd_case.body, (True, opt, tonly))
+
+        visit(cntxt_tree.body, (False, False, False))
+        return cls.import_records_from_flags(found)
+
+    @classmethod
+    def scan_import_records_tokenize(cls, src:str):
+        """
+        Light-weight lexical scanner equivalent to scan_import_records_ast() for valid source.
+        Only strings, comments, brackets, colons, semicolons and newlines are tokenized, and
+        block structure is followed by indentation. Scanning stops at the first top-level
+        statement after the last line that can start an import statement.
+        """
+        last_cand = -1
+        for m in re.finditer(cls.IMPORT_SCAN_CANDIDATE_PATTERN, src, re.M):
+            last_cand = m.start()
+        if last_cand < 0:
+            return {}
+
+        line_re  = re.compile(cls.IMPORT_SCAN_LINE_PATTERN)
+        stmt_re  = re.compile(cls.IMPORT_SCAN_STMT_PATTERN)
+        body_re  = re.compile(cls.IMPORT_SCAN_BODY_PATTERN)
+        guard_re = re.compile(r'\b(?:%s)\b' % ('|'.join(cls.IMPORT_GUARD_EXCEPTIONS), ))
+        hdr_kwds = ('if', 'elif', 'else', 'try', 'except', 'finally', 'for', 'while',
+                    'with', 'def', 'class', 'match', 'case')
+        cnt_kwds = ('elif', 'else', 'except', 'finally')
+
+        # Block descriptor: ('c'|'t'|'ct'|'', None) for conditional/type-only/both/none,
+        #                   ('try'|'except', [guarded]) for try statement.
+        stmts = []      # (import statement, [descriptors])
+        st    = { 'stack':  [],    # [(body indent, descriptor)] of enclosing blocks
+                  'chain':  {},    # indent -> (kind, reference) of the last compound statement
+                  'pend':   None,  # (header indent, descriptor) of the block to be opened
+                  'hdr':    None,  # (keyword, indent, end of keyword) of the header in the line
+                  'extra':  None,  # descriptor of the body in the same line (e.g. 'if x: import y')
+                  'imp':    None,  # start of the import statement
+                  'indent': 0 }
+
+        def begin_line(pos):
+            st['extra'] = None
+            st['hdr']   = None
+            m  = line_re.match(src, pos)
+            ws = m.group(1)
+            if m.end(1) >= len(src) or src[m.end(1)] in '\n#':
+                return True
+            w     = len(ws.expandtabs(8)) if '\t' in ws else len(ws)
+            kw    = m.group(3)
+            stack = st['stack']
+            chain = st['chain']
+            if pos > last_cand and w == 0 and kw not in cnt_kwds:
+                return False
+            while stack and stack[-1][0] > w:
+                stack.pop()
+            if st['pend'] is not None:
+                if w > st['pend'][0]:
+                    stack.append((w, st['pend'][1]))
+                st['pend'] = None
+            if w < st['indent']:
+                for k in [ k for k in chain.keys() if k > w ]:
+                    del chain[k]
+            st['indent'] = w
+            if kw in cnt_kwds and m.group(2) is None:
+                st['hdr'] = (kw, w, m.end())
+                return True
+            chain.pop(w, None)
+            if m.group(2) is not None:
+                if kw in ('def', 'for', 'with'):
+                    st['hdr'] = (kw, w, m.end())
+            elif kw in ('import', 'from'):
+                st['imp'] = m.end(1)
+            elif kw in hdr_kwds:
+                st['hdr'] = (kw, w, m.end())
+            return True
+
+        def end_stmt(pos):
+            if st['imp'] is None:
+                return
+            descs = [ d for _,d in st['stack'] ]
+            if st['extra'] is not None:
+                descs.append(st['extra'])
+            stmts.append((src[st['imp']:pos], descs))
+            st['imp'] = None
+
+        def header_desc(kw, w, hdr_text):
+            chain = st['chain']
+            if kw in ('if', 'elif'):
+                tc = re.match(cls.IMPORT_SCAN_TYPECHK_PATTERN, hdr_text) is not None
+                if kw == 'if':
+                    chain[w] = ('if', None)
+                    return ('t', None) if tc else ('c', None)
+                return ('ct', None) if tc else ('c', None)
+            if kw in ('for', 'while'):
+                chain[w] = ('loop', None)
+                return ('c', None)
+            if kw == 'try':
+                ref = [False]
+                chain[w] = ('try', ref)
+                return ('try', ref)
+            prev = chain.get(w)
+            if kw == 'except':
+                ref = prev[1] if prev is not None and prev[0] == 'try' else [False]
+                txt = re.sub(r'\bas\s+[A-Za-z_]\w*\s*$', '', hdr_text.lstrip(' \t*'))
+                if txt.strip() == '' or guard_re.search(txt):
+                    ref[0] = True
+                return ('except', ref)
+            if kw == 'else':
+                return ('', None) if prev is not None and prev[0] == 'try' else ('c', None)
+            if kw in ('def', 'case'):
+                return ('c', None)
+            return ('', None)
+
+        depth = 0
+        if begin_line(0):
+            for m in re.finditer(cls.IMPORT_SCAN_TOKEN_PATTERN, src, re.S):
+                kind = m.lastgroup
+                if kind == 'open':
+                    depth += 1
+                elif kind == 'close':
+                    depth = depth - 1 if depth > 0 else 0
+                elif depth > 0 or kind in ('str', 'com', 'cont', 'walrus'):
+                    continue
+                elif kind == 'nl':
+                    end_stmt(m.start())
+                    if not begin_line(m.end()):
+                        break
+                elif kind == 'semi':
+                    end_stmt(m.start())
+                    ms = stmt_re.match(src, m.end())
+                    if ms is not None:
+                        st['imp'] = ms.start(1)
+                elif st['hdr'] is not None:
+                    # colon at the end of compound statement header
+                    kw, w, kw_end = st['hdr']
+                    st['hdr'] = None
+                    desc = header_desc(kw, w, src[kw_end:m.start()])
+                    if body_re.match(src, m.end()) is not None:
+                        st['pend'] = (w, desc)
+                    else:
+                        st['extra'] = desc
+                        ms = stmt_re.match(src, m.end())
+                        if ms is not None:
+                            st['imp'] = ms.start(1)
+            else:
+                end_stmt(len(src))
+
+        found = {}
+        for stmt, descs in stmts:
+            cond = opt = tonly = False
+            for kind, ref in descs:
+                if kind in ('c', 'ct'):
+                    cond = True
+                if kind in ('t', 'ct'):
+                    tonly = True
+                if kind == 'try':
+                    opt = opt or ref[0]
+                elif kind == 'except':
+                    if ref[0]:
+                        opt = True
+                    else:
+                        cond = True
+            ctx  = (cond, opt, tonly)
+            stmt = re.sub(r'#[^\n]*|\\\n|[()]', ' ', stmt)
+            if stmt.startswith('import'):
+                names = [ re.sub(r'\s+', '', re.split(r'\s+as\s+', x.strip(), maxsplit=1)[0])
+                          for x in stmt[len('import'):].split(',') ]
+            else:
+                m = re.match(r'from\s*([.\s]*)(.*?)\s*\bimport\b', stmt, re.S)
+                names = ( [ re.sub(r'\s+', '', m.group(2)) ]
+                          if m is not None and '.' not in m.group(1) else [] )
+            for name in names:
+                if name:
+                    found[name] = tuple( a and b for a,b in zip(found[name], ctx) ) if name in found else ctx
+        return cls.import_records_from_flags(found)
 
     def import_name_to_pip_name(self, import_name, cnv_table=None):
         ctbl = self.__class__.KNOWN_IMPORT_NAME_TO_MODULE_NAME if cnv_table is None else cnv_table
@@ -1415,6 +4521,7 @@ class PyEncase(object):
         return
 
     def put_this_into_structure(self, flg_move=False, dry_run=False, verbose=False):
+        import filecmp
 
         #orig_path   = pathlib.Path(__file__).resolve() # self.path_invoked.absolute().name
         orig_path   = self.__class__.ENTITY_PATH
@@ -1469,8 +4576,101 @@ class PyEncase(object):
         if not dry_run:
             os.symlink(entiry_name, link_dest)
 
+    def mklauncher_in_structure(self, link_name, strip_py=True, launcher_mode=None,
+                                overwrite=False, dry_run=False, verbose=False):
+        launcher_mode = launcher_mode if launcher_mode else self.guess_launcher_mode()
+        link_dest     = os.path.join(self.bindir, 
+                                     link_name.removesuffix('.py')
+                                     if strip_py and link_name.endswith('.py') else link_name)
+        if overwrite and os.path.lexists(link_dest):
+            if verbose or dry_run:
+                self.stderr.write("Remove launcher : '%s'" % (link_dest, ))
+            if not dry_run:
+                os.unlink(link_dest)
+        if launcher_mode == 'stub':
+            return self.mkstub_in_structure(link_name, strip_py=strip_py,
+                                            dry_run=dry_run, verbose=verbose)
+        return self.mksymlink_this_in_structure(link_name, strip_py=strip_py,
+                                                dry_run=dry_run, verbose=verbose)
+
+    def mkstub_in_structure(self, link_name, strip_py=True, dry_run=False, verbose=False):
+        import shlex
+        bn        = link_name.removesuffix('.py') if strip_py and link_name.endswith('.py') else link_name
+        stub_dest = os.path.join(self.bindir, bn)
+
+        if os.path.lexists(stub_dest):
+            self.stderr.write("Launcher already exists: '%s'" % (stub_dest, ))
+            return
+
+        python_cmd = self.__class__.script_python_cmd(self.python_path, bn)
+        pycan      = self.python_for(python_cmd) if python_cmd and shutil.which(python_cmd) else self
+
+        script_path = os.path.join(self.python_path, bn.removesuffix('.py')+'.py')
+        if not os.path.isfile(script_path):
+            pip_bin_path = os.path.join(pycan.python_pip_path, 'bin', bn.removesuffix('.py'))
+            if os.path.isfile(pip_bin_path):
+                script_path = pip_bin_path
+
+        stub_text = ("#!/bin/sh\n"
+                     "%s\n"
+                     "# Launcher of %s generated by %s (Regenerate by '%s init --relink')\n"
+                     "PYTHONPATH=%s:\"${PYTHONPATH}\"\n"
+                     "export PYTHONPATH\n"
+                     "exec %s %s \"$@\"\n"
+                     % (self.__class__.LAUNCHER_STUB_MARKER,
+                        os.path.basename(script_path), self.__class__.ENTITY_FILE_NAME, self.__class__.MNG_SCRIPT,
+                        shlex.quote("%s:%s" % (self.python_path, pycan.python_pip_path)),
+                        shlex.quote(str(pycan.python_use)), shlex.quote(script_path)))
+
+        if verbose or dry_run:
+            self.stderr.write("make launcher stub : '%s' --> '%s'" % (stub_dest, script_path))
+        if not dry_run:
+            with open(stub_dest, 'w', encoding=self.encoding) as fout:
+                fout.write(stub_text)
+            os.chmod(stub_dest, mode=0o755)
+
+    @classmethod
+    def is_launcher_stub(cls, path):
+        if os.path.islink(path) or (not os.path.isfile(path)):
+            return False
+        try:
+            with open(path, encoding='utf-8') as fin:
+                return any(line.rstrip('\n') == cls.LAUNCHER_STUB_MARKER
+                           for line in itertools.islice(fin, 3))
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def is_launcher_symlink(self, path):
+        return ( os.path.islink(path) and
+                 os.path.basename(os.readlink(path)) == self.__class__.ENTITY_FILE_NAME )
+
+    def list_launchers(self):
+        buf = []
+        if not os.path.isdir(self.bindir):
+            return buf
+        for x in sorted(os.listdir(self.bindir)):
+            if x in (self.__class__.MNG_SCRIPT, self.__class__.ENTITY_FILE_NAME):
+                continue
+            b_path = os.path.join(self.bindir, x)
+            if self.__class__.is_launcher_stub(b_path):
+                buf.append((x, 'stub'))
+            elif self.is_launcher_symlink(b_path):
+                buf.append((x, 'symlink'))
+        return buf
+
+    def guess_launcher_mode(self):
+        modes = [ m for x,m in self.list_launchers() ]
+        return 'stub' if 'stub' in modes else self.__class__.LAUNCHER_MODE_DEFAULT
+
+    def relink_launchers(self, launcher_mode=None, dry_run=False, verbose=False):
+        for x,mode in self.list_launchers():
+            self.mklauncher_in_structure(x, strip_py=False,
+                                         launcher_mode=(launcher_mode if launcher_mode else mode),
+                                         overwrite=True, dry_run=dry_run, verbose=verbose)
+
     @classmethod
     def rename_with_mtime_suffix(cls, file_path, add_sufix=None, dest_dir=None, verbose=False, dry_run=False):
+        import datetime
         if not os.path.exists(file_path):
             if verbose or dry_run:
                 cls.StreamExtd().stderr.write("File not found : '%s'" % (file_path, ))                                            
@@ -1621,6 +4821,20 @@ class PyEncase(object):
                                               dir_itself=False,
                                               verbose=flg_verbose, dry_run=flg_dry_run)
 
+        if subcmd != 'distclean':
+            # Generations of site-packages go together with the symbolic link to the active one
+            for gen, gen_path in self.site_generation_dirs():
+                self.__class__.remove_dircontents(path_dir=gen_path, dir_itself=True,
+                                                  verbose=flg_verbose, dry_run=flg_dry_run)
+
+        if subcmd == 'distclean':
+            # Launcher stubs have the interpreter and prefix baked in: revert them to symbolic links
+            for x,mode in self.list_launchers():
+                if mode != 'stub':
+                    continue
+                self.mklauncher_in_structure(x, strip_py=False, launcher_mode='symlink', overwrite=True,
+                                             verbose=flg_verbose, dry_run=flg_dry_run)
+
 
     ########## ____STREAMEXTD_TEMPLATE_START____ ##########
     #### ____py_shebang_pattern____ ####
@@ -1628,21 +4842,20 @@ class PyEncase(object):
     import sys
     import _io
     import collections
-    import inspect
 
     class StreamExtd(object):
         """
         Extended I/O Stream Interface
         """
+        Streams = collections.namedtuple('streams', ['stdin', 'stdout','stderr'])
+
         def __init__(self, 
                      stdin:_io.TextIOWrapper=sys.stdin,
                      stdout:_io.TextIOWrapper=sys.stdout,
                      stderr:_io.TextIOWrapper=sys.stderr):
-            streams_t = collections.namedtuple('streams',
-                                               ['stdin', 'stdout','stderr'])
-            self.streams = streams_t(stdin=self.__class__.StreamIF(sys.stdin),
-                                     stdout=self.__class__.StreamIF(sys.stdout),
-                                     stderr=self.__class__.StreamIF(sys.stderr))
+            self.streams = self.__class__.Streams(stdin=self.__class__.StreamIF(sys.stdin),
+                                                  stdout=self.__class__.StreamIF(sys.stdout),
+                                                  stderr=self.__class__.StreamIF(sys.stderr))
     
         @property
         def stdin(self):
@@ -1655,59 +4868,295 @@ class PyEncase(object):
         @property
         def stderr(self):
             return self.streams.stderr
+
+        @classmethod
+        def configure(cls, level=None, prefix_mode:str=None):
+            """
+            Defaults of all StreamIF objects: level ('debug', 'info', 'warning', 'error' or int)
+            below which log()/debug()/info()/... messages are dropped, and prefix_mode of
+            the '[qualname:lineno] ' header ('off', 'cached' per call site, 'full')
+            """
+            if level is not None:
+                cls.StreamIF.level = cls.StreamIF.level_of(level)
+            if prefix_mode is not None:
+                if prefix_mode not in cls.StreamIF.PREFIX_MODES:
+                    raise ValueError("Unknown prefix mode: %s (%s)" % (prefix_mode, ', '.join(cls.StreamIF.PREFIX_MODES)))
+                cls.StreamIF.prefix_mode = prefix_mode
     
         class StreamIF(object):
             """
             Wrapper for stdout/stderr to show with full qualified function name
+
+            write() always shows the message. log(level, ...) and debug()/info()/warning()/error()
+            drop it without formatting when level is below the threshold (self.level).
+            The header is built from the caller frame ('full'), looked up by the code object
+            and the line of the call site ('cached'), or omitted ('off').
             """
-            def __init__(self, stream:_io.TextIOWrapper=sys.stderr):
+            DEBUG        = 10
+            INFO         = 20
+            WARNING      = 30
+            ERROR        = 40
+            LEVEL_NAMES  = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+            PREFIX_MODES = ('off', 'cached', 'full')
+
+            level        = INFO
+            prefix_mode  = 'cached'
+            prefix_cache = {}
+
+            def __init__(self, stream:_io.TextIOWrapper=sys.stderr, level=None, prefix_mode:str=None):
                 self.stream = stream
-                
-            def write(self, text='', *args, cls_name:str=None, more_upper:bool=False):
-                refname,lineno = self.caller_fqn(cls_name=cls_name, more_upper=more_upper)
-                lhdr   = "[%s:%d] " % (refname, lineno)
-                fmttxt = (text % tuple(args)) if len(args)>0 else text
-                return self.stream.write(lhdr+(fmttxt if fmttxt.endswith('\n') else fmttxt+'\n'))
-            
-            def caller_fqn(self, cls_name:str=None, more_upper:bool=False):
+                if level is not None:
+                    self.level = self.__class__.level_of(level)
+                if prefix_mode is not None:
+                    self.prefix_mode = prefix_mode
+
+            @classmethod
+            def level_of(cls, level):
+                if isinstance(level, int):
+                    return level
                 try:
-                    if more_upper:
-                        frm = inspect.currentframe().f_back.f_back.f_back
-                    else:
-                        frm = inspect.currentframe().f_back.f_back
-        
-                    mod_name = frm.f_globals.get('__name__', '')
-                    code = frm.f_code
-    
-                    if sys.version_info >= (3, 11):
-                        qualname = code.co_qualname
+                    return int(level)
+                except ValueError:
+                    pass
+                try:
+                    return cls.LEVEL_NAMES[str(level).lower()]
+                except KeyError:
+                    raise ValueError("Unknown log level: %s (%s)" % (level, ', '.join(cls.LEVEL_NAMES.keys())))
+
+            def is_enabled(self, level:int=DEBUG):
+                return level >= self.level
+
+            def write(self, text='', *args, cls_name:str=None, more_upper:bool=False):
+                return self.emit(text, args, cls_name=cls_name, more_upper=more_upper)
+
+            def log(self, level, text='', *args, cls_name:str=None, more_upper:bool=False):
+                if self.__class__.level_of(level) < self.level:
+                    return 0
+                return self.emit(text, args, cls_name=cls_name, more_upper=more_upper)
+
+            def debug(self, text='', *args, cls_name:str=None, more_upper:bool=False):
+                if self.__class__.DEBUG < self.level:
+                    return 0
+                return self.emit(text, args, cls_name=cls_name, more_upper=more_upper)
+
+            def info(self, text='', *args, cls_name:str=None, more_upper:bool=False):
+                if self.__class__.INFO < self.level:
+                    return 0
+                return self.emit(text, args, cls_name=cls_name, more_upper=more_upper)
+
+            def warning(self, text='', *args, cls_name:str=None, more_upper:bool=False):
+                if self.__class__.WARNING < self.level:
+                    return 0
+                return self.emit(text, args, cls_name=cls_name, more_upper=more_upper)
+
+            def error(self, text='', *args, cls_name:str=None, more_upper:bool=False):
+                if self.__class__.ERROR < self.level:
+                    return 0
+                return self.emit(text, args, cls_name=cls_name, more_upper=more_upper)
+
+            def emit(self, text, args, cls_name:str=None, more_upper:bool=False):
+                """ Write the message of the caller of the caller (write(), log(), ...) """
+                mode = self.prefix_mode
+                if mode == 'cached':
+                    frm = sys._getframe(3 if more_upper else 2)
+                    key = (frm.f_code, frm.f_lineno, cls_name)
+                    if sys.version_info < (3, 11) and not cls_name:
+                        # frame_fqn() names it by the type of self/cls (no co_qualname)
+                        key += (type(frm.f_locals.get('self') or frm.f_locals.get('cls')), )
+                    try:
+                        lhdr = self.prefix_cache[key]
+                    except KeyError:
+                        lhdr = "[%s:%d] " % (self.__class__.frame_fqn(frm, cls_name=cls_name), frm.f_lineno)
+                        self.prefix_cache[key] = lhdr
+                    del frm
+                elif mode == 'off':
+                    lhdr = ''
+                else:
+                    refname,lineno = self.caller_fqn(cls_name=cls_name, more_upper=more_upper, depth=3)
+                    lhdr = "[%s:%d] " % (refname, lineno)
+                fmttxt = (text % args) if args else text
+                return self.stream.write(lhdr+fmttxt if fmttxt.endswith('\n') else lhdr+fmttxt+'\n')
+
+            @classmethod
+            def frame_fqn(cls, frm, cls_name:str=None):
+                mod_name = frm.f_globals.get('__name__', '')
+                code = frm.f_code
+
+                if sys.version_info >= (3, 11):
+                    qualname = code.co_qualname
+                else:
+                    if cls_name:
+                        qualname = '.'.join([cls_name, code.co_name])
                     else:
-                        if cls_name:
-                            qualname = '.'.join([cls_name, code.co_name])
+                        prntobj = frm.f_locals.get('self') or frm.f_locals.get('cls')
+                        if prntobj:
+                            qualname = '.'.join([type(prntobj).__name__, code.co_name])
                         else:
-                            prntobj = frm.f_locals.get('self') or frm.f_locals.get('cls')
-                            if prntobj:
-                                qualname = '.'.join([type(prntobj).__name__, code.co_name])
-                            else:
-                                qualname = code.co_name
-        
-                    fqn_name = '.'.join([mod_name, qualname, ]) if ( mod_name and mod_name != '__main__' ) else qualname
+                            qualname = code.co_name
+
+                return '.'.join([mod_name, qualname, ]) if ( mod_name and mod_name != '__main__' ) else qualname
+            
+            def caller_fqn(self, cls_name:str=None, more_upper:bool=False, depth:int=2):
+                try:
+                    frm = sys._getframe(depth+1 if more_upper else depth)
+                    return (self.__class__.frame_fqn(frm, cls_name=cls_name), frm.f_lineno)
+                finally:
+                    del frm
+
+    ########## ____STREAMEXTD_TEMPLATE_END____ ##########
+
+    class ExtCmdIF(StreamExtd):
+
+        READ_SIZE_MIN  = 1024
+        READ_SIZE_MAX  = 65536
+        STDIN_READ_SIZE = 4096
+        CAPTURE_LIMIT  = 8*1024*1024
+        CAPTURE_MODES  = ('ring', 'spool')
+        SKIPPED_RETURN_CODE = -1
     
-                    return (fqn_name, frm.f_lineno)
+        def __init__(self, verbose=False, dry_run=False, encoding='utf-8',
+                     capture_limit:int=None, capture_mode:str=None, **args):
+            super().__init__(**args)
+            self.verbose  = verbose
+            self.dry_run  = dry_run
+            self.encoding = encoding
+            try:
+                env_limit = int(os.environ.get('PY_ENCASE_CAPTURE_LIMIT', self.__class__.CAPTURE_LIMIT))
+            except ValueError:
+                env_limit = self.__class__.CAPTURE_LIMIT
+            self.capture_limit = capture_limit if capture_limit is not None else env_limit
+            self.capture_mode  = (capture_mode if capture_mode is not None else
+                                  os.environ.get('PY_ENCASE_CAPTURE_MODE', self.__class__.CAPTURE_MODES[0]))
+            if self.capture_mode not in self.__class__.CAPTURE_MODES:
+                self.capture_mode = self.__class__.CAPTURE_MODES[0]
+
+        @classmethod
+        def adapt_read_size(cls, size:int, n_read:int):
+            """ Next read size: doubled while reads fill the buffer, halved when they are mostly empty """
+            if n_read >= size:
+                return min(size*2, cls.READ_SIZE_MAX)
+            if n_read < size//4:
+                return max(size//2, cls.READ_SIZE_MIN)
+            return size
+
+        class OutputCapture(object):
+            """
+            Bounded capture of child output: up to 'limit' characters (bytes in binary mode)
+            are kept in memory. Beyond it, only the last 'limit' are kept ('ring') or the whole
+            output is spilled to a temporary file ('spool'). limit <= 0 means unbounded.
+            """
+            def __init__(self, text:bool=True, limit:int=0, mode:str='ring', encoding:str='utf-8'):
+                self.text     = text
+                self.empty    = '' if text else b''
+                self.limit    = limit if ( limit is not None and limit > 0 ) else 0
+                self.mode     = mode
+                self.encoding = encoding
+                self.chunks   = collections.deque()
+                self.size     = 0
+                self.dropped  = 0
+                self.spill    = None
+
+            def append(self, data):
+                if not data:
+                    return
+                if self.spill is not None:
+                    self.spill.write(data)
+                    return
+                self.chunks.append(data)
+                self.size += len(data)
+                if self.limit <= 0 or self.size <= self.limit:
+                    return
+                if self.mode == 'spool':
+                    import tempfile
+                    self.spill = (tempfile.TemporaryFile(mode='w+', encoding=self.encoding, newline='')
+                                  if self.text else tempfile.TemporaryFile(mode='w+b'))
+                    self.spill.write(self.empty.join(self.chunks))
+                    self.chunks.clear()
+                    self.size = 0
+                    return
+                while self.size - len(self.chunks[0]) >= self.limit:
+                    n_drop = len(self.chunks.popleft())
+                    self.size    -= n_drop
+                    self.dropped += n_drop
+                if self.size > self.limit:
+                    n_drop = self.size - self.limit
+                    self.chunks[0] = self.chunks[0][n_drop:]
+                    self.size    -= n_drop
+                    self.dropped += n_drop
+
+            def getvalue(self):
+                if self.spill is None:
+                    return self.empty.join(self.chunks)
+                self.spill.seek(0)
+                return self.spill.read()
+
+            def close(self):
+                if self.spill is not None:
+                    self.spill.close()
+                    self.spill = None
+                self.chunks.clear()
+                self.size = 0
+
+        class OutputTee(object):
+            """
+            Forwarding of child output to a sink stream with incremental decoding
+            (multibyte characters split across reads are kept intact) and bounded capture.
+            With tag, only whole lines are written, each prefixed by '[tag] '.
+            """
+            def __init__(self, sink, capture, text:bool=True, encoding:str='utf-8', tag:str=None):
+                import codecs
+                self.sink    = sink
+                self.capture = capture
+                self.text    = text
+                self.prefix  = None if tag is None else '[%s] ' % (tag,)
+                self.pending = ''
+                self.bsink   = None if ( text or tag is not None ) else getattr(sink, 'buffer', None)
+                self.decoder = (codecs.getincrementaldecoder(encoding)(errors='replace')
+                                if self.bsink is None else None)
+
+            def write_text(self, s:str, final:bool=False):
+                if self.prefix is None:
+                    if s:
+                        self.sink.write(s)
+                    return
+                self.pending += s
+                if final and self.pending and not self.pending.endswith('\n'):
+                    self.pending += '\n'
+                if '\n' not in self.pending:
+                    return
+                lines, _, self.pending = self.pending.rpartition('\n')
+                self.sink.write(''.join([ self.prefix+line+'\n' for line in lines.split('\n') ]))
+
+            def feed(self, data:bytes, flush:bool=True):
+                if self.decoder is not None:
+                    s = self.decoder.decode(data)
+                    self.write_text(s)
+                    if self.text:
+                        self.capture.append(s)
+                else:
+                    self.bsink.write(data)
+                if not self.text:
+                    self.capture.append(data)
+                if flush:
+                    self.sink.flush()
+
+            def close(self):
+                if self.decoder is not None:
+                    s = self.decoder.decode(b'', final=True)
+                    self.write_text(s, final=True)
+                    if self.text:
+                        self.capture.append(s)
+                try:
+                    self.sink.flush()
+                except (OSError, ValueError):
+                    pass
     
-                finally:
-                    del frm
-
-    ########## ____STREAMEXTD_TEMPLATE_END____ ##########
+        def trace_span(self, cmdargs:list, tid:int=None):
+            """ Span of the command in the trace of PyEncase (no-op when not traced) """
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            return __outer__.Tracer.span(__outer__.Tracer.command_name(cmdargs), cat='subprocess', tid=tid,
+                                         argv=' '.join([ str(x) for x in cmdargs ]))
 
-    class ExtCmdIF(StreamExtd):
-    
-        def __init__(self, verbose=False, dry_run=False, encoding='utf-8', **args):
-            super().__init__(**args)
-            self.verbose  = verbose
-            self.dry_run  = dry_run
-            self.encoding = encoding
-    
         def invoke_simple(self, cmdargs:list, verbose:bool=None, dry_run:bool=None,
                           check:bool=True, text:bool=True, hook=None,
                           more_upper:bool=False, encoding=None, **args):
@@ -1729,8 +5178,10 @@ class PyEncase(object):
             ret = subprocess.CompletedProcess(cmdargs, returncode=0, stdout='', stderr='')
             if not f_dry_run:
                 try:
-                    ret = subprocess.run(list(cmdargs), encoding=o_encoding, check=check, 
-                                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+                    with self.trace_span(cmdargs) as span:
+                        ret = subprocess.run(list(cmdargs), encoding=o_encoding, check=check, 
+                                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+                        span.set(returncode=ret.returncode)
                     if f_verbose:
                         self.stderr.write("Return code(%s): %d" % (cmdargs[0], ret.returncode, ), more_upper=more_upper)
                         if ret.stdout:
@@ -1746,17 +5197,25 @@ class PyEncase(object):
 
         def invoke(self, cmdargs:list, verbose:bool=None, dry_run:bool=None,
                    check:bool=True, text:bool=True, hook=None,
-                   more_upper:bool=False, encoding=None, **args):
-        
+                   more_upper:bool=False, encoding=None,
+                   capture_limit:int=None, capture_mode:str=None, **args):
+            """
+            Run the command with its output streamed to stdout/stderr, and captured
+            (bounded by capture_limit/capture_mode, see OutputCapture) into the
+            CompletedProcess passed to hook.
+            """
             f_verbose = self.verbose if verbose is None else bool(verbose)
             f_dry_run = self.dry_run if dry_run is None else bool(dry_run)
             o_encoding = encoding if encoding else self.encoding
+            o_capt_limit = self.capture_limit if capture_limit is None else capture_limit
+            o_capt_mode  = capture_mode if capture_mode in self.__class__.CAPTURE_MODES else self.capture_mode
         
             if isinstance(cmdargs[0], (list, tuple)):
                 buf = [self.invoke(cmdargs=list(cmdarg), verbose=f_verbose,
                                    dry_run=f_dry_run, check=check, text=text,
                                    hook=hook, more_upper=more_upper,
-                                   encoding=o_encoding, **args) for cmdarg in cmdargs ]
+                                   encoding=o_encoding, capture_limit=o_capt_limit,
+                                   capture_mode=o_capt_mode, **args) for cmdarg in cmdargs ]
                 return tuple(buf) if isinstance(cmdargs, tuple) else buf
         
             if f_verbose or f_dry_run:
@@ -1771,16 +5230,32 @@ class PyEncase(object):
                 #    hook(cmdargs, ret, **args)
                 return int(ret.returncode)
         
+            span = self.trace_span(cmdargs).start()
             try:
-                stdout_chunks = []
-                stderr_chunks = []
-        
+                stdout_capt = self.__class__.OutputCapture(text=text, limit=o_capt_limit,
+                                                           mode=o_capt_mode, encoding=o_encoding)
+                stderr_capt = self.__class__.OutputCapture(text=text, limit=o_capt_limit,
+                                                           mode=o_capt_mode, encoding=o_encoding)
+                stdout_tee  = self.__class__.OutputTee(self.streams.stdout.stream, stdout_capt,
+                                                       text=text, encoding=o_encoding)
+                stderr_tee  = self.__class__.OutputTee(self.streams.stderr.stream, stderr_capt,
+                                                       text=text, encoding=o_encoding)
+                read_size_min = self.__class__.READ_SIZE_MIN
+                stdin_size    = self.__class__.STDIN_READ_SIZE
+        
+                import platform
                 interactive = sys.stdin.isatty()
                 system      = platform.system().lower()
                 use_pty  = interactive and system in ('linux', 'darwin')
         
+                def _read_stdin():
+                    """ Whatever is available on stdin (up to stdin_size) by one read """
+                    buf = sys.stdin.buffer
+                    return (buf.read1(stdin_size) if hasattr(buf, 'read1') else buf.read(1))
+
                 if use_pty: # use pty on Linux/maxOS and tty available.
                     import pty
+                    import threading
                     master_fd, slave_fd = pty.openpty()
         
                     subproc = subprocess.Popen(list(cmdargs), stdin=slave_fd,
@@ -1789,7 +5264,7 @@ class PyEncase(object):
         
                     def _from_child():
                         """ Text capture from child proess to tty"""
-                        unitsize=32 # 1024
+                        unitsize = read_size_min
                         try:
                             while True:
                                 try:
@@ -1798,20 +5273,11 @@ class PyEncase(object):
                                     break
                                 if not data:
                                     break
-                                if text:
-                                    s = data.decode(o_encoding, errors='replace')
-                                    self.streams.stdout.stream.write(s)
-                                    self.streams.stdout.stream.flush()
-                                    stdout_chunks.append(s)
-                                else:
-                                    try:
-                                        self.streams.stdout.stream.buffer.write(data)
-                                    except AttributeError:
-                                        b = data.decode(o_encoding, errors='replace')
-                                        self.streams.stdout.stream.write(b)
-                                    self.streams.stdout.stream.flush()
-                                    stdout_chunks.append(data)
+                                # Flush only when the pty is drained (short read)
+                                stdout_tee.feed(data, flush=(len(data) < unitsize))
+                                unitsize = self.__class__.adapt_read_size(unitsize, len(data))
                         finally:
+                            stdout_tee.close()
                             try:
                                 os.close(master_fd)
                             except OSError:
@@ -1823,10 +5289,9 @@ class PyEncase(object):
                     if interactive:
                         def _to_child():
                             """ Text flow from parent process (tty) to child process"""
-                            unitsize=1
                             try:
                                 while True:
-                                    data = sys.stdin.buffer.read(unitsize)
+                                    data = _read_stdin()
                                     if not data:
                                         break
                                     try:
@@ -1844,42 +5309,35 @@ class PyEncase(object):
                     
                     # stdout/stderr are unified in pty
                     ret = subprocess.CompletedProcess(cmdargs, returncode=ret_code,
-                                                      stdout=(''.join(stdout_chunks) if text
-                                                              else b''.join(stdout_chunks)),
+                                                      stdout=stdout_capt.getvalue(),
                                                       stderr=(null_txt))
                 else: # Platform other than Linux/macOS w/ tty : use asyncio
+                    import asyncio
 
                     async def _run_async():
                         subproc = await asyncio.create_subprocess_exec(*cmdargs,
                                                                        stdin=asyncio.subprocess.PIPE,
                                                                        stdout=asyncio.subprocess.PIPE,
-                                                                       stderr=asyncio.subprocess.PIPE)
+                                                                       stderr=asyncio.subprocess.PIPE,
+                                                                       limit=self.__class__.READ_SIZE_MAX)
         
-                        async def _read_stream(stream, sink, chunks):
-                            unitsize=32 #1024
-                            while True:
-                                data = await stream.read(unitsize)
-                                if not data:
-                                    break
-                                if text:
-                                    s = data.decode(o_encoding, errors='replace')
-                                    sink.write(s)
-                                    sink.flush()
-                                    chunks.append(s)
-                                else:
-                                    try:
-                                        sink.buffer.write(data)
-                                    except AttributeError:
-                                        sink.write(data.decode(o_encoding, errors='replace'))
-                                    sink.flush()
-                                    chunks.append(data)
+                        async def _read_stream(stream, tee):
+                            unitsize = read_size_min
+                            try:
+                                while True:
+                                    data = await stream.read(unitsize)
+                                    if not data:
+                                        break
+                                    tee.feed(data, flush=(len(data) < unitsize))
+                                    unitsize = self.__class__.adapt_read_size(unitsize, len(data))
+                            finally:
+                                tee.close()
         
                         async def _forward_stdin():
-                            unitsize=1
                             # Thread looping due to blocking sys.stdin.read
                             loop = asyncio.get_running_loop()
                             while True:
-                                data = await loop.run_in_executor(None, sys.stdin.buffer.read, unitsize)
+                                data = await loop.run_in_executor(None, _read_stdin)
                                 if not data:
                                     break
                                 subproc.stdin.write(data)
@@ -1892,22 +5350,30 @@ class PyEncase(object):
                             except Exception:
                                 pass
         
-                        tasks = [_read_stream(subproc.stdout, self.streams.stdout.stream, stdout_chunks),
-                                 _read_stream(subproc.stderr, self.streams.stderr.stream, stderr_chunks), ]
+                        tasks = [_read_stream(subproc.stdout, stdout_tee),
+                                 _read_stream(subproc.stderr, stderr_tee), ]
                         if interactive:
                             tasks.append(_forward_stdin())
         
                         await asyncio.gather(*tasks)
-                        ret_code = await subproc.wait()
-        
-                        return subprocess.CompletedProcess(cmdargs,
-                                                           returncode=ret_code,
-                                                           stdout=(''.join(stdout_chunks) if text
-                                                                   else b''.join(stdout_chunks)),
-                                                           stderr=(''.join(stderr_chunks) if text
-                                                                   else b''.join(stderr_chunks)))
+                        return await subproc.wait()
         
-                    ret = asyncio.run(_run_async())
+                    # Only the return code goes through asyncio.run: a large value
+                    # returned by the coroutine made it allocate several times its size
+                    ret_code = asyncio.run(_run_async())
+                    ret = subprocess.CompletedProcess(cmdargs, returncode=ret_code,
+                                                      stdout=stdout_capt.getvalue(),
+                                                      stderr=stderr_capt.getvalue())
+
+                if f_verbose:
+                    for strm_name,capt in (('stdout', stdout_capt), ('stderr', stderr_capt)):
+                        if capt.dropped > 0:
+                            self.stderr.write("Captured %s of %s is truncated: first %d %s dropped (limit: %d)"
+                                              % (strm_name, cmdargs[0], capt.dropped,
+                                                 'characters' if text else 'bytes', capt.limit),
+                                              more_upper=more_upper)
+                stdout_capt.close()
+                stderr_capt.close()
 
                 # Equivalent to subprocess.run(check=True) 
                 if check and ret.returncode != 0:
@@ -1919,15 +5385,297 @@ class PyEncase(object):
         
             except Exception as e:
                 self.stderr.write(f"Exec ERROR ({e})", more_upper=more_upper)
+                span.set(error=str(e))
+            span.stop(returncode=ret.returncode)
         
             if callable(hook):
                 hook(cmdargs, ret, **args)
         
             return int(ret.returncode)
 
+        def invoke_concurrent(self, cmdargs:list, jobs:int=0, tags:list=None, depends:dict=None,
+                              verbose:bool=None, dry_run:bool=None,
+                              check:bool=True, text:bool=True, hook=None,
+                              more_upper:bool=False, encoding=None,
+                              capture_limit:int=None, capture_mode:str=None, **args):
+            """
+            Run the commands concurrently (at most 'jobs' at a time, all if jobs <= 0) on one
+            event loop. Output lines are prefixed by the tag of the command, return codes (and
+            hook calls) come in submission order. depends maps the index of a command to the
+            indices of earlier commands that must have finished first; with check, the command
+            is not run (return code SKIPPED_RETURN_CODE) when one of them failed.
+            """
+            f_verbose = self.verbose if verbose is None else bool(verbose)
+            f_dry_run = self.dry_run if dry_run is None else bool(dry_run)
+            o_encoding = encoding if encoding else self.encoding
+            o_capt_limit = self.capture_limit if capture_limit is None else capture_limit
+            o_capt_mode  = capture_mode if capture_mode in self.__class__.CAPTURE_MODES else self.capture_mode
+
+            cmdargs = [ list(x) for x in cmdargs ]
+            n_cmds  = len(cmdargs)
+            tags    = ( list(tags) if tags is not None else
+                        [ '%s#%d' % (os.path.basename(str(x[0])), i+1) for i,x in enumerate(cmdargs) ] )
+            depends = { int(k): sorted(set(v)) for k,v in (depends or {}).items() if v }
+            for idx,deps in depends.items():
+                if any([ ( d < 0 or d >= idx ) for d in deps ]):
+                    raise ValueError("Command #%d depends on a command not submitted before it: %s" % (idx, deps))
+            tag_width = max([ len(x) for x in tags ]+[0])
+            tags      = [ x.ljust(tag_width) for x in tags ]
+
+            null_txt = '' if text else b''
+            results  = [ subprocess.CompletedProcess(x, returncode=0, stdout=null_txt, stderr=null_txt)
+                         for x in cmdargs ]
+
+            if f_verbose or f_dry_run:
+                for idx,cmdarg in enumerate(cmdargs):
+                    self.stderr.write("Exec [%s]: '%s'%s"
+                                      % (tags[idx].rstrip(), ' '.join(cmdarg),
+                                         (' (after %s)' % (', '.join([ tags[d].rstrip() for d in depends[idx] ]), )
+                                          if idx in depends else '')), more_upper=more_upper)
+            if f_dry_run or n_cmds < 1:
+                return [ 0 for x in cmdargs ]
+
+            import asyncio
+
+            read_size_min = self.__class__.READ_SIZE_MIN
+            # Overlapping commands run on one thread: one track per command in the trace
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            lane_tids = [ __outer__.Tracer.lane('[%s]' % (x.rstrip(), )) for x in tags ]
+
+            async def _read_stream(stream, tee):
+                unitsize = read_size_min
+                try:
+                    while True:
+                        data = await stream.read(unitsize)
+                        if not data:
+                            break
+                        tee.feed(data, flush=(len(data) < unitsize))
+                        unitsize = self.__class__.adapt_read_size(unitsize, len(data))
+                finally:
+                    tee.close()
+
+            async def _run_all():
+                semaphore = asyncio.Semaphore(jobs if jobs and jobs > 0 else n_cmds)
+                finished  = [ asyncio.Event() for x in cmdargs ]
+
+                async def _run_one(idx):
+                    try:
+                        for dep in depends.get(idx, []):
+                            await finished[dep].wait()
+                        failed = [ d for d in depends.get(idx, []) if results[d].returncode != 0 ]
+                        if check and failed:
+                            self.stderr.write("Skipped [%s]: '%s' (failed: %s)"
+                                              % (tags[idx].rstrip(), ' '.join(cmdargs[idx]),
+                                                 ', '.join([ tags[d].rstrip() for d in failed ])),
+                                              more_upper=more_upper)
+                            results[idx].returncode = self.__class__.SKIPPED_RETURN_CODE
+                            return
+                        async with semaphore:
+                            span  = self.trace_span(cmdargs[idx], tid=lane_tids[idx]).start()
+                            capts = [ self.__class__.OutputCapture(text=text, limit=o_capt_limit,
+                                                                   mode=o_capt_mode, encoding=o_encoding)
+                                      for x in range(2) ]
+                            tees  = [ self.__class__.OutputTee(strm.stream, capt, text=text,
+                                                               encoding=o_encoding, tag=tags[idx])
+                                      for strm,capt in zip((self.streams.stdout, self.streams.stderr), capts) ]
+                            try:
+                                subproc = await asyncio.create_subprocess_exec(*cmdargs[idx],
+                                                                               stdin=asyncio.subprocess.DEVNULL,
+                                                                               stdout=asyncio.subprocess.PIPE,
+                                                                               stderr=asyncio.subprocess.PIPE,
+                                                                               limit=self.__class__.READ_SIZE_MAX)
+                                await asyncio.gather(_read_stream(subproc.stdout, tees[0]),
+                                                     _read_stream(subproc.stderr, tees[1]))
+                                ret_code = await subproc.wait()
+                            except OSError as e:
+                                self.stderr.write("Exec ERROR [%s] (%s)" % (tags[idx].rstrip(), e), more_upper=more_upper)
+                                ret_code = 127
+                            results[idx] = subprocess.CompletedProcess(cmdargs[idx], returncode=ret_code,
+                                                                       stdout=capts[0].getvalue(),
+                                                                       stderr=capts[1].getvalue())
+                            for capt in capts:
+                                capt.close()
+                            span.stop(returncode=ret_code)
+                            if f_verbose or ret_code != 0:
+                                self.stderr.write("Return code(%s): %d" % (tags[idx].rstrip(), ret_code),
+                                                  more_upper=more_upper)
+                    finally:
+                        finished[idx].set()
+
+                await asyncio.gather(*[ _run_one(idx) for idx in range(n_cmds) ])
+
+            asyncio.run(_run_all())
+
+            if callable(hook):
+                for idx,ret in enumerate(results):
+                    hook(cmdargs[idx], ret, **args)
+
+            return [ int(ret.returncode) for ret in results ]
+
         
+    class HostingAPICache(StreamExtd):
+        """
+        Results of 'gh api'/'glab api', fetched on first use and kept on disk in
+        $XDG_CACHE_HOME/py-encase/hosting_api.json for PY_ENCASE_HOSTING_CACHE_TTL
+        seconds (default: 86400, 0: no disk cache). Entries are keyed by the service,
+        the CLI, its host and a digest of its token and of its login state (path and
+        mtime of the auth file of the CLI, rewritten by 'gh auth login/switch' etc.), so
+        that another account does not see them. Existence probes of repositories are
+        only kept for the invocation.
+        """
+        CACHE_FILE  = 'hosting_api.json'
+        TTL         = 86400
+        MAX_ENTRIES = 64
+        FAILED      = object()
+
+        def __init__(self, cli_path:str, service:str, host_envs=(), token_envs=(), auth_files=(),
+                     ttl:int=None, **kwds):
+            super().__init__(**kwds)
+            self.cli_path = cli_path
+            self.service  = service
+            self.scope    = self.__class__.scope_of(cli_path, service, host_envs, token_envs, auth_files)
+            try:
+                self.ttl = int(ttl if ttl is not None else
+                               os.environ.get('PY_ENCASE_HOSTING_CACHE_TTL', self.__class__.TTL))
+            except ValueError:
+                self.ttl = self.__class__.TTL
+            self.memo   = {}
+            self.probed = {}
+
+        @classmethod
+        def scope_of(cls, cli_path:str, service:str, host_envs=(), token_envs=(), auth_files=()):
+            import hashlib
+            auth = [ os.environ.get(x, '') for x in token_envs ]
+            for path in auth_files:
+                try:
+                    st = os.stat(path)
+                    auth.append("%s:%d:%d" % (os.path.realpath(path), st.st_mtime_ns, st.st_size))
+                except OSError:
+                    auth.append('')
+            return '|'.join([service, os.path.realpath(cli_path) if cli_path else '',
+                             '|'.join([ os.environ.get(x, '') for x in host_envs ]),
+                             hashlib.sha256('|'.join(auth).encode('utf-8')).hexdigest()[:16] if any(auth) else ''])
+
+        @classmethod
+        def config_path(cls, dir_env:str, subdir:str, filename:str):
+            """ Config file of a CLI: $<dir_env>/filename or $XDG_CONFIG_HOME/subdir/filename """
+            config_dir = ( os.environ.get(dir_env) or
+                           os.path.join(os.environ.get('XDG_CONFIG_HOME') or
+                                        os.path.join(os.path.expanduser('~'), '.config'), subdir) )
+            return os.path.join(config_dir, filename)
+
+        @classmethod
+        def cache_path(cls):
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            return os.path.join(cache_home, 'py-encase', cls.CACHE_FILE)
+
+        @classmethod
+        def parse_pages(cls, text:str):
+            """ JSON of the output, pages of '--paginate' (concatenated values) merged """
+            decoder = json.JSONDecoder()
+            pages   = []
+            pos     = 0
+            text    = text.strip()
+            while pos < len(text):
+                value, pos = decoder.raw_decode(text, pos)
+                pages.append(value)
+                while pos < len(text) and text[pos].isspace():
+                    pos += 1
+            if len(pages) == 1:
+                return pages[0]
+            return ( [ x for page in pages for x in page ]
+                     if all([ isinstance(x, list) for x in pages ]) else pages )
+
+        def run_api(self, endpoint:str, paginate:bool=False, transform=None):
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            ret = __outer__.Tracer.run([self.cli_path, 'api', endpoint]+(['--paginate'] if paginate else []),
+                                       check=True, capture_output=True, text=True)
+            data = self.__class__.parse_pages(ret.stdout)
+            return transform(data) if callable(transform) else data
+
+        def lookup(self, endpoint:str):
+            """ Memo or fresh disk entry of endpoint (FAILED if none) """
+            if endpoint in self.memo:
+                return self.memo[endpoint]
+            if self.ttl > 0:
+                __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+                ent = __outer__.json_cache_read(self.__class__.cache_path()).get(self.scope+'|'+endpoint)
+                if isinstance(ent, dict) and 0 <= time.time()-ent.get('time', 0) < self.ttl:
+                    self.memo[endpoint] = ent.get('data')
+                    return self.memo[endpoint]
+            return self.__class__.FAILED
+
+        def store(self, fetched:dict):
+            """ Keep the successful results of {endpoint: data} in the memo and on disk """
+            fetched = { k: v for k,v in fetched.items() if v is not self.__class__.FAILED }
+            self.memo.update(fetched)
+            if self.ttl <= 0 or len(fetched) < 1:
+                return
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            path    = self.__class__.cache_path()
+            entries = __outer__.json_cache_read(path)
+            t_now   = time.time()
+            for endpoint,data in fetched.items():
+                entries.pop(self.scope+'|'+endpoint, None)
+                entries[self.scope+'|'+endpoint] = {'time': t_now, 'data': data}
+            while len(entries) > self.__class__.MAX_ENTRIES:
+                entries.pop(next(iter(entries)))
+            __outer__.json_cache_write(path, entries)
+
+        def fetch_all(self, requests:list):
+            """
+            [(endpoint, paginate, transform), ...] not in the memo/disk cache, fetched
+            concurrently. Returns {endpoint: data} (None on failure, reported once).
+            """
+            results = { x[0]: self.lookup(x[0]) for x in requests }
+            missing = [ x for x in requests if results[x[0]] is self.__class__.FAILED ]
+            if self.cli_path and missing:
+                def fetch(req):
+                    try:
+                        return self.run_api(*req)
+                    except Exception as e:
+                        self.stderr.write(f'{self.__class__.__name__}({self.service}): api {req[0]} Error: {e}')
+                        return self.__class__.FAILED
+                if len(missing) == 1:
+                    fetched = { missing[0][0]: fetch(missing[0]) }
+                else:
+                    import concurrent.futures
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                        fetched = dict(zip([ x[0] for x in missing ], executor.map(fetch, missing)))
+                self.store(fetched)
+                results.update(fetched)
+                # Failures are not retried in this invocation
+                self.memo.update({ k: None for k,v in fetched.items() if v is self.__class__.FAILED })
+            return { k: (None if v is self.__class__.FAILED else v) for k,v in results.items() }
+
+        def get(self, endpoint:str, paginate:bool=False, transform=None):
+            return self.fetch_all([(endpoint, paginate, transform)]).get(endpoint)
+
+        def probe(self, endpoint:str):
+            """ True/False if endpoint exists or not (HTTP 404), None if unknown """
+            if endpoint in self.probed:
+                return self.probed[endpoint]
+            if not self.cli_path:
+                return None
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            try:
+                ret = __outer__.Tracer.run([self.cli_path, 'api', endpoint], capture_output=True, text=True)
+                exists = ( True if ret.returncode == 0 else
+                           (False if re.search(r'\b404\b|not found', ret.stderr, re.I) else None) )
+                if exists is None:
+                    self.stderr.write(f'{self.__class__.__name__}({self.service}): api {endpoint} Error: {ret.stderr.strip()}')
+            except OSError as e:
+                self.stderr.write(f'{self.__class__.__name__}({self.service}): api {endpoint} Error: {e}')
+                exists = None
+            self.probed[endpoint] = exists
+            return exists
+
     class GitHubIF(StreamExtd):
         DEFAULT = {'gh_cmd':  'gh'}
+        # name: (endpoint, paginate, transform) of the metadata fetched by HostingAPICache
+        API     = {'user':      ('user', False, lambda d: {'login': d['login'], 'id': d['id']}),
+                   'licenses':  ('/licenses', True, lambda d: [ x.get('key') for x in d ]),
+                   'gitignore': ('/gitignore/templates', True, None)}
     
         def __init__(self, opts:argparse.Namespace=None, gh_cmd=None, **kwds):
             super().__init__(**{k: v for k in kwds.items()
@@ -1937,32 +5685,47 @@ class PyEncase(object):
                             os.environ.get('GITHUB_CLI', self.__class__.DEFAULT['gh_cmd'])))
             
             self.gh_path   = shutil.which(self.gh_cmd)
-            self.gh_username   = None
-            self.gh_user_id    = None
-            self.gh_user_email = None
-            self.gh_available  = False
-            self.gh_repos      = None
-            self.gh_licences   = []
-            self.gh_gitignore  = []
-            if self.gh_path:
-                try:
-                    gh_ret = subprocess.run([self.gh_path, 'api', 'user'],
-                                            check=True, capture_output=True, text=True)
-                    gh_userinfo = json.loads(gh_ret.stdout)
-                    self.gh_username   = gh_userinfo['login']
-                    self.gh_user_id    = gh_userinfo['id']
-                    self.gh_user_email = f"{self.gh_user_id}+{self.gh_username}@users.noreply.github.com"
-                    self.gh_available  = True
-                    gh_ret = subprocess.run([self.gh_path, 'api', '/licenses', '--paginate'],
-                                            check=True, capture_output=True, text=True)
-                    self.gh_licences  = [ x.get('key') for x in  json.loads(gh_ret.stdout) ]
-                    gh_ret = subprocess.run([self.gh_path, 'api', '/gitignore/templates', '--paginate'],
-                                            check=True, capture_output=True, text=True)
-                    self.gh_gitignore = json.loads(gh_ret.stdout)
-                except Exception as e:
-                    self.stderr.write(f'{self.__class__.__name__}.__init__() Error: {e}')
-                    pass
+            self.gh_repos  = None
+            # Metadata is fetched (or read from the disk cache) on first use
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            self.api_cache = __outer__.HostingAPICache(self.gh_path, 'github', host_envs=('GH_HOST', ),
+                                                       token_envs=('GH_TOKEN', 'GITHUB_TOKEN'),
+                                                       auth_files=(__outer__.HostingAPICache.config_path('GH_CONFIG_DIR', 'gh',
+                                                                                                         'hosts.yml'), ))
+
+        def api_data(self, *names):
+            """ Metadata by the names of API (fetched concurrently), None for a failure """
+            buf = self.api_cache.fetch_all([ self.__class__.API[x] for x in names ])
+            return [ buf.get(self.__class__.API[x][0]) for x in names ]
+
+        @property
+        def gh_userinfo(self):
+            return self.api_data('user')[0] if self.gh_path else None
+
+        @property
+        def gh_available(self):
+            return self.gh_userinfo is not None
 
+        @property
+        def gh_username(self):
+            return (self.gh_userinfo or {}).get('login')
+
+        @property
+        def gh_user_id(self):
+            return (self.gh_userinfo or {}).get('id')
+
+        @property
+        def gh_user_email(self):
+            return (f"{self.gh_user_id}+{self.gh_username}@users.noreply.github.com"
+                    if self.gh_available else None)
+
+        @property
+        def gh_licences(self):
+            return (self.api_data('licenses')[0] or []) if self.gh_available else []
+
+        @property
+        def gh_gitignore(self):
+            return (self.api_data('gitignore')[0] or []) if self.gh_available else []
 
         def __bool__(self):
             return bool(self.gh_available)
@@ -1970,9 +5733,7 @@ class PyEncase(object):
         def get_repos(self):
             if self.gh_available:
                 try:
-                    result = subprocess.run([self.gh_path, 'api', 'user/repos', '--paginate'],
-                                            check=True, capture_output=True, text=True)
-                    repos = json.loads(result.stdout)
+                    repos = self.api_cache.run_api('user/repos', paginate=True)
                     return { r['name']: (r['full_name'],
                                          r['html_url'],
                                          r['clone_url'],
@@ -1981,15 +5742,20 @@ class PyEncase(object):
                     self.stderr.write(f'{self.__class__.__name__}.get_repos() Error: {e}')
             return {}
     
-        def chk_repos(self, module, subdir=''):
+        def chk_repos(self, module, subdir='', owner=None):
             if not self.gh_available:
                 return None
-            if self.gh_repos is None:
-                self.gh_repos = self.get_repos()
-    
             mod_path = '_'.join([subdir.replace(os.sep, '_', module)]) if subdir else module
-    
-            return not (self.gh_repos.get(mod_path) is None)
+            # One targeted probe instead of the whole list of repositories (get_repos())
+            return bool(self.api_cache.probe(f'repos/{owner if owner else self.gh_username}/{mod_path}'))
+
+        def repo_owner(self, opts:argparse.Namespace=None, permit=None, team_name=None):
+            """ Account or organization the repository is created in """
+            if hasattr(opts, 'git_remote_account') and opts.git_remote_account:
+                return opts.git_remote_account
+            if permit=='internal' and team_name and '/' in team_name:
+                return team_name.split('/', 1)[0]
+            return self.gh_username
     
 
         @property
@@ -1997,6 +5763,7 @@ class PyEncase(object):
             return (self.gh_username, self.gh_user_email)
 
         def guess_user(self, opts:argparse.Namespace=None, account=None):
+            import getpass
             github_account = ( opts.git_remote_account if (hasattr(opts, 'git_remote_account')
                                                            and opts.git_remote_account) else
                                (account if account else 
@@ -2034,20 +5801,25 @@ class PyEncase(object):
                                 team_name=None, remote_name=None, source=None,
                                 add_readme=False, add_license=None, add_gitignore=None):
             
+            # Independent metadata in one go (concurrently, unless cached)
+            self.api_data(*(['user']+(['licenses'] if add_license else [])
+                            +(['gitignore'] if add_gitignore else [])))
             if not self.gh_available:
                 return None
     
-            if self.chk_repos(module=module, subdir=subdir):
-                self.stderr.write(f'{self.__class__.__name__}.setup_repo(): Repository already exists on GitHub: {module}\n')
+            owner = self.repo_owner(opts=opts, permit=permit, team_name=team_name)
+            if self.chk_repos(module=module, subdir=subdir, owner=owner):
+                self.stderr.write(f'{self.__class__.__name__}.setup_repo(): Repository already exists on GitHub: {owner}/{module}\n')
                 return False
     
             mod_path = '_'.join([subdir.replace(os.sep, '_', module)]) if subdir else module
-            cmd_args = [self.gh_path, 'repo',  'create', mod_path]
+            cmd_args = [self.gh_path, 'repo',  'create',
+                        mod_path if owner == self.gh_username else f'{owner}/{mod_path}']
             if description:
                 cmd_args.extend(['--description', description])
     
             if permit=='internal' and team_name:
-                cmd_args.extend(['--internal', '--team', team_name])
+                cmd_args.extend(['--internal', '--team', team_name.split('/')[-1]])
             elif permit=='public':
                 cmd_args.append('--public')
             elif permit=='private':
@@ -2090,6 +5862,8 @@ class PyEncase(object):
     
     class GitLabIF(StreamExtd):
         DEFAULT = {'glab_cmd':  'glab'}
+        # name: (endpoint, paginate, transform) of the metadata fetched by HostingAPICache
+        API     = {'user': ('user', False, lambda d: {'username': d['username'], 'id': d['id']})}
     
         def __init__(self, opts:argparse.Namespace=None, glab_cmd=None, **kwds):
             super().__init__(**{k: v for k in kwds.items()
@@ -2098,22 +5872,40 @@ class PyEncase(object):
                              (glab_cmd if glab_cmd else
                               os.environ.get('GITLAB_CLI', self.__class__.DEFAULT['glab_cmd'])))
             self.glab_path = shutil.which(self.glab_cmd)
-            self.glab_username   = None
-            self.glab_user_id    = None
-            self.glab_user_email = None
-            self.glab_available  = False
             self.glab_repos      = None
-            if self.glab_path:
-                try:
-                    glab_ret = subprocess.run([self.glab_path, 'api', 'user'],
-                                            check=True, capture_output=True, text=True)
-                    glab_userinfo = json.loads(glab_ret.stdout)
-                    self.glab_username   = glab_userinfo['username']
-                    self.glab_user_id    = glab_userinfo['id']
-                    self.glab_user_email = f"{self.glab_user_id}-{self.glab_username}@users.noreply.gitlab.com"
-                    self.glab_available  = True
-                except Exception as e:
-                    self.stderr.write(f'{self.__class__.__name__}.__init__() Error: {e}')
+            # Metadata is fetched (or read from the disk cache) on first use
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            self.api_cache = __outer__.HostingAPICache(self.glab_path, 'gitlab',
+                                                       host_envs=('GITLAB_HOST', 'GL_HOST'),
+                                                       token_envs=('GITLAB_TOKEN', 'GL_TOKEN'),
+                                                       auth_files=(__outer__.HostingAPICache.config_path('GLAB_CONFIG_DIR', 'glab-cli',
+                                                                                                         'config.yml'), ))
+
+        def api_data(self, *names):
+            """ Metadata by the names of API (fetched concurrently), None for a failure """
+            buf = self.api_cache.fetch_all([ self.__class__.API[x] for x in names ])
+            return [ buf.get(self.__class__.API[x][0]) for x in names ]
+
+        @property
+        def glab_userinfo(self):
+            return self.api_data('user')[0] if self.glab_path else None
+
+        @property
+        def glab_available(self):
+            return self.glab_userinfo is not None
+
+        @property
+        def glab_username(self):
+            return (self.glab_userinfo or {}).get('username')
+
+        @property
+        def glab_user_id(self):
+            return (self.glab_userinfo or {}).get('id')
+
+        @property
+        def glab_user_email(self):
+            return (f"{self.glab_user_id}-{self.glab_username}@users.noreply.gitlab.com"
+                    if self.glab_available else None)
     
         def __bool__(self):
             return bool(self.glab_available)
@@ -2121,11 +5913,7 @@ class PyEncase(object):
         def get_repos(self):
             if self.glab_available:
                 try:
-                    result = subprocess.run([self.glab_path, 'api',
-                                             #'projects?membership=true&pagination=keyset&per_page=100'
-                                             'projects?membership=true&per_page=100'],
-                                            check=True, capture_output=True, text=True)
-                    repos = json.loads(result.stdout)
+                    repos = self.api_cache.run_api('projects?membership=true&per_page=100')
                     return { r['path']: (r['path_with_namespace'],
                                          r['web_url'],
                                          r['http_url_to_repo'],
@@ -2135,21 +5923,29 @@ class PyEncase(object):
     
             return {}
     
-        def chk_repos(self, module, subdir=''):
+        def chk_repos(self, module, subdir='', owner=None):
             if not self.glab_available:
                 return None
-            if self.glab_repos is None:
-                self.glab_repos = self.get_repos()
-    
+            import urllib.parse
             mod_path = '_'.join([subdir.replace(os.sep, '_', module)]) if subdir else module
-    
-            return not (self.glab_repos.get(mod_path) is None)
+            # One targeted probe instead of the list of projects (get_repos())
+            return bool(self.api_cache.probe('projects/'+urllib.parse.quote(f'{owner if owner else self.glab_username}/{mod_path}',
+                                                                            safe='')))
+
+        def repo_owner(self, opts:argparse.Namespace=None, permit=None, team_name=None):
+            """ User or group (namespace) the project is created in """
+            if permit=='internal' and team_name:
+                return team_name
+            if hasattr(opts, 'git_remote_account') and opts.git_remote_account:
+                return opts.git_remote_account
+            return self.glab_username
     
         @property
         def userinfo(self):
             return (self.glab_username, self.glab_user_email)
 
         def guess_user(self, opts:argparse.Namespace=None, account=None):
+            import getpass
             gitlab_account = ( opts.git_remote_account if (hasattr(opts, 'git_remote_account')
                                                            and opts.git_remote_account) else
                                (account if account else 
@@ -2189,8 +5985,9 @@ class PyEncase(object):
     
             if not self.glab_available:
                 return None
-            if self.chk_repos(module=module, subdir=subdir):
-                self.stderr.write(f'{self.__class__.__name__}.setup_repo(): Repository already exists on Gitlab: {module}\n')
+            owner = self.repo_owner(opts=opts, permit=permit, team_name=team_name)
+            if self.chk_repos(module=module, subdir=subdir, owner=owner):
+                self.stderr.write(f'{self.__class__.__name__}.setup_repo(): Repository already exists on Gitlab: {owner}/{module}\n')
                 return False
     
             mod_path = '_'.join([subdir.replace(os.sep, '_', module)]) if subdir else module
@@ -2207,6 +6004,9 @@ class PyEncase(object):
                 cmd_args.append('--private')
             else:
                 cmd_args.append('--private')
+
+            if owner != self.glab_username and '--group' not in cmd_args:
+                cmd_args.extend(['--group', owner])
     
             if proj_name:
                 cmd_args.extend(['--name', proj_name])
@@ -2251,6 +6051,7 @@ class PyEncase(object):
                      git_cmd=None,
                      remote_git_cmd=None,
                      ssh_port=None, ssh_opts=[], **kwds):
+            import getpass
             super().__init__(**{k: v for k in kwds.items()
                                 if k in ('stdin', 'stderr', 'stdout')})
     
@@ -2311,13 +6112,14 @@ class PyEncase(object):
         def get_repos_buf(self, rmtext='.git'):
             if self.gitrmt_available:
                 self.gitrmt_repos_buf = {}
+                __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
                 try:
-                    ret = subprocess.run(self.ssh_cmd_common
-                                         +['(', 'echo', 'top=', self.remote_dir, ';',
-                                           'find', self.remote_dir, 
-                                           '-follow', '\\(',  '-name',  '.git',  '-o',  '-name',  'HEAD', '\\)'
-                                           ')'],
-                                         check=True, capture_output=True, text=True)
+                    ret = __outer__.Tracer.run(self.ssh_cmd_common
+                                               +['(', 'echo', 'top=', self.remote_dir, ';',
+                                                 'find', self.remote_dir, 
+                                                 '-follow', '\\(',  '-name',  '.git',  '-o',  '-name',  'HEAD', '\\)'
+                                                 ')'],
+                                               check=True, capture_output=True, text=True)
                     if ret.returncode==0:
                         rmt_repos_dir = self.remote_dir
                         for line in ret.stdout.splitlines():
@@ -2374,9 +6176,10 @@ class PyEncase(object):
             if not self.gitrmt_available:
                 return path
             rmt_path = path
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
             try:
-                ret = subprocess.run(self.ssh_cmd_common+['(', 'echo', 'top=', path, ')'],
-                                     check=True, capture_output=True, text=True)
+                ret = __outer__.Tracer.run(self.ssh_cmd_common+['(', 'echo', 'top=', path, ')'],
+                                           check=True, capture_output=True, text=True)
                 if ret.returncode==0:
                     for line in ret.stdout.splitlines():
                         if line.startswith('top='):
@@ -2517,6 +6320,8 @@ class PyEncase(object):
                      subdir=None, gh_cmd=None, glab_cmd=None, ssh_cmd=None,
                      git_cmd=None, remote_git_cmd=None,
                      verbose=False, dry_run=False, encoding='utf-8', **kwds):
+            import getpass
+            import urllib.parse
             
             super().__init__(**{k: v for k in kwds.items()
                                 if k in ('verbose', 'dry_run', 'encoding',
@@ -2626,6 +6431,7 @@ class PyEncase(object):
 
         @property
         def userinfo(self):
+            import socket
             return (self.gitrmt_if.userinfo 
                     if self.gitrmt_if else 
                     (self.remote_account, 
@@ -2722,6 +6528,9 @@ class PyEncase(object):
             #cls.add_argument(arg_parser, opt_s='-g', opt_l='--git-command', help='git command')
             cls.add_argument(arg_parser, opt_s=None, opt_l='--gh-command', help='gh command')
             cls.add_argument(arg_parser, opt_s=None, opt_l='--glab-command', help='glab command')
+            cls.add_argument(arg_parser, opt_s=None, opt_l='--git-jobs', type=int, default=None,
+                             help=('Run independent steps of git setup concurrently, N at a time '
+                                   '(0: all, default: $PY_ENCASE_GIT_JOBS or 1 = sequential)'))
     
             return
 
@@ -2771,13 +6580,15 @@ class PyEncase(object):
             dot_git_dir = (local_git_dir if local_git_dir else
                            os.path.join(workdir, '.git'))
                         
-            cmdarg = [ self.git_path ]
+            cmdarg = [ self.git_path, 'config' ]
 
-            if dot_git_dir:
+            if mode in ('--global', '--system'):
+                cmdarg.append(mode)
+            elif dot_git_dir:
                 # '--git-dir',  dot_git_dir, '--work-tree', local_workdir, 
                 cmdarg.extend(['--file', os.path.join(dot_git_dir, 'config')])
             
-            cmdarg.extend(['config', mode, '--get', key])
+            cmdarg.extend(['--get', key])
                 
             git_cmd_args.append(cmdarg)
 
@@ -2787,18 +6598,29 @@ class PyEncase(object):
                                  key='user.email', mode='--global',
                                  local_workdir=None, local_git_dir=None,
                                  opts:argparse.Namespace=None):
-            try:
-                cmdargs = self.git_config_value_cmdargs(module=module, subdir=subdir,
-                                                        key=key, mode=mode,
-                                                        local_workdir=local_workdir,
-                                                        local_git_dir=local_git_dir,
-                                                        opts=opts, git_cmd_args=[])
-                ret = subprocess.run(cmdargs[0], check=True,
-                                     stdout=subprocess.PIPE,
-                                     stderr=subprocess.PIPE, text=True)
-                value = ret.stdout.strip()
-            except subprocess.CalledProcessError:
-                return None
+            """
+            Value of key from the memo of GitConfigCache: mode '--global'/'--system' reads
+            that scope, '--local'/'--file' the config file of the repository, and None the
+            effective value (repository, then global, then system).
+            """
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            cache     = __outer__.GitConfigCache
+            if mode in ('--global', '--system'):
+                return cache.get(key, git_cmd=self.git_path, scope=mode)
+
+            o_module = self.guess_module_name(opts=opts, module=module)
+            workdir  = ( local_workdir if local_workdir else 
+                         os.path.join(self.local_path, subdir, o_module))
+            config_path = os.path.join(local_git_dir if local_git_dir else
+                                       os.path.join(workdir, '.git'), 'config')
+            value = cache.get(key, git_cmd=self.git_path, config_file=config_path)
+            if mode in ('--local', '--file'):
+                return value
+            for scope in ('--global', '--system'):
+                if value is not None:
+                    break
+                value = cache.get(key, git_cmd=self.git_path, scope=scope)
+            return value
 
         def chk_git_config_value(self, module='', subdir='',
                                  key='user.email', mode='--global',
@@ -2843,6 +6665,8 @@ class PyEncase(object):
                                    opts:argparse.Namespace=None,
                                    user_name=None, user_email=None,
                                    dot_git_dir=None, git_cmd_args=[]):
+            import getpass
+            import socket
 
             o_module = self.guess_module_name(opts=opts, module=module)
             
@@ -2861,32 +6685,29 @@ class PyEncase(object):
             git_user_email = ( opts.git_user_email
                                if (hasattr(opts, 'git_user_email')
                                    and opts.git_user_email) else user_email )
-            
-            if isinstance(git_user_name, str) and git_user_name:
-                git_cmd_args.append([self.git_path,
-                                     'config', '--file', config_path,
-                                     'user.name', git_user_name])
-
-            elif not self.chk_git_config_value(module=module, subdir=subdir,
-                                               key='user.name', mode='--global',
-                                               local_workdir=workdir,
-                                               local_git_dir=dtgit_dir, opts=opts):
-                git_cmd_args.append([self.git_path,
-                                     'config', '--file', config_path,
-                                     'user.name', getpass.getuser()])
-
-                
-            if isinstance(git_user_email, str) and git_user_email:
-                git_cmd_args.append([self.git_path,
-                                     'config', '--file', config_path,
-                                     'user.email', git_user_email])
 
-            elif not self.chk_git_config_value(key='user.email', mode='--global',
-                                               local_workdir=workdir,
-                                               local_git_dir=dtgit_dir, opts=opts):
+            # All the checks are answered by two listings (the repository config and the
+            # global one) of GitConfigCache; writes of the value already in the repository
+            # config are dropped. git has no multi-key write: one 'git config' per key left.
+            updates = {}
+            for key,value,fallback in (('user.name', git_user_name, getpass.getuser),
+                                       ('user.email', git_user_email,
+                                        lambda : getpass.getuser()+'@'+socket.gethostname())):
+                if isinstance(value, str) and value:
+                    if self.get_git_config_value(module=module, subdir=subdir, key=key, mode='--file',
+                                                 local_workdir=workdir, local_git_dir=dtgit_dir,
+                                                 opts=opts) != value:
+                        updates[key] = value
+                elif not self.chk_git_config_value(module=module, subdir=subdir,
+                                                   key=key, mode=None,
+                                                   local_workdir=workdir,
+                                                   local_git_dir=dtgit_dir, opts=opts):
+                    updates[key] = fallback()
+
+            for key,value in updates.items():
                 git_cmd_args.append([self.git_path,
                                      'config', '--file', config_path,
-                                     'user.email', getpass.getuser()+'@'+socket.gethostname()])
+                                     key, value])
                 
             return git_cmd_args
 
@@ -2925,8 +6746,12 @@ class PyEncase(object):
                                  local_workdir=None,
                                  opts:argparse.Namespace=None,
                                  remote_url=None, local_git_dir=None, remote_name=None,                                
-                                 protocol=None, account=None, rmtext='.git', git_cmd_args=[]):
-
+                                 protocol=None, account=None, rmtext='.git', git_cmd_args=[], steps:list=None):
+            """
+            Command lines to connect the local repository to the remote one. When given,
+            steps is filled with the name of each command line appended: 'remote add',
+            'commit', 'push'.
+            """
             o_module = self.guess_module_name(opts=opts, module=module)
 
             workdir = ( local_workdir if local_workdir else 
@@ -2960,6 +6785,8 @@ class PyEncase(object):
                 git_cmd_args.append([self.git_path, 
                                      '--git-dir',  dot_git_dir, '--work-tree', workdir,
                                      'push', '-u', f'{rmt_name}', 'main'] )
+                if isinstance(steps, list):
+                    steps.extend(['remote add', 'commit', 'push'])
 
                 # git_cmd_args.append([self.git_path, 
                 #                      '--git-dir',  dot_git_dir, '--work-tree', local_workdir,
@@ -2972,6 +6799,17 @@ class PyEncase(object):
 
             return git_cmd_args
 
+        def git_jobs(self, opts:argparse.Namespace=None, jobs:int=None):
+            """ Number of git commands run at a time: --git-jobs, PY_ENCASE_GIT_JOBS, 1 (sequential) """
+            if hasattr(opts, 'git_jobs') and opts.git_jobs is not None:
+                return int(opts.git_jobs)
+            if jobs is not None:
+                return int(jobs)
+            try:
+                return int(os.environ.get('PY_ENCASE_GIT_JOBS', 1))
+            except ValueError:
+                return 1
+
         def setup_cmdargs(self, module=None, subdir='',
                           remote_setup=False,
                           set_upstream=False,
@@ -2988,13 +6826,21 @@ class PyEncase(object):
                           remote_url=None,
                           local_git_dir=None,
                           protocol=None, account=None, rmtext='.git',
-                          git_cmd_args=[]):
-
+                          git_cmd_args=[], depends:dict=None, tags:list=None):
+            """
+            Command lines of the setup. When given, depends/tags are filled for
+            invoke_concurrent: local init -> config -> (remote add, commit), one
+            after another for the writes to .git/config (git locks the file);
+            remote repository creation only waits for the local steps when it
+            pushes from them (push/source); push waits for all the others.
+            """
+            n_start = len(git_cmd_args)
             buf = self.init_local_cmdargs(module=module,
                                           subdir=subdir,
                                           local_workdir=local_workdir,
                                           opts=opts, share=share,
                                           git_cmd_args=git_cmd_args)
+            n_init = len(buf)
 
             buf = self.config_minimum_cmdargs(module=module,
                                               subdir=subdir,
@@ -3004,6 +6850,7 @@ class PyEncase(object):
                                               user_email=user_email,
                                               dot_git_dir=dot_git_dir,
                                               git_cmd_args=git_cmd_args)
+            n_config = len(buf)
 
             f_remote_setup = (opts.git_remote_setup
                               if (hasattr(opts, 'git_remote_setup')
@@ -3022,7 +6869,9 @@ class PyEncase(object):
                                                       add_readme=add_readme, add_license=add_license,
                                                       add_gitignore=add_gitignore,
                                                       git_cmd_args=git_cmd_args)
+            n_remote = len(buf)
 
+            upstream_names = []
             if f_set_upstream:
                 buf = self.set_upstream_cmdargs(module=module, subdir=subdir,
                                                 local_workdir=local_workdir,
@@ -3030,8 +6879,26 @@ class PyEncase(object):
                                                 local_git_dir=local_git_dir,
                                                 remote_name=remote_name,
                                                 protocol=protocol, account=account,
-                                                rmtext=rmtext, git_cmd_args=git_cmd_args)
-            
+                                                rmtext=rmtext, git_cmd_args=git_cmd_args,
+                                                steps=upstream_names)
+            n_upstream = len(buf)
+
+            if isinstance(depends, dict):
+                local_steps = list(range(n_start, n_config))
+                for idx in range(n_init, n_config):
+                    depends[idx] = list(range(n_start, idx))
+                if push or source:
+                    for idx in range(n_config, n_remote):
+                        depends[idx] = local_steps
+                # Steps not named by set_upstream_cmdargs() wait for all the preceding ones
+                for idx, step in itertools.zip_longest(range(n_remote, n_upstream), upstream_names[:n_upstream-n_remote]):
+                    depends[idx] = ( local_steps if step in ('remote add', 'commit') else
+                                     list(range(n_start, idx)) )
+            if isinstance(tags, list):
+                for name,n_from,n_to in (('init', n_start, n_init), ('config', n_init, n_config),
+                                         ('remote', n_config, n_remote), ('upstream', n_remote, n_upstream)):
+                    tags.extend([ name if n_to-n_from < 2 else '%s:%d' % (name, i+1)
+                                  for i in range(n_to-n_from) ])
             return buf
         
 
@@ -3053,8 +6920,11 @@ class PyEncase(object):
                   protocol=None, account=None, rmtext='.git',
                   verbose:bool=None, dry_run:bool=None,
                   check:bool=True, text:bool=True, hook=None,
-                  more_upper:bool=False, encoding=None, **args):
+                  more_upper:bool=False, encoding=None, jobs:int=None, **args):
 
+            n_jobs  = self.git_jobs(opts=opts, jobs=jobs)
+            depends = {} if n_jobs != 1 else None
+            tags    = [] if n_jobs != 1 else None
             cmdargs = self.setup_cmdargs(module=module,
                                          subdir=subdir,
                                          remote_setup=remote_setup,
@@ -3072,7 +6942,7 @@ class PyEncase(object):
                                          remote_url=remote_url,
                                          local_git_dir=local_git_dir,
                                          protocol=protocol, account=account, rmtext=rmtext,
-                                         git_cmd_args=[])
+                                         git_cmd_args=[], depends=depends, tags=tags)
 
             f_verbose = (opts.verbose if (hasattr(opts, 'verbose')
                                           and opts.verbose is not None) else verbose)
@@ -3082,9 +6952,21 @@ class PyEncase(object):
                          (opts.dryrun if (hasattr(opts, 'dryrun')
                                           and opts.dryrun is not None) else dry_run))
 
-            self.invoke(cmdargs=cmdargs, verbose=f_verbose, dry_run=f_dry_run,
-                        check=check, text=text, hook=hook,
-                        more_upper=more_upper, encoding=encoding, **args)
+            if len(cmdargs) < 1:
+                return
+            if n_jobs != 1:
+                ret = self.invoke_concurrent(cmdargs=cmdargs, jobs=n_jobs, tags=tags, depends=depends,
+                                             verbose=f_verbose, dry_run=f_dry_run,
+                                             check=check, text=text, hook=hook,
+                                             more_upper=more_upper, encoding=encoding, **args)
+            else:
+                ret = self.invoke(cmdargs=cmdargs, verbose=f_verbose, dry_run=f_dry_run,
+                                  check=check, text=text, hook=hook,
+                                  more_upper=more_upper, encoding=encoding, **args)
+            # The commands have written the repository config
+            __outer__ = globals().get(self.__class__.__qualname__.split('.')[0])
+            __outer__.GitConfigCache.invalidate()
+            return ret
 
     
     def manage_env(self, args:argparse.Namespace, rest:list=[]):
@@ -3112,11 +6994,17 @@ class PyEncase(object):
         tmplt_file  = self.seek_template_file(args, option='template', env_val='PY_ENCASE_TEMPLATE')
         
         modules   = args.module      if hasattr(args, 'module')     else []
+        pip_trans = self.__class__.PipTransaction(self)
+        pip_trans.add(modules, source='--module')
         scrptlibs = args.script_lib  if hasattr(args, 'script_lib') else []
         scripts   = args.scriptnames if hasattr(args, 'scriptnames') else []
 
         opt_kvfile = args.gui_kvfile    if hasattr(args, 'gui_kvfile')    else None
 
+        launcher_mode = args.launcher_mode if hasattr(args, 'launcher_mode') else None
+        launcher_mode = launcher_mode if launcher_mode else self.guess_launcher_mode()
+        flg_relink    = args.relink        if hasattr(args, 'relink')        else False
+
         script_template_style = args.script_template_style if hasattr(args, 'script_template_style') else self.__class__.SCRIPT_TEMPLATE_STYLES_DEFAULT
         scrlib_template_style = args.scrlib_template_style if hasattr(args, 'scrlib_template_style') else self.__class__.LIB_TEMPLATE_STYLES_DEFAULT
 
@@ -3127,12 +7015,7 @@ class PyEncase(object):
 
         if subcmd in ('init', 'add'):
             if hasattr(args, 'required_module') and args.required_module:
-                module_used = script_tmplt_info.get('modules', [])
-                
-                for m in module_used:
-                    if m in modules:
-                        continue
-                    modules.append(m)
+                pip_trans.add(script_tmplt_info.get('modules', []), source='template:'+script_template_style)
 
             scrlibs_used = script_tmplt_info.get('script_libs', [])
 
@@ -3143,13 +7026,8 @@ class PyEncase(object):
 
         if subcmd == ('addlib'):
 
-            module_used = scrlib_tmplt_info.get('modules', [])
-
             if hasattr(args, 'required_module') and args.required_module:
-                for m in module_used:
-                    if m in modules:
-                        continue
-                    modules.append(m)
+                pip_trans.add(scrlib_tmplt_info.get('modules', []), source='template:'+scrlib_template_style)
 
             scrlibs_used = scrlib_tmplt_info.get('script_libs', [])
 
@@ -3195,10 +7073,7 @@ class PyEncase(object):
             _scrlib_info = self.__class__.SCRIPT_STD_LIB.get(_scrlib)
             if _scrlib_info is None:
                 continue
-            for _m in _scrlib_info.get('pip_module', []):
-                if _m in modules:
-                    continue
-                modules.append(_m)
+            pip_trans.add(_scrlib_info.get('pip_module', []), source='script_lib:'+_scrlib)
 
         keyword_buf = {}
         keyword_buf.update(self.__class__.FILENAME_DEFAULT)
@@ -3242,15 +7117,20 @@ class PyEncase(object):
             readme_path = self.update_readme(keywords=keyword_buf, input_file=tmplt_file,
                                              bin_basenames=[x.removesuffix('.py') for x in scripts],
                                              lib_basenames=[x.removesuffix('.py') for x in scrptlibs],
-                                             flg_git=flg_git, backup=False,
+                                             flg_git=flg_git, backup=False, launcher_mode=launcher_mode,
                                              verbose=flg_verbose, dry_run=flg_dry_run)
 
         self.add_pyscr(basename=[x.removesuffix('.py') for x in scripts],
                        input_file=tmplt_file, keywords=keyword_buf,
                        start_marker=script_tmplt_info.get('start', r'\s*#{5,}\s*____PY_MAIN_TEMPLATE_START____\s*#{5,}'),
                        end_marker=script_tmplt_info.get('end',     r'\s*#{5,}\s*____PY_MAIN_TEMPLATE_END____\s*#{5,}'),
+                       launcher_mode=launcher_mode,
                        verbose=flg_verbose, dry_run=flg_dry_run)
 
+        if subcmd == 'init' and flg_relink:
+            self.relink_launchers(launcher_mode=(args.launcher_mode if hasattr(args, 'launcher_mode') else None),
+                                  dry_run=flg_dry_run, verbose=flg_verbose)
+
         self.add_pylib(basename=[x.removesuffix('.py') for x in scrptlibs],
                        input_file=tmplt_file, keywords=keyword_buf,
                        start_marker=scrlib_tmplt_info.get('start', r'\s*#{5,}\s*____PY_LIB_SCRIPT_TEMPLATE_START____\s*#{5,}'),
@@ -3263,13 +7143,20 @@ class PyEncase(object):
                            template_s_marker=None, templete_e_marker=None,
                            dry_run=flg_dry_run, verbose=flg_verbose)
 
-        if len(modules)>0:
-            self.run_pip(subcmd='install', args=modules, verbose=flg_verbose, dry_run=flg_dry_run)
-
         if hasattr(args, 'install_dependency') and args.install_dependency:
             args.__dict__['all'] = True
             args.__dict__['dump'] = False
-            self.install_dependency(args=args)
+            self.install_dependency(args=args, transaction=pip_trans)
+
+        # One pip run (one resolution) for all the modules requested above
+        pip_trans.commit(opts=args, verbose=flg_verbose, dry_run=flg_dry_run,
+                         pythons=self.python_matrix_of(args))
+
+        if subcmd in ('init', 'add', 'addlib') and self.auto_compile_enabled(opts=args):
+            self.compile_bytecode(lib_script=True, site_packages=False,
+                                  invalidation_mode=(args.invalidation_mode
+                                                     if hasattr(args, 'invalidation_mode') else None),
+                                  report=flg_verbose, verbose=flg_verbose, dry_run=flg_dry_run)
 
     def manage_readme(self, args:argparse.Namespace, rest:list=[]):
         subcmd = args.subcommand if hasattr(args, 'subcommand') else 'unknown'
@@ -3361,6 +7248,7 @@ class PyEncase(object):
         return
 
     def setup_newmodule(self, args:argparse.Namespace, rest:list=[]):
+        import datetime
 
         subcmd = args.subcommand if hasattr(args, 'subcommand') else 'unknown'
 
@@ -3599,7 +7487,7 @@ class PyEncase(object):
             os.chmod(output_path, mode=0o644)
 
     def update_readme(self, keywords={}, bin_basenames=[], lib_basenames=[], input_file=None,
-                      flg_git=False, backup=False, verbose=False, dry_run=False):
+                      flg_git=False, backup=False, launcher_mode=None, verbose=False, dry_run=False):
 
         readme_path = os.path.join(self.prefix,
                                    self.__class__.FILENAME_DEFAULT.get('____README_NAME____', 'README.md'))
@@ -3608,7 +7496,12 @@ class PyEncase(object):
                                             keywords=keywords, 
                                             bin_basenames=bin_basenames, 
                                             lib_basenames=lib_basenames,
-                                            flg_git=flg_git)
+                                            flg_git=flg_git, launcher_mode=launcher_mode)
+        with self.__class__.Tracer.span('update README', path=readme_path):
+            self.save_readme(readme_updater, readme_path, input_file=input_file,
+                             keywords=keywords, verbose=verbose, dry_run=dry_run)
+
+    def save_readme(self, readme_updater, readme_path:str, input_file=None, keywords={}, verbose=False, dry_run=False):
         if os.path.exists(readme_path):
             readme_bkup = self.__class__.rename_with_mtime_suffix(readme_path,
                                                                   dest_dir=self.tmpdir,
@@ -3657,13 +7550,13 @@ class PyEncase(object):
     def add_pyscr(self, basename, input_file=None, keywords={},
                   start_marker=r'\s*#{5,}\s*____PY_MAIN_TEMPLATE_START____\s*#{5,}',
                   end_marker=r'\s*#{5,}\s*____PY_MAIN_TEMPLATE_END____\s*#{5,}',
-                  verbose=False, dry_run=False):
+                  launcher_mode=None, verbose=False, dry_run=False):
 
         if isinstance(basename, list):
             for bn in basename:
                 self.add_pyscr(bn, input_file=input_file, keywords=keywords,
                                start_marker=start_marker,
-                               end_marker=end_marker,
+                               end_marker=end_marker, launcher_mode=launcher_mode,
                                verbose=verbose, dry_run=dry_run)
             return
 
@@ -3700,8 +7593,8 @@ class PyEncase(object):
         if os.path.exists(bin_path):
             self.stderr.write("Warning: File already exists (Skipped) : '%s'" % (bin_path, ))
         else:
-            self.mksymlink_this_in_structure(basename, strip_py=True,
-                                             dry_run=dry_run, verbose=verbose)
+            self.mklauncher_in_structure(basename, strip_py=True, launcher_mode=launcher_mode,
+                                         dry_run=dry_run, verbose=verbose)
 
 
     def add_pylib(self, basename, input_file=None, keywords={},
@@ -3854,37 +7747,349 @@ class PyEncase(object):
 
     @classmethod
     def guess_git_username(cls):
+        import getpass
         gitcmd = os.environ.get('GIT', 'git')
         
-        gitcmdio = subprocess.run([gitcmd, 'config', '--local', '--get', 'user.name'],
-                                  encoding='utf-8', stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if gitcmdio.returncode==0:
-            return gitcmdio.stdout.rstrip(os.linesep)
-
-        gitcmdio = subprocess.run([gitcmd, 'config', '--global', '--get', 'user.name'],
-                                  encoding='utf-8', stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if gitcmdio.returncode==0:
-            return gitcmdio.stdout.rstrip(os.linesep)
+        for scope in ('--local', '--global'):
+            value = cls.GitConfigCache.get('user.name', git_cmd=gitcmd, scope=scope)
+            if value is not None:
+                return value
 
         return getpass.getuser().rstrip(os.linesep)
 
     @classmethod
     def guess_git_useremail(cls):
+        import getpass
+        import socket
         gitcmd = os.environ.get('GIT', 'git')
         
-        gitcmdio = subprocess.run([gitcmd, 'config', '--local', '--get', 'user.email'],
-                                  encoding='utf-8', stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if gitcmdio.returncode==0:
-            return gitcmdio.stdout.rstrip(os.linesep)
-
-        gitcmdio = subprocess.run([gitcmd, 'config', '--global', '--get', 'user.email'],
-                                  encoding='utf-8', stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if gitcmdio.returncode==0:
-            return gitcmdio.stdout.rstrip(os.linesep)
+        for scope in ('--local', '--global'):
+            value = cls.GitConfigCache.get('user.email', git_cmd=gitcmd, scope=scope)
+            if value is not None:
+                return value
 
         return (getpass.getuser()+'@'+socket.gethostname()).rstrip(os.linesep)
 
 
+    class Tracer(StreamExtd):
+        """
+        Nested spans with wall and CPU time of the phases of a manage invocation and of the
+        subprocesses it launches, written as Chrome trace-event JSON (Perfetto, chrome://tracing)
+        and summarized on stderr at exit. Spans are recorded from the start of PyEncase (so that
+        --trace given on the command line or in the config still sees the python probe), but are
+        written only when an output path is set by --trace FILE or PY_ENCASE_TRACE. Without a
+        tracer (e.g. classes used standalone), span() returns a shared no-op object.
+        """
+        current     = None
+        SUMMARY_TOP = 20
+
+        class NullSpan(object):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def start(self):
+                return self
+
+            def stop(self, **args):
+                pass
+
+            def set(self, **args):
+                pass
+
+        class Span(object):
+            def __init__(self, tracer, name:str, cat:str, tid:int=None, args:dict={}):
+                self.tracer = tracer
+                self.name   = name
+                self.cat    = cat
+                self.tid    = tid
+                self.args   = dict(args)
+
+            def __enter__(self):
+                return self.start()
+
+            def __exit__(self, exc_type, exc_value, traceback):
+                if exc_type is not None:
+                    self.args['error'] = '%s: %s' % (exc_type.__name__, exc_value)
+                self.stop()
+                return False
+
+            def start(self):
+                import threading
+                if self.tid is None:
+                    self.tid = threading.get_ident()
+                times = os.times()
+                self.t_start     = time.perf_counter()
+                self.cpu_start   = time.process_time()
+                self.child_start = times.children_user + times.children_system
+                return self
+
+            def stop(self, **args):
+                times = os.times()
+                self.args.update(args)
+                self.tracer.record(self.name, self.cat, self.tid, self.t_start, time.perf_counter(),
+                                   time.process_time() - self.cpu_start,
+                                   times.children_user + times.children_system - self.child_start, self.args)
+
+            def set(self, **args):
+                self.args.update(args)
+
+        NULL_SPAN = NullSpan()
+
+        def __init__(self, path:str=None, **kwds):
+            super().__init__(**kwds)
+            self.path   = path
+            self.pid    = os.getpid()
+            self.t0     = time.perf_counter()
+            self.events = []
+            self.lanes  = itertools.count(1)
+            self.names  = {}
+
+        @classmethod
+        def start_tracing(cls, path:str=None):
+            """ Start recording (once per process); with path, the trace is written there at exit """
+            if cls.current is None:
+                import atexit
+                cls.current = cls()
+                atexit.register(cls.current.finish)
+            if path:
+                cls.current.path = os.path.abspath(os.path.expanduser(path))
+                # Subprocesses (python matrix, fleet, ...) must not overwrite the same file
+                os.environ.pop('PY_ENCASE_TRACE', None)
+            return cls.current
+
+        @classmethod
+        def span(cls, name:str, cat:str='phase', tid:int=None, **args):
+            if cls.current is None:
+                return cls.NULL_SPAN
+            return cls.Span(cls.current, name, cat, tid=tid, args=args)
+
+        @classmethod
+        def lane(cls, name:str):
+            """ Track id for spans overlapping on one thread (e.g. concurrent commands) """
+            if cls.current is None:
+                return None
+            tid = next(cls.current.lanes)
+            cls.current.names[tid] = name
+            return tid
+
+        @classmethod
+        def command_name(cls, cmdargs:list):
+            """ Command basename with its first subcommand-like argument (e.g. 'git remote', 'pip install') """
+            words = [ str(x) for x in cmdargs ]
+            for w in words[1:]:
+                if re.match(r'^[a-z][a-z0-9_.-]*$', w) and not w.endswith('.py'):
+                    return ' '.join([os.path.basename(words[0]), w])
+            return os.path.basename(words[0]) if words else '?'
+
+        @classmethod
+        def run(cls, cmdargs:list, **kwargs):
+            """ subprocess.run() recorded as a span """
+            with cls.span(cls.command_name(cmdargs), cat='subprocess', argv=' '.join([ str(x) for x in cmdargs ])) as sp:
+                ret = subprocess.run(cmdargs, **kwargs)
+                sp.set(returncode=ret.returncode)
+                return ret
+
+        def record(self, name:str, cat:str, tid:int, t_start:float, t_end:float,
+                   cpu:float, child_cpu:float, args:dict):
+            self.events.append((name, cat, tid, t_start, t_end, cpu, child_cpu, args))
+
+        def chrome_trace(self):
+            events = [ {'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                        'args': {'name': ' '.join([os.path.basename(sys.argv[0])]+sys.argv[1:])}} ]
+            events.extend([ {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+                            for tid,name in self.names.items() ])
+            for name, cat, tid, t_start, t_end, cpu, child_cpu, args in self.events:
+                events.append({'name': name, 'cat': cat, 'ph': 'X', 'pid': self.pid, 'tid': tid,
+                               'ts': round((t_start-self.t0)*1e6, 1), 'dur': round((t_end-t_start)*1e6, 1),
+                               'args': dict(args, cpu_ms=round(cpu*1e3, 3), child_cpu_ms=round(child_cpu*1e3, 3))})
+            return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+        def summary(self, n_top:int=None):
+            """ [(name, cat, count, wall, cpu, child cpu)] sorted by wall time """
+            buf = {}
+            for name, cat, tid, t_start, t_end, cpu, child_cpu, args in self.events:
+                ent = buf.setdefault((name, cat), [0, 0.0, 0.0, 0.0])
+                ent[0] += 1
+                ent[1] += t_end - t_start
+                ent[2] += cpu
+                ent[3] += child_cpu
+            rows = sorted([ (k[0], k[1], *v) for k,v in buf.items() ], key=lambda x: -x[3])
+            return rows[:n_top] if n_top else rows
+
+        def finish(self):
+            if self.path is None:
+                return
+            t_total = time.perf_counter() - self.t0
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'w', encoding='utf-8') as fout:
+                    json.dump(self.chrome_trace(), fout)
+            except OSError as exc:
+                self.stderr.write("Trace: failed to write %s: %s" % (self.path, exc))
+                return
+            self.stderr.write("Trace: %d spans in %.1f ms -> %s" % (len(self.events), t_total*1e3, self.path))
+            self.stderr.write("  %-40s %-10s %5s %10s %6s %10s %10s"
+                              % ('span', 'category', 'count', 'wall[ms]', '%', 'cpu[ms]', 'child[ms]'))
+            for name, cat, count, wall, cpu, child_cpu in self.summary(self.__class__.SUMMARY_TOP):
+                self.stderr.write("  %-40s %-10s %5d %10.1f %6.1f %10.1f %10.1f"
+                                  % (name[:40], cat, count, wall*1e3, 100.0*wall/t_total if t_total>0 else 0.0,
+                                     cpu*1e3, child_cpu*1e3))
+
+    class GitConfigCache(object):
+        """
+        Memo of git configuration for one invocation: 'git config --list -z --show-origin'
+        is run once per (git command, scope, config file or repository) and every lookup is
+        answered from its output. Whoever writes the configuration must call invalidate().
+        """
+        entries = {}
+
+        @classmethod
+        def canonical_key(cls, key:str):
+            """ Section and variable names are case-insensitive, the subsection is not """
+            section, _, rest = key.partition('.')
+            subsection, _, name = rest.rpartition('.')
+            return '.'.join([ x for x in (section.lower(), subsection, name.lower()) if x ])
+
+        @classmethod
+        def entries_of(cls, git_cmd:str=None, scope:str=None, config_file:str=None, cwd:str=None):
+            """
+            {key: [(origin, value), ...]} in the order git reads them. scope is '--system',
+            '--global', '--local' (repository of cwd) or None (all of them, seen from cwd);
+            config_file reads only that file. value is None for a key without '='.
+            """
+            git_cmd = git_cmd if git_cmd else os.environ.get('GIT', 'git')
+            if config_file:
+                config_file, scope, cwd = os.path.abspath(config_file), '--file', None
+            elif scope in (None, '--local'):
+                cwd = os.path.abspath(cwd if cwd else os.getcwd())
+            else:
+                cwd = None
+
+            memo_key = (git_cmd, scope, config_file, cwd)
+            if memo_key in cls.entries:
+                return cls.entries[memo_key]
+
+            cmdargs = ( [git_cmd, 'config']
+                        + (['--file', config_file] if config_file else ([scope] if scope else []))
+                        + ['--list', '-z', '--show-origin'] )
+            buf = {}
+            __outer__ = globals().get(cls.__qualname__.split('.')[0])
+            try:
+                ret = __outer__.Tracer.run(cmdargs, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                if ret.returncode == 0:
+                    fields = ret.stdout.decode('utf-8', errors='surrogateescape').split('\0')
+                    for origin,item in zip(fields[0::2], fields[1::2]):
+                        key, sep, value = item.partition('\n')
+                        buf.setdefault(cls.canonical_key(key), []).append((origin, value if sep else None))
+            except OSError:
+                pass
+            cls.entries[memo_key] = buf
+            return buf
+
+        @classmethod
+        def get(cls, key:str, git_cmd:str=None, scope:str=None, config_file:str=None, cwd:str=None, default=None):
+            """ Value of key as 'git config --get' returns it (the last one wins) """
+            values = cls.entries_of(git_cmd=git_cmd, scope=scope,
+                                    config_file=config_file, cwd=cwd).get(cls.canonical_key(key))
+            return values[-1][1] if values else default
+
+        @classmethod
+        def invalidate(cls, config_file:str=None):
+            """ Forget config_file (and the repository scopes that may read it), or everything """
+            if config_file is None:
+                cls.entries.clear()
+                return
+            path = os.path.abspath(config_file)
+            for memo_key in list(cls.entries.keys()):
+                if memo_key[2] == path or memo_key[1] in (None, '--local'):
+                    del cls.entries[memo_key]
+
+    class PipTransaction(object):
+        """
+        Install requests collected during one manage invocation, issued by a single 'pip install'
+        """
+        def __init__(self, ref_pycan):
+            self.ref_pycan = ref_pycan
+            self.reqs      = {}   # key -> {requirement text: [source, ...]}
+            self.pip_opts  = []
+
+        @classmethod
+        def req_key(cls, pycan_cls, req:str):
+            parsed = pycan_cls.parse_requirement(req)
+            if parsed is None or '/' in req or '://' in req:
+                return req.strip()
+            return pycan_cls.normalize_dist_name(parsed['name'])
+
+        @classmethod
+        def is_bare_name(cls, pycan_cls, req:str):
+            parsed = pycan_cls.parse_requirement(req)
+            return parsed is not None and parsed['text'] == parsed['name']
+
+        def add(self, reqs:list, source:str):
+            for req in reqs:
+                if req.startswith('-'):
+                    self.add_pip_options([req])
+                    continue
+                texts = self.reqs.setdefault(self.__class__.req_key(self.ref_pycan.__class__, req), {})
+                srcs  = texts.setdefault(req.strip(), [])
+                if source not in srcs:
+                    srcs.append(source)
+
+        def add_pip_options(self, opts:list):
+            for i, x in enumerate(opts):
+                flag_only = x.startswith('-') and ( i+1 >= len(opts) or opts[i+1].startswith('-') )
+                if flag_only and x in self.pip_opts:
+                    continue
+                self.pip_opts.append(x)
+
+        def merged(self):
+            """
+            [(requirement text, [source, ...])] : a bare name is dropped when the same distribution
+            is also requested with a version specifier/extras (pip merges the rest by itself)
+            """
+            buf = []
+            for key, texts in self.reqs.items():
+                bare = [ x for x in texts.keys() if self.__class__.is_bare_name(self.ref_pycan.__class__, x) ]
+                spec = [ x for x in texts.keys() if x not in bare ]
+                if spec and bare:
+                    srcs = [ s for x in bare for s in texts[x] ]
+                    for x in spec:
+                        texts[x].extend([ s for s in srcs if s not in texts[x] ])
+                    buf.extend([ (x, texts[x]) for x in spec ])
+                else:
+                    buf.extend(list(texts.items()))
+            return buf
+
+        def report(self):
+            for req, srcs in self.merged():
+                self.ref_pycan.stderr.write("  %-30s <- %s" % (req, ', '.join(srcs)))
+            if self.pip_opts:
+                self.ref_pycan.stderr.write("  %-30s    %s" % ('(pip options)', ' '.join(self.pip_opts)))
+
+        def commit(self, opts:argparse.Namespace=None, verbose=False, dry_run=False, pythons:list=[]):
+            """
+            Run 'pip install' for the merged requirements, or 'install' subcommand for each
+            interpreter of pythons concurrently (python matrix)
+            """
+            reqs = [ x for x,s in self.merged() ]
+            if len(reqs)<1:
+                return None
+            n_reqs = sum([ len(s) for t in self.reqs.values() for s in t.values() ])
+            if verbose or dry_run:
+                self.ref_pycan.stderr.write("pip install transaction : %d requests -> %d requirements"
+                                            % (n_reqs, len(reqs)))
+                self.report()
+            if pythons:
+                return self.ref_pycan.run_python_matrix(pythons, ( ['install']
+                                                                   + ( ['--no-compile'] if hasattr(opts, 'no_compile')
+                                                                       and opts.no_compile else [] )
+                                                                   + ['--'] + self.pip_opts + reqs ),
+                                                        verbose=verbose, dry_run=dry_run)
+            return self.ref_pycan.run_pip_install(self.pip_opts+reqs, opts=opts, verbose=verbose, dry_run=dry_run)
+
     class ReadMeUpdater(object):
         CNTNTS_HD_MRKR  = re.compile(r"^ *- *Contents:")
         CNTNTS_TL_MRKR  = re.compile(r"^ *- *Usage.*:")
@@ -3892,11 +8097,13 @@ class PyEncase(object):
         GITIGNORE_RE    = re.compile(r"\.gitignore")
         USAGE_RE        = CNTNTS_TL_MRKR
         
-        def __init__(self, ref_pycan, keywords={}, bin_basenames=[], lib_basenames=[], flg_git:bool=False):
+        def __init__(self, ref_pycan, keywords={}, bin_basenames=[], lib_basenames=[], flg_git:bool=False,
+                     launcher_mode=None):
             self.ref_pycan = ref_pycan
             self.keywords=keywords
             self.bin_basenames=bin_basenames
             self.lib_basenames=lib_basenames
+            self.launcher_mode=launcher_mode
 
             self.bin_subdir       = self.ref_pycan.bindir.removeprefix(self.ref_pycan.prefix).removeprefix('/')
             self.python_subdir    = self.ref_pycan.python_path.removeprefix(self.ref_pycan.prefix).removeprefix('/')
@@ -3908,6 +8115,12 @@ class PyEncase(object):
 
             self.flg_git=flg_git
 
+        def is_stub_launcher(self, bn):
+            bin_path = os.path.join(self.ref_pycan.bindir, bn)
+            if os.path.lexists(bin_path):
+                return self.ref_pycan.__class__.is_launcher_stub(bin_path)
+            return self.launcher_mode == 'stub'
+
         def update_keywords(self, text):
             for k,v in self.keywords.items():
                 try:
@@ -3990,9 +8203,13 @@ class PyEncase(object):
                     f += 1
                     # buf.append("  %-3s %-42s Symbolic link to %s to invoke %s.py.\n" % ("%d." % (f,), bin_subpath+':', 
                     #                                                                     os.path.basename(__file__), bn))
-                    buf.append("  %-3s %-42s Symbolic link to %s to invoke %s.py.\n"
-                               % ("%d." % (f,), bin_subpath+':', 
-                                  self.ref_pycan.__class__.ENTITY_FILE_NAME, bn))
+                    if self.is_stub_launcher(bn):
+                        buf.append("  %-3s %-42s Launcher stub to invoke %s.py.\n"
+                                   % ("%d." % (f,), bin_subpath+':', bn))
+                    else:
+                        buf.append("  %-3s %-42s Symbolic link to %s to invoke %s.py.\n"
+                                   % ("%d." % (f,), bin_subpath+':', 
+                                      self.ref_pycan.__class__.ENTITY_FILE_NAME, bn))
 
             for bn in self.lib_basenames:
                 scr_subpath = os.path.join(self.python_subdir, bn+'.py')
@@ -4065,8 +8282,10 @@ class PyEncase(object):
                 contents_list.append([os.path.join(self.python_subdir, _scr_bn+'.py'),
                                       "Example Python script that use modules"])
                 contents_list.append([os.path.join(self.bin_subdir, _scr_bn),
-                                      ( "Symbolic link to '%s' to invoke %s.py." 
-                                        % (str_format['____SHSCRIPT_ENTITY_NAME____'], _scr_bn))])
+                                      ( ( "Launcher stub to invoke %s.py." % (_scr_bn, ))
+                                        if self.is_stub_launcher(_scr_bn) else
+                                        ( "Symbolic link to '%s' to invoke %s.py." 
+                                          % (str_format['____SHSCRIPT_ENTITY_NAME____'], _scr_bn)))])
                 #contents_list.append("\n")
 
             lib_desc_default = 'Example Python module file by template'
@@ -4379,7 +8598,7 @@ class PyEncase(object):
                               format_filter=None, encoding:str='utf-8') -> typing.Iterator[str]:
     
             input_path = pathlib.Path( infile if isinstance(infile,str) and infile
-                                       else inspect.getsourcefile(inspect.currentframe())).resolve()
+                                       else sys._getframe().f_code.co_filename).resolve()
             with open(input_path, encoding=encoding) as fin:
                 for line in cls.extract(fin, 
                                         s_marker=s_marker,
@@ -4399,24 +8618,27 @@ class PyEncase(object):
                             skip_tail_emptyline:bool=False, dequote:bool=False,
                             format_filter=None, open_mode='w', encoding:str='utf-8'):
             
-            fout = sys.stdout if outfile is None else open(outfile, mode=open_mode, encoding=encoding)
-            for line in cls.extract_from_file(infile=infile, 
-                                              s_marker=s_marker, e_marker=e_marker,
-                                              include_markers=include_markers,
-                                              multi_match=multi_match, dedent=dedent, 
-                                              skip_head_emptyline=skip_head_emptyline,
-                                              skip_tail_emptyline=skip_tail_emptyline,
-                                              dequote=dequote, format_filter=format_filter, encoding=encoding):
-                fout.write(line)
-            if outfile is not None:
-                fout.close()
+            __outer__ = globals().get(cls.__qualname__.split('.')[0])
+            with __outer__.Tracer.span('template '+os.path.basename(str(outfile or '-')), cat='template'):
+                fout = sys.stdout if outfile is None else open(outfile, mode=open_mode, encoding=encoding)
+                for line in cls.extract_from_file(infile=infile, 
+                                                  s_marker=s_marker, e_marker=e_marker,
+                                                  include_markers=include_markers,
+                                                  multi_match=multi_match, dedent=dedent, 
+                                                  skip_head_emptyline=skip_head_emptyline,
+                                                  skip_tail_emptyline=skip_tail_emptyline,
+                                                  dequote=dequote, format_filter=format_filter, encoding=encoding):
+                    fout.write(line)
+                if outfile is not None:
+                    fout.close()
 
 def main():
     import sys
+    PyEncase.fast_exec(sys.argv)
     return PyEncase(sys.argv).main()
 
 if __name__=='__main__':
-    main()
+    sys.exit(main())
 
     if False:
 
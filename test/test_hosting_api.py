@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Checks of the GitHub/GitLab metadata cache (HostingAPICache) of PyEncase
+# with fake 'gh'/'glab' commands on PATH: no network or login is needed.
+#
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from py_encase import PyEncase
+
+# Each call is logged; every answer takes FAKE_DELAY seconds to see the concurrency
+FAKE_CLI = r'''#!/bin/sh
+echo "$*" >> "${FAKE_CLI_LOG}"
+sleep "${FAKE_DELAY:-0}"
+case "$2" in
+    user)                      echo '{"login": "me", "username": "me", "id": 1}' ;;
+    /licenses)                 echo '[{"key": "mit"}]'; echo '[{"key": "apache-2.0"}]' ;;
+    /gitignore/templates)      echo '["Python"]' ;;
+    repos/me/exists|projects/me%2Fexists) echo '{}' ;;
+    repos/*|projects/*)        echo 'HTTP 404: Not Found' >&2; exit 1 ;;
+    *)                         echo 'HTTP 500: Server Error' >&2; exit 1 ;;
+esac
+'''
+
+FAKE_DELAY = 0.5
+
+
+class Checker(object):
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.n_ng     = 0
+        self.n_all    = 0
+
+    def calls(self):
+        """ Command lines logged by the fake CLI since the last call """
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as fin:
+            lines = [ x.strip() for x in fin ]
+        os.unlink(self.log_path)
+        return lines
+
+    def check(self, label, got, expected):
+        self.n_all += 1
+        if got != expected:
+            self.n_ng += 1
+            print("NG: %-40s : %r (expected: %r)" % (label, got, expected))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bindir = os.path.join(tmpdir, 'bin')
+        os.makedirs(bindir)
+        for name in ('gh', 'glab'):
+            with open(os.path.join(bindir, name), 'w') as fout:
+                fout.write(FAKE_CLI)
+            os.chmod(os.path.join(bindir, name), 0o755)
+        for k in ('GH_TOKEN', 'GITHUB_TOKEN', 'GH_HOST', 'GITLAB_TOKEN', 'GL_TOKEN',
+                  'GITLAB_HOST', 'GL_HOST', 'PY_ENCASE_HOSTING_CACHE_TTL'):
+            os.environ.pop(k, None)
+        os.environ.update({'PATH':            bindir+os.pathsep+os.environ.get('PATH', ''),
+                           'XDG_CACHE_HOME':  os.path.join(tmpdir, 'cache'),
+                           'XDG_CONFIG_HOME': os.path.join(tmpdir, 'config'),
+                           'GH_CONFIG_DIR':   os.path.join(tmpdir, 'config', 'gh'),
+                           'GLAB_CONFIG_DIR': os.path.join(tmpdir, 'config', 'glab-cli'),
+                           'FAKE_CLI_LOG':    os.path.join(tmpdir, 'calls.log'),
+                           'FAKE_DELAY':      str(FAKE_DELAY)})
+        os.makedirs(os.path.join(tmpdir, 'cache'))
+        chk = Checker(os.environ['FAKE_CLI_LOG'])
+
+        # Cold: the independent calls run in one concurrent round
+        t_start = time.perf_counter()
+        user, licenses, gitignore = PyEncase.GitHubIF().api_data('user', 'licenses', 'gitignore')
+        elapsed = time.perf_counter() - t_start
+        chk.check('cold: user', user, {'login': 'me', 'id': 1})
+        chk.check('cold: pages of --paginate merged', licenses, ['mit', 'apache-2.0'])
+        chk.check('cold: gitignore', gitignore, ['Python'])
+        chk.check('cold: one call per endpoint', sorted(chk.calls()),
+                  ['api /gitignore/templates --paginate', 'api /licenses --paginate', 'api user'])
+        chk.check('cold: one concurrent round', elapsed < FAKE_DELAY*2, True)
+
+        # Warm: answered from the disk cache without spawning the CLI
+        ghif = PyEncase.GitHubIF()
+        chk.check('warm: same data', ghif.api_data('user', 'licenses', 'gitignore'), [user, licenses, gitignore])
+        chk.check('warm: no call', chk.calls(), [])
+
+        # Existence probes: 404 is "does not exist", kept for the invocation only
+        chk.check('probe: exists', ghif.chk_repos('exists'), True)
+        chk.check('probe: 404', ghif.chk_repos('missing'), False)
+        chk.check('probe: again (memo)', ghif.chk_repos('missing'), False)
+        chk.check('probe: calls', chk.calls(), ['api repos/me/exists', 'api repos/me/missing'])
+        chk.check('probe: owner', ghif.chk_repos('missing', owner='org'), False)
+        chk.check('probe: owner calls', chk.calls(), ['api repos/org/missing'])
+
+        # Failures: None, not retried in the invocation, not kept on disk
+        chk.check('failure: None', ghif.api_cache.get('broken'), None)
+        chk.check('failure: again', ghif.api_cache.get('broken'), None)
+        chk.check('failure: one call', chk.calls(), ['api broken'])
+        chk.check('failure: not cached', PyEncase.GitHubIF().api_cache.get('broken'), None)
+        chk.check('failure: called again', chk.calls(), ['api broken'])
+
+        # TTL=0: no disk cache
+        os.environ['PY_ENCASE_HOSTING_CACHE_TTL'] = '0'
+        PyEncase.GitHubIF().api_data('user')
+        chk.check('ttl=0: fetched', chk.calls(), ['api user'])
+        del os.environ['PY_ENCASE_HOSTING_CACHE_TTL']
+
+        # Another login (token or auth file of the CLI) does not see the cached data
+        os.environ['GH_TOKEN'] = 'other'
+        PyEncase.GitHubIF().api_data('user')
+        chk.check('scope: token', chk.calls(), ['api user'])
+        del os.environ['GH_TOKEN']
+        os.makedirs(os.environ['GH_CONFIG_DIR'])
+        with open(os.path.join(os.environ['GH_CONFIG_DIR'], 'hosts.yml'), 'w') as fout:
+            fout.write("github.com:\n    user: other\n")
+        PyEncase.GitHubIF().api_data('user')
+        chk.check('scope: hosts.yml', chk.calls(), ['api user'])
+        PyEncase.GitHubIF().api_data('user')
+        chk.check('scope: hosts.yml (warm)', chk.calls(), [])
+
+        # GitLab: same cache, project probe by the URL-encoded path
+        glif = PyEncase.GitLabIF()
+        chk.check('gitlab: user', glif.glab_username, 'me')
+        chk.check('gitlab: probe exists', glif.chk_repos('exists'), True)
+        chk.check('gitlab: probe 404', glif.chk_repos('missing'), False)
+        chk.check('gitlab: calls', chk.calls(), ['api user', 'api projects/me%2Fexists', 'api projects/me%2Fmissing'])
+        chk.check('gitlab: warm', PyEncase.GitLabIF().glab_username, 'me')
+        chk.check('gitlab: warm no call', chk.calls(), [])
+
+    print("Hosting API cache check %s : %d/%d cases" % ('OK' if chk.n_ng == 0 else 'NG',
+                                                        chk.n_all-chk.n_ng, chk.n_all))
+    return 1 if chk.n_ng > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Known-answer checks of the PEP 440 / PEP 508 evaluation of PyEncase
+# (version_satisfies(), marker_satisfied()), used by the native installer
+# instead of 'packaging'. Expected values are the ones of pip/packaging.
+#
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from py_encase import PyEncase
+
+VERSION_CASES = [
+    # (version, specifier, expected)
+    ('1.0',            '==1.0',        True),
+    ('1.0.0',          '==1.0',        True),
+    ('1.0+local',      '==1.0',        True),
+    ('1.0',            '==1.0+local',  False),
+    ('1.0+local',      '==1.0+local',  True),
+    ('1.0+local.1',    '==1.0+Local-1', True),
+    ('1.0+01',         '==1.0+1',      True),
+    ('1.0+other',      '==1.0+local',  False),
+    ('1.0',            '!=1.0+local',  True),
+    ('1.0+local',      '!=1.0+local',  False),
+    ('1.1',            '==1.*',        True),
+    ('2.0',            '==1.*',        False),
+    ('3.11',           '==3.11.*',     True),
+    ('1.0',            '!=1.0.*',      False),
+    ('2.3',            '~=2.2',        True),
+    ('3.0',            '~=2.2',        False),
+    ('1.4.9',          '~=1.4.5',      True),
+    ('1.5.0',          '~=1.4.5',      False),
+    ('1.0.post1',      '>1.0.dev1',    True),
+    ('1.0+local',      '>1.0.dev1',    True),
+    ('1.0',            '>1.0.dev1',    True),
+    ('1.0.post1',      '>1.0',         False),
+    ('1.0.post1.dev1', '>1.0',         False),
+    ('1.0+local',      '>1.0',         False),
+    ('1.0.post2',      '>1.0.post1',   True),
+    ('1.0.post1+l',    '>1.0.post1',   False),
+    ('1.0a1.post1',    '>1.0a1',       False),
+    ('1.0+l',          '>1.0a1',       True),
+    ('1.0a1',          '<1.0',         False),
+    ('1.0.dev1',       '<1.0',         False),
+    ('1!1.0a1',        '<1!1.0',       False),
+    ('0.9.dev1',       '<1.0',         True),
+    ('0.9+local',      '<1.0',         True),
+    ('1.0a1',          '<1.0a2',       True),
+    ('1.0.dev1',       '<1.0a1',       True),
+    ('1.0rc1',         '<1.0.post1',   True),
+    ('1.0.dev1',       '<1.0.post1',   True),
+    ('1.0',            '<=1.0',        True),
+    ('1.0.post1',      '>=1.0',        True),
+    ('1!0.1',          '>2.0',         True),
+    ('1.0',            '===1.0',       True),
+    ('1.0.0',          '===1.0',       False),
+]
+
+MARKER_CASES = [
+    # (python version, marker, expected)
+    ('3.11.4', 'python_version == "3.11.*"',                           True),
+    ('3.11.4', 'python_version != "3.11.*"',                           False),
+    ('3.11.4', 'python_full_version == "3.11.*"',                      True),
+    ('3.12.1', 'python_version == "3.11.*"',                           False),
+    ('3.11.4', 'python_version >= "3.8"',                              True),
+    ('3.11.4', 'python_version < "3.10"',                              False),
+    ('3.9.2',  'python_version < "3.10"',                              True),
+    ('3.11.4', 'python_full_version >= "3.11.4"',                      True),
+    ('3.11.4', 'python_version >= "3.8" and python_version < "3.11"',  False),
+    ('3.11.4', 'python_version < "3.8" or python_version >= "3.11"',   True),
+    ('3.11.4', 'extra == "test"',                                      False),
+    ('3.11.4', '"3.11" in python_version',                             True),
+]
+
+
+class MarkerEnv(PyEncase):
+    """
+    PyEncase only with the python version (marker_satisfied() needs nothing else)
+    """
+    def __init__(self, python_version:str):
+        self.python_vertion_str = python_version
+
+
+def main():
+    n_ng = 0
+    for version, spec, expected in VERSION_CASES:
+        req = PyEncase.parse_requirement('pkg'+spec)
+        got = PyEncase.version_satisfies(version, req['specs'])
+        if got != expected:
+            n_ng += 1
+            print("NG: %-16s %-16s : %s (expected: %s)" % (version, spec, got, expected))
+    for python_version, marker, expected in MARKER_CASES:
+        got = MarkerEnv(python_version).marker_satisfied(marker)
+        if got != expected:
+            n_ng += 1
+            print("NG: python %-8s %-52s : %s (expected: %s)" % (python_version, marker, got, expected))
+    print("PEP 440/508 check %s : %d/%d cases" % ('OK' if n_ng == 0 else 'NG',
+                                                   len(VERSION_CASES)+len(MARKER_CASES)-n_ng,
+                                                   len(VERSION_CASES)+len(MARKER_CASES)))
+    return 1 if n_ng > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
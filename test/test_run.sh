@@ -29,4 +29,135 @@ fi
 "${dest}"/bin/"${mng_name}" add    -v -r trial2
 "${dest}"/bin/"${mng_name}" addlib -v -r trial3
 
+# Import-time regression: heavy modules must not be loaded by the launcher
+# path (bin/<script>) nor by '--manage info'.
+lazy_mods=(asyncio ast tomllib configparser getpass socket platform inspect
+           filecmp textwrap pkgutil glob datetime importlib.metadata)
+
+chk_imports () {
+    local label="${1}" loaded m ng=0
+    shift
+    loaded=" $("${PYTHON}" -X importtime "$@" 2>&1 >/dev/null \
+               | sed -n 's/^import time:.*| *\([^ |]*\) *$/\1/p' | tr '\n' ' ') "
+    for m in "${lazy_mods[@]}"; do
+        if [[ "${loaded}" == *" ${m} "* ]]; then
+            echo "Import check NG (${label}): '${m}' is loaded"
+            ng=1
+        fi
+    done
+    [ "${ng}" -eq 0 ] && echo "Import check OK (${label})"
+    return "${ng}"
+}
+
+import_ng=0
+"${dest}"/bin/trial1 -d > /dev/null 2>&1 # warm up python/pip probe cache
+chk_imports "launcher"         "${dest}"/bin/trial1 -d            || import_ng=1
+chk_imports "${mng_opt} info"  "${src}" "${mng_opt}" --prefix="${dest}" info || import_ng=1
+
+step_ng=0
+
+# PEP 440/508 evaluation of the native installer against known answers
+"${PYTHON}" "$(dirname ${this})/test_pep440.py" || step_ng=1
+
+# GitHub/GitLab metadata cache with fake gh/glab commands
+"${PYTHON}" "$(dirname ${this})/test_hosting_api.py" || step_ng=1
+
+# Lockfile, generations and shared store against the local wheelhouse
+# (wheels are fetched once by pip, then unpacked without the resolver).
+export PY_ENCASE_STORE_DIR="${dest}/var/test_store"
+
+chk_step () {
+    local label="${1}" expect="${2}" output
+    shift 2
+    if output="$("$@" 2>&1)" && [[ -z "${expect}" || "${output}" == *"${expect}"* ]]; then
+        echo "Step OK (${label})"
+    else
+        echo "${output}"
+        echo "Step NG (${label})"
+        step_ng=1
+    fi
+}
+
+# Same as chk_step, but the command must fail (non-zero exit status)
+chk_fail () {
+    local label="${1}" expect="${2}" output
+    shift 2
+    if ! output="$("$@" 2>&1)" && [[ -z "${expect}" || "${output}" == *"${expect}"* ]]; then
+        echo "Step OK (${label})"
+    else
+        echo "${output}"
+        echo "Step NG (${label})"
+        step_ng=1
+    fi
+}
+
+mng=("${src}" "${mng_opt}" --prefix="${dest}")
+chk_step "wheelhouse"               ""                "${mng[@]}" wheelhouse pytz tzlocal
+chk_step "lock"                     ""                "${mng[@]}" lock
+chk_step "install --from-lock"      "Unpack : pytz"   "${mng[@]}" install -v --from-lock -- --force-reinstall
+chk_step "lock --check"             ""                "${mng[@]}" lock --check
+chk_step "store link"               ""                "${mng[@]}" --shared-store store link
+chk_step "store list"               "refs: 1"         "${mng[@]}" --shared-store store list
+n_linked="$("${mng[@]}" --shared-store store list 2>&1 | grep -c 'refs: 1')"
+chk_step "reinstall (unlink store)" ""                "${mng[@]}" install --from-lock -- --force-reinstall
+chk_step "store gc"                 ": ${n_linked} entries removed" "${mng[@]}" --shared-store store gc
+chk_step "fleet"                    "Failed: 0"       "${mng[@]}" fleet -g "${dest}" -L "${dest}/var/log/fleet-ok" -- lock --check
+chk_fail "fleet (failing install)"  "Failed: 1"       "${mng[@]}" fleet -g "${dest}" -L "${dest}/var/log/fleet-ng" \
+                                                      -- --offline install this-package-does-not-exist-xyz
+# Python matrix: another interpreter (PYTHON_ALT, or python3.X found on PATH) has no
+# wheelhouse, so its offline install must be reported as the one failure.
+py_main="$("${PYTHON}" -c 'import sys; print(sys.executable)')"
+py_ver="$("${PYTHON}" -c 'import sys; print(sys.version_info[:2])')"
+py_alt="${PYTHON_ALT:-}"
+if [ -z "${py_alt}" ]; then
+    for cand in python3.{8..14}; do
+        if [ "$("${cand}" -c 'import sys; print(sys.version_info[:2])' 2>/dev/null)" != "${py_ver}" ] \
+               && "${cand}" -m pip --version > /dev/null 2>&1; then
+            py_alt="$("${cand}" -c 'import sys; print(sys.executable)')"
+            break
+        fi
+    done
+fi
+if [ -n "${py_alt}" ]; then
+    chk_fail "python matrix (one failing)" "Total: 2, OK: 1, Failed: 1" \
+             "${mng[@]}" --offline install --python-matrix "${py_main},${py_alt}" pytz
+else
+    echo "Step skipped (python matrix: no second python, set PYTHON_ALT)"
+fi
+
+chk_step "generations enable"       ""                "${mng[@]}" generations enable
+chk_step "install into generation"  ""                "${mng[@]}" install --from-lock -- --force-reinstall
+chk_step "generations list"         "@2"              "${mng[@]}" generations list
+chk_step "rollback"                 "Activate generation 1" "${mng[@]}" rollback -v
+chk_step "lock --check (rollback)"  ""                "${mng[@]}" lock --check
+
+# Native installer: a wheel with a console script and a '#!python' script,
+# made in the wheelhouse and unpacked without pip
+py_full="$("${PYTHON}" -c 'import platform; print(platform.python_version())')"
+"${PYTHON}" - "${dest}/var/wheelhouse/python/${py_full}" <<'EOF_WHEEL'
+import os, sys, zipfile
+with zipfile.ZipFile(os.path.join(sys.argv[1], 'pyencase_probe-1.0-py3-none-any.whl'), 'w') as zfile:
+    zfile.writestr('pyencase_probe.py', 'def main():\n    print("probe ok")\n')
+    zfile.writestr('pyencase_probe-1.0.data/scripts/pyencase-probe-raw', '#!python\nprint("raw ok")\n')
+    zfile.writestr('pyencase_probe-1.0.dist-info/METADATA', 'Metadata-Version: 2.1\nName: pyencase-probe\nVersion: 1.0\n')
+    zfile.writestr('pyencase_probe-1.0.dist-info/WHEEL', 'Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n')
+    zfile.writestr('pyencase_probe-1.0.dist-info/entry_points.txt', '[console_scripts]\npyencase-probe = pyencase_probe:main\n')
+    zfile.writestr('pyencase_probe-1.0.dist-info/RECORD', '')
+EOF_WHEEL
+site="${dest}/lib/python/site-packages/${py_full}"
+chk_step "generations disable"       ""                "${mng[@]}" generations disable
+chk_step "install --installer native" "Native install : pyencase-probe" \
+         "${mng[@]}" --offline install -v --installer native pyencase-probe
+chk_step "native: INSTALLER"         "py-encase"       cat "${site}/pyencase_probe-1.0.dist-info/INSTALLER"
+chk_step "native: RECORD"            "bin/pyencase-probe," cat "${site}/pyencase_probe-1.0.dist-info/RECORD"
+chk_step "native: console script"    "probe ok"        env PYTHONPATH="${site}" "${site}/bin/pyencase-probe"
+chk_step "native: #!python script"   "raw ok"          "${site}/bin/pyencase-probe-raw"
+# A broken newer wheel must leave the installed version in place
+echo "broken" > "${dest}/var/wheelhouse/python/${py_full}/pyencase_probe-2.0-py3-none-any.whl"
+chk_fail "native: broken wheel"      "Failed to unpack" \
+         "${mng[@]}" --offline install --installer native --upgrade --no-deps pyencase-probe
+chk_step "native: old version kept"  "probe ok"        env PYTHONPATH="${site}" "${site}/bin/pyencase-probe"
+
 echo "Test output under: ${dest}"
+[ "${step_ng}" -eq 0 ] || exit "${step_ng}"
+exit "${import_ng}"
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8; mode: python; -*-
+#
+# Benchmark of the import scanners of 'show_deps' / 'install_deps'.
+#
+#   Runs the 'ast' and 'tokenize' import scanners of py_encase.py over a corpus
+#   of python files (default: site-packages of the running interpreter),
+#   compares the time spent and checks that both return the same imports and
+#   metadata (conditional/optional/type_only) for every file that compiles.
+#
+#   Usage: import_scan_bench.py [-n 3] [-e path/to/py_encase.py] [-m 20] [dir_or_file ...]
+#
+import sys
+import os
+import time
+import argparse
+import warnings
+import sysconfig
+import importlib.util
+
+def load_entity(path:str):
+    spec   = importlib.util.spec_from_file_location('py_encase_bench_entity', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PyEncase
+
+def collect_corpus(targets:list):
+    files = []
+    for tgt in targets:
+        if os.path.isfile(tgt):
+            files.append(tgt)
+            continue
+        for dirpath, dirnames, filenames in os.walk(tgt):
+            dirnames[:] = sorted([ d for d in dirnames if d != '__pycache__' ])
+            files.extend([ os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.py') ])
+    corpus = {}
+    for path in files:
+        try:
+            with open(path, encoding='utf-8') as fin:
+                src = fin.read()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                compile(src, path, 'exec', dont_inherit=True)
+        except (SyntaxError, ValueError, OSError, UnicodeDecodeError):
+            continue
+        corpus[path] = src
+    return corpus
+
+def run_scanner(func, corpus:dict, repeat:int):
+    best    = None
+    results = None
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        results = { path: func(src) for path,src in corpus.items() }
+        elapsed = time.perf_counter() - t_start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def main():
+    default_entity = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', '..', 'src', 'py_encase', 'py_encase.py')
+    argprsr = argparse.ArgumentParser(description='Benchmark of import scanners (ast vs tokenize)')
+    argprsr.add_argument('-e', '--entity', default=os.path.normpath(default_entity),
+                         help='py_encase.py to be benchmarked (default: %(default)s)')
+    argprsr.add_argument('-n', '--repeat', type=int, default=3, help='number of runs, best is taken (default: 3)')
+    argprsr.add_argument('-m', '--max-diff', type=int, default=20, help='max number of mismatched files shown (default: 20)')
+    argprsr.add_argument('targets', nargs='*', default=[sysconfig.get_paths()['purelib']],
+                         help='directories/files of the corpus (default: site-packages)')
+    args = argprsr.parse_args()
+
+    pyencase = load_entity(args.entity)
+    corpus   = collect_corpus(args.targets)
+    n_bytes  = sum([ len(x) for x in corpus.values() ])
+    print("Corpus: %d files, %.1f MB (%s)" % (len(corpus), n_bytes/1e6, ', '.join(args.targets)))
+
+    t_ast, r_ast = run_scanner(lambda src: pyencase.scan_import_records_ast(src), corpus, args.repeat)
+    t_tok, r_tok = run_scanner(lambda src: pyencase.scan_import_records_tokenize(src), corpus, args.repeat)
+
+    print("%-10s %9.3f sec  %8.1f files/sec" % ('ast', t_ast, len(corpus)/t_ast))
+    print("%-10s %9.3f sec  %8.1f files/sec" % ('tokenize', t_tok, len(corpus)/t_tok))
+    print("%-10s %9.2f x" % ('speedup', t_ast/t_tok))
+
+    n_diff = 0
+    for path in corpus.keys():
+        if r_ast[path] == r_tok[path]:
+            continue
+        n_diff += 1
+        if n_diff > args.max_diff:
+            continue
+        print("Mismatch: %s" % (path, ))
+        for name in sorted(set(r_ast[path].keys())|set(r_tok[path].keys())):
+            if r_ast[path].get(name) != r_tok[path].get(name):
+                print("    %-30s ast: %-30s tokenize: %s"
+                      % (name, r_ast[path].get(name), r_tok[path].get(name)))
+    print("Result equality: %d / %d files identical" % (len(corpus)-n_diff, len(corpus)))
+    return 1 if n_diff > 0 else 0
+
+if __name__=='__main__':
+    sys.exit(main())
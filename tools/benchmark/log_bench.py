@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8; mode: python; -*-
+#
+# Micro-benchmark of StreamExtd.StreamIF messages.
+#
+#   Measures messages per second of StreamIF.write() with each prefix mode
+#   ('full': caller frame inspected every time, 'cached': header looked up by
+#   call site, 'off': no header) and of debug() messages dropped by the level,
+#   with the output written to a null sink. With -B, write() of another
+#   py_encase.py (e.g. an older version) is measured as the baseline.
+#
+#   Usage: log_bench.py [-n 200000] [-r 5] [-e path/to/py_encase.py] [-B baseline.py]
+#
+import sys
+import os
+import time
+import argparse
+import importlib.util
+
+class NullSink(object):
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+def load_entity(path:str, name:str):
+    spec   = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PyEncase
+
+class Caller(object):
+    """ Messages are sent from a method, as PyEncase and scripts do """
+    def __init__(self, stream_if):
+        self.stream_if = stream_if
+
+    def write(self, n_msgs:int):
+        strm = self.stream_if
+        for i in range(n_msgs):
+            strm.write("Processing item %d of %s", i, 'bench')
+
+    def debug(self, n_msgs:int):
+        strm = self.stream_if
+        for i in range(n_msgs):
+            strm.debug("Processing item %d of %s", i, 'bench')
+
+def measure(func, n_msgs:int, repeat:int):
+    best = None
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        func(n_msgs)
+        elapsed = time.perf_counter() - t_start
+        best = elapsed if best is None else min(best, elapsed)
+    return n_msgs/best
+
+def main():
+    default_entity = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', '..', 'src', 'py_encase', 'py_encase.py')
+    argprsr = argparse.ArgumentParser(description='Micro-benchmark of StreamIF messages per second')
+    argprsr.add_argument('-e', '--entity', default=os.path.normpath(default_entity),
+                         help='py_encase.py to be benchmarked (default: %(default)s)')
+    argprsr.add_argument('-B', '--baseline', default=None, help='py_encase.py whose write() is measured as the baseline')
+    argprsr.add_argument('-n', '--messages', type=int, default=200000, help='messages per run (default: 200000)')
+    argprsr.add_argument('-r', '--repeat', type=int, default=5, help='number of runs, best is taken (default: 5)')
+    args = argprsr.parse_args()
+
+    pyencase = load_entity(args.entity, 'py_encase_bench_current')
+    stream_t = pyencase.StreamExtd.StreamIF
+    rows     = []
+    if args.baseline:
+        base_t = load_entity(args.baseline, 'py_encase_bench_baseline').StreamExtd.StreamIF
+        rows.append(('baseline write()', measure(Caller(base_t(NullSink())).write, args.messages, args.repeat)))
+    for mode in stream_t.PREFIX_MODES[::-1]:
+        caller = Caller(stream_t(NullSink(), prefix_mode=mode))
+        rows.append(("write() prefix=%s" % (mode,), measure(caller.write, args.messages, args.repeat)))
+    caller = Caller(stream_t(NullSink(), level='info'))
+    rows.append(('debug() below level', measure(caller.debug, args.messages, args.repeat)))
+
+    for label,rate in rows:
+        print("%-22s %12.0f msgs/sec" % (label, rate))
+    return 0
+
+if __name__=='__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8; mode: python; -*-
+#
+# Startup benchmark for the bin/<script> launcher of py-encase environment.
+#
+#   Measures the wall-clock time from the spawn of 'bin/<script>' to the first
+#   line written by the child script, and compares it with running
+#   'python3 lib/python/<script>.py' directly (with the same PYTHONPATH).
+#   Without -s, a probe script is measured in a throwaway prefix made by
+#   'py_encase.py --manage init' in a temporary directory (the given
+#   environment is never modified).
+#
+#   Usage: startup_bench.py [-n 50] [-L stub] [-I] [-e path/to/py_encase.py]
+#          startup_bench.py --prefix /path/to/prefix -s script [-n 50] [-I]
+#
+import os
+import time
+import argparse
+import shutil
+import tempfile
+import statistics
+import subprocess
+
+PROBE_NAME   = '_startup_probe'
+PROBE_SOURCE = 'import sys\nsys.stdout.write("ready\\n")\nsys.stdout.flush()\n'
+
+def time_to_first_line(cmd_args:list, env:dict=None):
+    t_start = time.perf_counter()
+    proc = subprocess.Popen(cmd_args, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, env=env)
+    proc.stdout.readline()
+    t_ready = time.perf_counter()
+    proc.stdout.close()
+    proc.wait()
+    return (t_ready - t_start) * 1000.0
+
+def importtime_top(cmd_args:list, env:dict, n_top:int=15):
+    env_x = dict(env, PYTHONPROFILEIMPORTTIME='1')
+    proc  = subprocess.run(cmd_args, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.PIPE, env=env_x, encoding='utf-8')
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        flds = [ x.strip() for x in line[len('import time:'):].split('|') ]
+        if len(flds)<3 or not flds[0].isdigit():
+            continue
+        rows.append((int(flds[1]), int(flds[0]), flds[2]))
+    rows.sort(reverse=True)
+    return rows[:n_top]
+
+def summary(label:str, samples:list):
+    samples = sorted(samples)
+    return ("%-28s min %7.2f ms  median %7.2f ms  mean %7.2f ms  max %7.2f ms" %
+            (label, samples[0], statistics.median(samples), statistics.fmean(samples), samples[-1]))
+
+def make_probe_prefix(entity:str, python:str, launcher_mode:str):
+    prefix = tempfile.mkdtemp(prefix='startup_bench_')
+    subprocess.run([python, entity, '--manage', '--python', python, 'init', '--prefix', prefix,
+                    '--launcher-mode', launcher_mode, PROBE_NAME],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    with open(os.path.join(prefix, 'lib', 'python', PROBE_NAME+'.py'), 'w') as fout:
+        fout.write(PROBE_SOURCE)
+    return prefix
+
+def main():
+    default_entity = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', '..', 'src', 'py_encase', 'py_encase.py')
+    argprsr = argparse.ArgumentParser(description='Startup benchmark of bin/<script> launcher')
+    argprsr.add_argument('-p', '--prefix', default=None,
+                         help='prefix of py-encase environment where the script of -s is measured')
+    argprsr.add_argument('-s', '--script', default=None,
+                         help=('script name under lib/python (must write a line to stdout at startup). '
+                               'Default: probe script in a throwaway prefix'))
+    argprsr.add_argument('-e', '--entity', default=os.path.normpath(default_entity),
+                         help='py_encase.py making the throwaway prefix (default: %(default)s)')
+    argprsr.add_argument('-n', '--repeat', type=int, default=30, help='number of runs (default: 30)')
+    argprsr.add_argument('-P', '--python', default=os.environ.get('PYTHON', os.environ.get('PYTHON3', 'python3')),
+                         help='python used for direct run (default: $PYTHON/$PYTHON3/python3)')
+    argprsr.add_argument('-L', '--launcher-mode', choices=('symlink', 'stub'), default='symlink',
+                         help='launcher type of the probe script (default: symlink)')
+    argprsr.add_argument('-I', '--importtime', action='store_true',
+                         help='show top cumulative import time of the launcher (-X importtime)')
+    args = argprsr.parse_args()
+
+    if ( args.script is None ) != ( args.prefix is None ):
+        argprsr.error('--prefix and --script must be given together (or neither, for the probe script)')
+
+    tmp_prefix = None
+    if args.script is None:
+        tmp_prefix = make_probe_prefix(args.entity, args.python, args.launcher_mode)
+
+    prefix   = tmp_prefix if tmp_prefix else os.path.abspath(os.path.expanduser(args.prefix))
+    bindir   = os.path.join(prefix, 'bin')
+    pydir    = os.path.join(prefix, 'lib', 'python')
+    script   = args.script if args.script else PROBE_NAME
+    launcher = os.path.join(bindir, script.removesuffix('.py'))
+    target   = os.path.join(pydir, script if script.endswith('.py') else script+'.py')
+
+    try:
+        env = dict(os.environ)
+        env_direct = dict(env, PYTHONPATH=':'.join([pydir]
+                                                   + [ os.path.join(pydir, 'site-packages', d) for d
+                                                       in sorted(os.listdir(os.path.join(pydir, 'site-packages')))
+                                                       if os.path.isdir(os.path.join(pydir, 'site-packages', d)) ]
+                                                   + [env.get('PYTHONPATH', '')]))
+        # Warm up (also fills the python/pip probe cache of the launcher)
+        for _ in range(2):
+            time_to_first_line([launcher], env)
+            time_to_first_line([args.python, target], env_direct)
+
+        t_launcher = []
+        t_direct   = []
+        for _ in range(args.repeat):
+            t_launcher.append(time_to_first_line([launcher], env))
+            t_direct.append(time_to_first_line([args.python, target], env_direct))
+
+        print(summary('bin/'+os.path.basename(launcher), t_launcher))
+        print(summary('python3 '+os.path.relpath(target, prefix), t_direct))
+        print("%-28s median %+7.2f ms" % ('launcher overhead',
+                                          statistics.median(t_launcher)-statistics.median(t_direct)))
+
+        if args.importtime:
+            print("\nTop cumulative import time of bin/%s (us):" % (os.path.basename(launcher),))
+            for cumulative,selftime,modname in importtime_top([launcher], env):
+                print("  %9d %9d  %s" % (cumulative, selftime, modname))
+    finally:
+        if tmp_prefix:
+            shutil.rmtree(tmp_prefix, ignore_errors=True)
+
+if __name__=='__main__':
+    main()
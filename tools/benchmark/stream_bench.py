@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8; mode: python; -*-
+#
+# Throughput benchmark of the output streaming of ExtCmdIF.invoke.
+#
+#   Runs a child process that writes a large amount of UTF-8 text (with
+#   multibyte characters, in odd-sized writes so that characters are split
+#   across reads) through the pty path and the asyncio path of
+#   ExtCmdIF.invoke, with the output forwarded to /dev/null. Reports the
+#   throughput and the peak of python memory allocation (tracemalloc) and
+#   checks that the captured output (the tail kept by the capture limit) is
+#   identical to what the child wrote. With -B, another py_encase.py (e.g.
+#   an older version) is measured as the baseline.
+#
+#   Usage: stream_bench.py [-s 64] [-n 3] [-l 8388608] [-c ring|spool] [-e py_encase.py] [-B baseline.py]
+#
+import sys
+import os
+import time
+import argparse
+import platform
+import tracemalloc
+import importlib.util
+
+CHILD_SOURCE = ('import sys\n'
+                'size, block = int(sys.argv[1]), int(sys.argv[2])\n'
+                'data = "".join(["%08d ログ出力 αβγ ✓ {}\\n".format("x"*40) % (i,) for i in range(size//60+1)])\n'
+                'data = data[:size].encode("utf-8")\n'
+                'out  = sys.stdout.buffer\n'
+                'for pos in range(0, len(data), block):\n'
+                '    out.write(data[pos:pos+block])\n'
+                '    out.flush()\n')
+
+class FakeStdin(object):
+    """ stdin replacement deciding the path taken by ExtCmdIF.invoke (tty: pty, otherwise: asyncio) """
+    def __init__(self, tty:bool):
+        self.tty    = tty
+        self.buffer = open(os.devnull, 'rb')
+
+    def isatty(self):
+        return self.tty
+
+    def fileno(self):
+        return self.buffer.fileno()
+
+    def close(self):
+        self.buffer.close()
+
+def load_entity(path:str, name:str):
+    spec   = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PyEncase
+
+def expected_output(size:int):
+    data = ''.join([ "%08d ログ出力 αβγ ✓ {}\n".format('x'*40) % (i,) for i in range(size//60+1) ])
+    return data[:size]
+
+def run_once(pyencase, path:str, cmdargs:list, capture_limit:int, capture_mode:str, trace:bool):
+    results = []
+    stdin_orig = sys.stdin
+    sys.stdin  = FakeStdin(tty=(path=='pty'))
+    try:
+        try:
+            extcmd = pyencase.ExtCmdIF(capture_limit=capture_limit, capture_mode=capture_mode)
+        except TypeError: # Baseline without bounded capture
+            extcmd = pyencase.ExtCmdIF()
+        sinks = []
+        for strm in (extcmd.streams.stdout, extcmd.streams.stderr):
+            strm.stream = open(os.devnull, 'w', encoding='utf-8')
+            sinks.append(strm.stream)
+        if trace:
+            tracemalloc.start()
+        t_start = time.perf_counter()
+        extcmd.invoke(cmdargs, check=False, hook=lambda cmd, ret: results.append(ret))
+        elapsed = time.perf_counter() - t_start
+        peak    = tracemalloc.get_traced_memory()[1] if trace else 0
+        if trace:
+            tracemalloc.stop()
+        for sink in sinks:
+            sink.close()
+    finally:
+        sys.stdin.close()
+        sys.stdin = stdin_orig
+    return elapsed, peak, (results[0].stdout if results else '')
+
+def check_output(path:str, captured:str, expected:str):
+    if path == 'pty':
+        captured = captured.replace('\r\n', '\n')
+    n_replaced = captured.count('\ufffd')
+    return ( n_replaced == 0 and len(captured) > 0 and expected.endswith(captured) ), n_replaced
+
+def main():
+    default_entity = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', '..', 'src', 'py_encase', 'py_encase.py')
+    argprsr = argparse.ArgumentParser(description='Throughput benchmark of ExtCmdIF.invoke (pty and asyncio paths)')
+    argprsr.add_argument('-e', '--entity', default=os.path.normpath(default_entity),
+                         help='py_encase.py to be benchmarked (default: %(default)s)')
+    argprsr.add_argument('-B', '--baseline', default=None, help='py_encase.py measured as the baseline')
+    argprsr.add_argument('-s', '--size', type=float, default=64, help='output size of the child in million characters (default: 64)')
+    argprsr.add_argument('-b', '--block', type=int, default=4093, help='write size of the child in bytes (default: 4093)')
+    argprsr.add_argument('-n', '--repeat', type=int, default=3, help='number of runs, best is taken (default: 3)')
+    argprsr.add_argument('-l', '--capture-limit', type=int, default=None,
+                         help='capture limit in characters (default: ExtCmdIF.CAPTURE_LIMIT)')
+    argprsr.add_argument('-c', '--capture-mode', choices=('ring', 'spool'), default='ring',
+                         help='capture mode beyond the limit (default: ring)')
+    argprsr.add_argument('-P', '--python', default=sys.executable, help='python running the child (default: %(default)s)')
+    args = argprsr.parse_args()
+
+    size     = int(args.size*1e6)
+    cmdargs  = [args.python, '-c', CHILD_SOURCE, str(size), str(args.block)]
+    expected = expected_output(size)
+    entities = [('current', args.entity)] + ([('baseline', args.baseline)] if args.baseline else [])
+    paths    = (['pty'] if platform.system().lower() in ('linux', 'darwin') else []) + ['asyncio']
+    print("Child output: %.1f M characters in %d-byte writes" % (size/1e6, args.block))
+
+    n_fail = 0
+    for label,entity in entities:
+        pyencase = load_entity(entity, 'py_encase_bench_'+label)
+        for path in paths:
+            best = None
+            for _ in range(args.repeat):
+                elapsed, _, captured = run_once(pyencase, path, cmdargs, args.capture_limit, args.capture_mode, False)
+                best = elapsed if best is None else min(best, elapsed)
+            _, peak, captured = run_once(pyencase, path, cmdargs, args.capture_limit, args.capture_mode, True)
+            ok, n_replaced = check_output(path, captured, expected)
+            n_fail += 0 if ( ok or label == 'baseline' ) else 1
+            print("%-9s %-8s %8.3f sec  %8.1f Mchar/s  peak alloc %8.1f MB  captured %9d chars  %s"
+                  % (label, path, best, size/1e6/best, peak/1e6, len(captured),
+                     'OK' if ok else 'MISMATCH (%d replacement chars)' % (n_replaced,)))
+    return 1 if n_fail > 0 else 0
+
+if __name__=='__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8; mode: python; -*-
+#
+# Benchmark of the native wheel installer of 'install --installer=native'.
+#
+#   Installs the same set of wheels into an empty --target directory by
+#   'pip install --no-deps --no-index' and by the parallel unpacker of
+#   py_encase.py (PyEncase.unpack_wheels), compares the time spent and checks
+#   that both produce the same files (except pip's own metadata and bytecode).
+#   Without -w, a set of wheels (-N, default 50) is downloaded by pip first.
+#
+#   Usage: wheel_install_bench.py [-n 3] [-j 0] [-e path/to/py_encase.py] [-w wheel_dir] [-N 50]
+#
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+
+DEFAULT_PACKAGES = ['attrs', 'babel', 'certifi', 'cffi', 'charset-normalizer', 'click', 'colorama',
+                    'cryptography', 'decorator', 'distlib', 'docutils', 'filelock', 'idna',
+                    'importlib-metadata', 'iniconfig', 'jinja2', 'jmespath', 'lxml', 'markdown-it-py',
+                    'markupsafe', 'mdurl', 'more-itertools', 'numpy', 'packaging', 'pandas', 'pillow',
+                    'platformdirs', 'pluggy', 'psutil', 'pycparser', 'pyflakes', 'pygments', 'pyparsing',
+                    'pytest', 'python-dateutil', 'pytz', 'pyyaml', 'requests', 'rich', 'setuptools', 'six',
+                    'simplejson', 'toml', 'tomli', 'tqdm', 'typing-extensions', 'tzdata', 'ujson',
+                    'urllib3', 'wheel', 'wrapt', 'zipp']
+PIP_METADATA = ('RECORD', 'INSTALLER', 'REQUESTED', 'direct_url.json')
+
+def load_entity(path:str):
+    spec   = importlib.util.spec_from_file_location('py_encase_bench_entity', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PyEncase
+
+def download_wheels(python:str, dest:str, n_wheels:int):
+    subprocess.run([python, '-m', 'pip', 'download', '--disable-pip-version-check', '-q',
+                    '--only-binary=:all:', '--no-deps', '-d', dest] + DEFAULT_PACKAGES[:n_wheels], check=True)
+
+def installed_files(target:str):
+    buf = set()
+    for dirpath, dirnames, filenames in os.walk(target):
+        dirnames[:] = [ d for d in dirnames if d != '__pycache__' ]
+        for fname in filenames:
+            if os.path.basename(dirpath).endswith('.dist-info') and fname in PIP_METADATA:
+                continue
+            buf.add(os.path.relpath(os.path.join(dirpath, fname), target))
+    return buf
+
+def run_pip(python:str, wheels:list, target:str):
+    subprocess.run([python, '-m', 'pip', 'install', '--disable-pip-version-check', '-q', '--no-deps',
+                    '--no-index', '--no-compile', '--target', target] + wheels, check=True)
+
+def run_native(pyencase, python:str, wheels:list, target:str, jobs:int):
+    results = pyencase.unpack_wheels(wheels, target, jobs=jobs, python_exec=python)
+    failed  = [ (k, v) for k,v in results.items() if isinstance(v, Exception) ]
+    if failed:
+        raise RuntimeError("Failed to unpack: %s" % (failed, ))
+
+def measure(func, repeat:int):
+    best = None
+    for _ in range(repeat):
+        target = tempfile.mkdtemp(prefix='wheel_install_bench_')
+        try:
+            t_start = time.perf_counter()
+            func(target)
+            elapsed = time.perf_counter() - t_start
+            files   = installed_files(target)
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, files
+
+def main():
+    default_entity = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', '..', 'src', 'py_encase', 'py_encase.py')
+    argprsr = argparse.ArgumentParser(description='Benchmark of wheel installation (pip vs native)')
+    argprsr.add_argument('-e', '--entity', default=os.path.normpath(default_entity),
+                         help='py_encase.py to be benchmarked (default: %(default)s)')
+    argprsr.add_argument('-w', '--wheel-dir', default=None, help='directory of wheels (default: download by pip)')
+    argprsr.add_argument('-N', '--n-wheels', type=int, default=50, help='number of wheels downloaded without -w (default: 50)')
+    argprsr.add_argument('-n', '--repeat', type=int, default=3, help='number of runs, best is taken (default: 3)')
+    argprsr.add_argument('-j', '--jobs', type=int, default=0, help='threads of native installer (default: 0 = number of CPUs)')
+    argprsr.add_argument('-P', '--python', default=sys.executable, help='python with pip (default: %(default)s)')
+    args = argprsr.parse_args()
+
+    pyencase = load_entity(args.entity)
+    tmp_dl   = None
+    try:
+        wheel_dir = args.wheel_dir
+        if wheel_dir is None:
+            tmp_dl = tempfile.mkdtemp(prefix='wheel_install_bench_dl_')
+            download_wheels(args.python, tmp_dl, args.n_wheels)
+            wheel_dir = tmp_dl
+        wheels  = sorted([ os.path.join(wheel_dir, x) for x in os.listdir(wheel_dir) if x.endswith('.whl') ])
+        n_bytes = sum([ os.path.getsize(x) for x in wheels ])
+        print("Wheels: %d files, %.1f MB (%s)" % (len(wheels), n_bytes/1e6, wheel_dir))
+
+        t_pip, f_pip = measure(lambda tgt: run_pip(args.python, wheels, tgt), args.repeat)
+        t_nat, f_nat = measure(lambda tgt: run_native(pyencase, args.python, wheels, tgt, args.jobs), args.repeat)
+
+        print("%-10s %9.3f sec" % ('pip', t_pip))
+        print("%-10s %9.3f sec" % ('native', t_nat))
+        print("%-10s %9.2f x" % ('speedup', t_pip/t_nat))
+
+        only_pip = sorted(f_pip - f_nat)
+        only_nat = sorted(f_nat - f_pip)
+        for path in only_pip[:20]:
+            print("Only by pip    : %s" % (path, ))
+        for path in only_nat[:20]:
+            print("Only by native : %s" % (path, ))
+        print("Installed files: pip %d, native %d, different %d" % (len(f_pip), len(f_nat), len(only_pip)+len(only_nat)))
+        return 1 if ( only_pip or only_nat ) else 0
+    finally:
+        if tmp_dl is not None:
+            shutil.rmtree(tmp_dl, ignore_errors=True)
+
+if __name__=='__main__':
+    sys.exit(main())